@@ -46,6 +46,12 @@ health.add_check(db_available)
 import dgrehydro.routes.routes_flashflood
 import dgrehydro.routes.routes_riverineflood
 import dgrehydro.routes.routes_criticalpoint
+import dgrehydro.routes.routes_tiles
+import dgrehydro.routes.routes_forecastrun
+import dgrehydro.routes.routes_geometry
+import dgrehydro.routes.routes_summary
+import dgrehydro.routes.routes_warnings
+import dgrehydro.routes.routes_events
 
 app.register_blueprint(endpoints, url_prefix='/api/v1')
 
@@ -57,3 +63,6 @@ app.cli.add_command(commands.load_geometries)
 app.cli.add_command(commands.ingest_riverine)
 app.cli.add_command(commands.ingest_flashflood)
 app.cli.add_command(commands.ingest_critpoint)
+app.cli.add_command(commands.seed_tiles)
+app.cli.add_command(commands.archive_partitions)
+app.cli.add_command(commands.deliver_alerts)
@@ -5,13 +5,19 @@ import re
 import click
 from sqlalchemy.sql import text
 
-from dgrehydro import db
+from dgrehydro import SETTINGS, db
+from dgrehydro.config.products import PRODUCTS, RIVERINE_FLOOD
 from dgrehydro.ingestors.burkina.geometries_loader import load_river_segments, load_municipalities, load_regions, \
-    load_poi_stations
+    load_poi_stations, load_memberships
 from dgrehydro.ingestors.critical_points.critpoint_service import ingest_critpoint_data
 from dgrehydro.ingestors.flashflood.flash_service import ingest_flashfloods
 from dgrehydro.ingestors.hype.hype_service import ingest_hype_data
 from dgrehydro.models.riverineflood import RiverineFlood
+from dgrehydro.service import tile_cache
+from dgrehydro.service.alert_delivery import ALERT_BACKENDS, deliver_pending_alerts, get_alert_backend
+from dgrehydro.service.data_events import on_override_commit
+from dgrehydro.service.partitions import archive_old_partitions
+from dgrehydro.utils import parse_datetime
 
 
 ########################
@@ -61,6 +67,7 @@ def load_geometries():
     load_municipalities()
     load_regions()
     load_poi_stations()
+    load_memberships()
 
 @click.command(name="ingest_riverine")
 @click.argument("date", required=False)
@@ -80,6 +87,43 @@ def ingest_flashflood(date: str, since:str ):
 def ingest_critpoint(date: str, since: str):
     ingest_critpoint_data(date, since)
 
+########################
+# TILE CACHE COMMANDS
+########################
+@click.command(name="seed_tiles")
+@click.argument("product", type=click.Choice(PRODUCTS))
+@click.argument("forecast_dates", nargs=-1)
+def seed_tiles(product: str, forecast_dates: tuple):
+    if forecast_dates:
+        forecast_dates = [parse_datetime(forecast_date) for forecast_date in forecast_dates]
+    else:
+        logging.info(f"[TILES][SEED]: No forecast date given, seeding the latest {product} run")
+        forecast_dates = tile_cache.get_latest_forecast_dates(product)
+
+    tile_cache.seed_tiles(product, forecast_dates)
+
+########################
+# RETENTION COMMANDS
+########################
+@click.command(name="archive_partitions")
+@click.option("--keep-months", type=click.IntRange(min=1), default=None,
+              help="Number of months to keep, including the current one (default: RETENTION_MONTHS)")
+def archive_partitions(keep_months: int):
+    keep_months = SETTINGS.get('RETENTION_MONTHS') if keep_months is None else keep_months
+    archived = archive_old_partitions(keep_months)
+    logging.info(f"[RETENTION]: Archived {len(archived)} partitions")
+
+########################
+# ALERT COMMANDS
+########################
+@click.command(name="deliver_alerts")
+@click.option("--backend", type=click.Choice(list(ALERT_BACKENDS)), default=None,
+              help="Delivery backend (default: ALERT_BACKEND)")
+@click.option("--limit", type=click.IntRange(min=1), default=100, help="Maximum number of alerts to deliver")
+def deliver_alerts(backend: str, limit: int):
+    sent, failed = deliver_pending_alerts(get_alert_backend(backend), limit)
+    logging.info(f"[ALERTS]: Delivered {sent} alerts, {failed} failed")
+
 ########################
 # UPDATE COMMANDS
 ########################
@@ -102,3 +146,4 @@ def update_riverine(subid, init_date, forecast_date, value):
     db_record_to_update.value = value
     db.session.commit()
 
+    on_override_commit(RIVERINE_FLOOD, [db_record_to_update.forecast_date], db_record_to_update.init_date)
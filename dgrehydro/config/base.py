@@ -42,4 +42,21 @@ SETTINGS = {
     'SQLALCHEMY_DATABASE_URI': os.getenv('SQLALCHEMY_DATABASE_URI'),
     'DATA_CRITICAL_POINT_SOURCE_DIR': os.getenv('DATA_CRITICAL_POINT_SOURCE_DIR', './data/critpoint/'),
     'DATA_DIR': os.getenv('DATA_DIR'),
+    'TILE_CACHE_DIR': os.getenv('TILE_CACHE_DIR'),
+    'TILE_CACHE_MAX_ZOOM': int(os.getenv('TILE_CACHE_MAX_ZOOM', 12)),
+    'RETENTION_MONTHS': int(os.getenv('RETENTION_MONTHS', 12)),
+    'RESPONSE_CACHE_MAX_ENTRIES': int(os.getenv('RESPONSE_CACHE_MAX_ENTRIES', 512)),
+    'RESPONSE_CACHE_MAX_BYTES': int(os.getenv('RESPONSE_CACHE_MAX_BYTES', 64 * 1024 * 1024)),
+    'RESPONSE_CACHE_DIR': os.getenv('RESPONSE_CACHE_DIR'),
+    'WARNING_TOLERANCE': int(os.getenv('WARNING_TOLERANCE', 100)),
+    'RESPONSE_CACHE_MAX_AGE': int(os.getenv('RESPONSE_CACHE_MAX_AGE', 24 * 60 * 60)),
+    'ALERT_RULES_FILE': os.getenv('ALERT_RULES_FILE', './dgrehydro/_static_data/alert_rules.json'),
+    'ALERT_BACKEND': os.getenv('ALERT_BACKEND', 'file'),
+    'ALERT_DIR': os.getenv('ALERT_DIR'),
+    'ALERT_MAX_ATTEMPTS': int(os.getenv('ALERT_MAX_ATTEMPTS', 8)),
+    'SMTP_HOST': os.getenv('SMTP_HOST', 'localhost'),
+    'SMTP_PORT': int(os.getenv('SMTP_PORT', 25)),
+    'SMTP_SENDER': os.getenv('SMTP_SENDER'),
+    'SMTP_USER': os.getenv('SMTP_USER'),
+    'SMTP_PASSWORD': os.getenv('SMTP_PASSWORD'),
 }
@@ -0,0 +1,5 @@
+RIVERINE_FLOOD = "riverine_flood"
+FLASH_FLOOD = "flash_flood"
+CRITICAL_POINT = "critical_point"
+
+PRODUCTS = [RIVERINE_FLOOD, FLASH_FLOOD, CRITICAL_POINT]
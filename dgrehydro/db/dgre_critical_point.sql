@@ -30,6 +30,7 @@ BEGIN
                     END AS level
             FROM public.dgre_critical_point o, bounds, public.dgre_poi_station s
             WHERE o.station_name=s.station_name AND o.forecast_date=f_date
+              AND s.geom && ST_Transform(bounds.geom, 4326)
         )
     -- Generate MVT encoding of final input record
     SELECT ST_AsMVT(mvt, 'default')
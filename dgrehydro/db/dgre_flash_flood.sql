@@ -30,6 +30,7 @@ BEGIN
                     END AS level
             FROM public.dgre_flash_flood o, bounds, public.dgre_municipality s
             WHERE o.subid=s.subid AND o.forecast_date=f_date
+              AND s.geom && ST_Transform(bounds.geom, 4326)
         )
     -- Generate MVT encoding of final input record
     SELECT ST_AsMVT(mvt, 'default')
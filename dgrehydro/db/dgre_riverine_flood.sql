@@ -15,7 +15,7 @@ DECLARE
 BEGIN
     -- If initial_date is not provided, determine the latest available, minus 1
     SELECT MAX(init_date) INTO initial_date
-    FROM public.dgre_riverine_flood;
+    FROM public.dgre_riverine_flood_run;
 
     WITH
         bounds AS (
@@ -35,6 +35,7 @@ BEGIN
                     END AS level
             FROM public.dgre_riverine_flood o, bounds, public.dgre_river_segment s
             WHERE o.subid=s.subid AND o.init_date=initial_date AND o.forecast_date=f_date
+              AND s.geom && ST_Transform(bounds.geom, 4326)
         )
     -- Generate MVT encoding of final input record
     SELECT ST_AsMVT(mvt, 'default')
@@ -0,0 +1,45 @@
+CREATE OR REPLACE FUNCTION public.dgre_riverine_flood_max(
+    z integer,
+    x integer,
+    y integer,
+    init_date timestamp without time zone)
+    RETURNS bytea
+    LANGUAGE 'plpgsql'
+    COST 100
+    STABLE STRICT PARALLEL SAFE
+AS $BODY$
+DECLARE
+    result bytea;
+    i_date ALIAS FOR $4;
+BEGIN
+    WITH
+        bounds AS (
+            -- Convert tile coordinates to web mercator tile bounds
+            SELECT ST_TileEnvelope(z, x, y) AS geom
+        ),
+        mvt AS (
+            SELECT
+                ST_AsMVTGeom(ST_Transform(s.geom, 3857), bounds.geom) AS geom,
+                o.fid,
+                o.subid,
+                o.init_date,
+                o.max_level AS value,
+                CASE
+                    WHEN o.max_level = 0 THEN 'Normal'
+                    WHEN o.max_level = 1 THEN 'High'
+                    WHEN o.max_level = 2 THEN 'Very High'
+                    WHEN o.max_level = 3 THEN 'Extremely High'
+                    ELSE 'Unknown'
+                    END AS level
+            FROM public.dgre_riverine_flood_run o, bounds, public.dgre_river_segment s
+            WHERE o.subid=s.subid AND o.init_date=i_date
+              AND s.geom && ST_Transform(bounds.geom, 4326)
+        )
+    -- Generate MVT encoding of final input record
+    SELECT ST_AsMVT(mvt, 'default')
+    INTO result
+    FROM mvt;
+
+    RETURN result;
+END;
+$BODY$;
@@ -3,14 +3,18 @@ import json
 import logging
 import os
 
-from sqlalchemy import func
+from sqlalchemy import func, text
 
 from dgrehydro import db
 from dgrehydro.config.country_config import country_config
+from dgrehydro.config.products import PRODUCTS
 from dgrehydro.models._geo_municipality import Municipality
 from dgrehydro.models._geo_region import GeoRegion
 from dgrehydro.models._geo_riversegment import RiverSegment
 from dgrehydro.models._geo_poistation import PoiStation
+from dgrehydro.models._geo_membership import SegmentMunicipality, MunicipalityRegion, StationMunicipality
+from dgrehydro.service.data_events import invalidate_responses
+from dgrehydro.service.flash_db import refresh_flash_flood_daily, get_flash_flood_daily_days
 
 GEOMETRIES_DATA_DIR = './dgrehydro/_static_data/geo'
 RIVER_SEGMENTS_GEOJSON_FILE = 'bfa12_river_segments.geojson'
@@ -255,3 +259,55 @@ def load_poi_stations():
 
         db.session.commit()
         logging.info('[GEOMETRIES LOADING][POI_STATIONS]: Done')
+
+
+def load_memberships():
+    """
+    Precompute the membership of the segments and stations in the municipalities, and of the municipalities in
+    the regions, so that summaries join on integer keys instead of intersecting geometries at query time.
+
+    Segments are weighted by the share of their length inside the municipality, municipalities by the share of
+    their area inside the region.
+    """
+    logging.info("[GEOMETRIES LOADING][MEMBERSHIPS]: Computing memberships")
+
+    db.session.execute(text(f"DELETE FROM {SegmentMunicipality.__tablename__}"))
+    db.session.execute(text(f"""
+        INSERT INTO {SegmentMunicipality.__tablename__} (segment_subid, municipality_subid, weight)
+        SELECT segment_subid, municipality_subid, weight
+        FROM (SELECT s.subid AS segment_subid,
+                     m.subid AS municipality_subid,
+                     ST_Length(ST_CollectionExtract(ST_Intersection(s.geom, m.geom), 2)::geography)
+                         / NULLIF(ST_Length(s.geom::geography), 0) AS weight
+              FROM dgre_river_segment s
+                       JOIN dgre_municipality m ON ST_Intersects(s.geom, m.geom)) t
+        WHERE weight > 0"""))
+
+    db.session.execute(text(f"DELETE FROM {MunicipalityRegion.__tablename__}"))
+    db.session.execute(text(f"""
+        INSERT INTO {MunicipalityRegion.__tablename__} (municipality_subid, region_gid, weight)
+        SELECT municipality_subid, region_gid, weight
+        FROM (SELECT m.subid AS municipality_subid,
+                     r.gid AS region_gid,
+                     ST_Area(ST_CollectionExtract(ST_Intersection(ST_MakeValid(m.geom), ST_MakeValid(r.geom)), 3)::geography)
+                         / NULLIF(ST_Area(m.geom::geography), 0) AS weight
+              FROM dgre_municipality m
+                       JOIN dgre_geo_region r ON ST_Intersects(m.geom, r.geom)) t
+        WHERE weight > 0"""))
+
+    db.session.execute(text(f"DELETE FROM {StationMunicipality.__tablename__}"))
+    db.session.execute(text(f"""
+        INSERT INTO {StationMunicipality.__tablename__} (station_name, municipality_subid)
+        SELECT DISTINCT ON (p.station_name) p.station_name, m.subid
+        FROM dgre_poi_station p
+                 JOIN dgre_municipality m ON ST_Intersects(m.geom, p.geom)
+        ORDER BY p.station_name, m.subid"""))
+
+    # Regional rollups follow the regions of the municipalities
+    refresh_flash_flood_daily(get_flash_flood_daily_days())
+    db.session.commit()
+
+    # Summaries by admin unit depend on the memberships
+    for product in PRODUCTS:
+        invalidate_responses(product)
+    logging.info('[GEOMETRIES LOADING][MEMBERSHIPS]: Done')
@@ -1,9 +1,17 @@
 import logging
+import time
 from datetime import datetime, timedelta
 
 from dgrehydro import db
+from dgrehydro.config.products import CRITICAL_POINT
 from dgrehydro.ingestors.critical_points.critpoint_fetch import fetch_critpoint_data
 from dgrehydro.ingestors.critical_points.critpoint_ingest import extract_db_critical_points_from_csv
+from dgrehydro.service.alert_rules import queue_alerts
+from dgrehydro.service.data_events import on_ingest_commit, refresh_rollups
+from dgrehydro.models.criticalpoint import CriticalPoint
+from dgrehydro.service.forecast_run_db import register_forecast_run
+from dgrehydro.service.partitions import ensure_month_partitions
+from dgrehydro.utils import files_sha256
 
 
 def ingest_critpoint_data(date: str, since: str):
@@ -74,16 +82,35 @@ def ingest_critpoint_for_date(date: str):
     # Process CSV and ingest into database
     logging.info("[INGESTION][CRITPOINT]: Processing CSV for date %s", date)
     try:
+        started_at = time.monotonic()
         db_critical_points = extract_db_critical_points_from_csv(csv_path)
         logging.info("[INGESTION][CRITPOINT]: Ingest %d records in database", len(db_critical_points))
+        ensure_month_partitions(CriticalPoint.__tablename__, [cp.measurement_date for cp in db_critical_points])
 
         for db_critical_point in db_critical_points:
             db.session.add(db_critical_point)
 
         db.session.flush(db_critical_points)
+
+        if db_critical_points:
+            register_forecast_run(CRITICAL_POINT,
+                                  init_date=db_critical_points[0].measurement_date,
+                                  forecast_dates=[cp.forecast_date for cp in db_critical_points],
+                                  row_count=len(db_critical_points),
+                                  duration=time.monotonic() - started_at,
+                                  source_hash=files_sha256([csv_path]))
+            alerting_points = [cp for cp in db_critical_points if cp.water_level_alert is not None]
+            queue_alerts(CRITICAL_POINT,
+                         init_date=db_critical_points[0].measurement_date,
+                         keys=[cp.station_name for cp in alerting_points],
+                         days=[(cp.forecast_date - cp.measurement_date).days for cp in alerting_points],
+                         levels=[cp.water_level_alert for cp in alerting_points])
+            refresh_rollups(CRITICAL_POINT, [cp.forecast_date for cp in db_critical_points])
         db.session.commit()
         logging.info("[INGESTION][CRITPOINT]: Done for date %s", date)
 
+        on_ingest_commit(CRITICAL_POINT, [cp.forecast_date for cp in db_critical_points])
+
     except Exception as e:
         logging.error("[INGESTION][CRITPOINT]: Failed to process data for %s: %s", date, str(e))
         return None
@@ -1,13 +1,19 @@
 import logging
 import os
+import time
 
 import geopandas as gpd
 import numpy as np
 import pandas as pd
 
 from dgrehydro import SETTINGS, db
+from dgrehydro.config.products import FLASH_FLOOD
 from dgrehydro.models.flashflood import FlashFlood
-from dgrehydro.utils import get_dates_from_dataframe
+from dgrehydro.service.alert_rules import queue_alerts
+from dgrehydro.service.data_events import on_ingest_commit, refresh_rollups
+from dgrehydro.service.forecast_run_db import register_forecast_run
+from dgrehydro.service.partitions import ensure_month_partitions
+from dgrehydro.utils import get_dates_from_dataframe, files_sha256
 
 def assign_vigilance(value):
     if value == 0:
@@ -65,6 +71,7 @@ def extract_ffgs_from_source(file_path) -> pd.DataFrame:
 def  ingest_ffgs_data(file_path: str):
 
     logging.info(f"[WAFFGS][INGEST] - Start for file {os.path.basename(file_path)}")
+    started_at = time.monotonic()
     level_warnings = extract_ffgs_from_source(file_path)
     logging.info(f"[WAFFGS][INGEST] - Extraction done.")
     flash_floods = []
@@ -96,12 +103,30 @@ def  ingest_ffgs_data(file_path: str):
         flash_floods.append(rf)
 
     logging.info("[WAFFGS][INGEST] - Ingest in base")
+    ensure_month_partitions(FlashFlood.__tablename__, [ff.forecast_date for ff in flash_floods])
     for db_flash_flood in flash_floods:
         db.session.add(db_flash_flood)
 
     db.session.flush(flash_floods)
+
+    if flash_floods:
+        forecast_date = flash_floods[0].forecast_date
+        register_forecast_run(FLASH_FLOOD,
+                              init_date=forecast_date,
+                              forecast_dates=[forecast_date],
+                              row_count=len(flash_floods),
+                              duration=time.monotonic() - started_at,
+                              source_hash=files_sha256([file_path]))
+        queue_alerts(FLASH_FLOOD,
+                     init_date=forecast_date,
+                     keys=[ff.subid for ff in flash_floods],
+                     days=[0] * len(flash_floods),
+                     levels=[ff.value for ff in flash_floods])
+        refresh_rollups(FLASH_FLOOD, [ff.forecast_date for ff in flash_floods])
     db.session.commit()
     logging.info("[WAFFGS][INGEST] - Success")
 
+    on_ingest_commit(FLASH_FLOOD, [ff.forecast_date for ff in flash_floods])
+
     return flash_floods
 
@@ -0,0 +1,50 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+# Forecast of one ensemble member, e.g. ``..._forecast_timeCOUT_member03.txt`` or ``..._forecast_timeCOUT_03.txt``.
+# The deterministic ``..._forecast_timeCOUT.txt`` does not match.
+MEMBER_FILE_PATTERN = re.compile(r"forecast_timeCOUT[_-](?:member|mem|ens)?[_-]?(\d+)\.txt$", re.IGNORECASE)
+
+
+def member_files(files: list[str]) -> list[str]:
+    """Forecast files of the ensemble members among ``files``, ordered by member number."""
+    members = [(int(match.group(1)), f) for f in files if (match := MEMBER_FILE_PATTERN.search(f))]
+    return [f for _, f in sorted(members)]
+
+
+def stack_members(frames: list[pd.DataFrame], dates, subids: list[str]) -> np.ndarray:
+    """
+    Stack the discharge of the members into a ``(member, day, subbasin)`` float32 array.
+
+    ``frames`` are read by ``read_time_output`` with the ``X`` prefix removed from the subid columns. They are
+    aligned on ``dates`` and ``subids``, days or subbasins missing from a member are NaN.
+    """
+    ensemble = np.full((len(frames), len(dates), len(subids)), np.nan, dtype=np.float32)
+    for i, frame in enumerate(frames):
+        values = frame.set_index("DATE").reindex(index=dates, columns=subids)
+        ensemble[i] = values.apply(pd.to_numeric, errors="coerce").to_numpy(dtype=np.float32)
+    return ensemble
+
+
+def exceedance_probabilities(ensemble: np.ndarray, thresholds: np.ndarray) -> np.ndarray:
+    """
+    Share of the members exceeding each threshold, as a ``(day, subbasin, return period)`` float32 array.
+
+    ``thresholds`` is the ``(return period, subbasin)`` array of return levels. Members without a value are
+    left out of the share, cells without any member value or without threshold are NaN.
+    """
+    valid = ~np.isnan(ensemble)
+    exceeds = ensemble[..., np.newaxis] > thresholds.T[np.newaxis, np.newaxis]
+    counts = valid.sum(axis=0)[..., np.newaxis]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        probabilities = (exceeds.sum(axis=0) / counts).astype(np.float32)
+    probabilities[np.broadcast_to(counts == 0, probabilities.shape)] = np.nan
+    probabilities[:, np.isnan(thresholds.T)] = np.nan
+    return probabilities
+
+
+def to_probability_matrix(probabilities: np.ndarray) -> list:
+    """Convert the ``(day, return period)`` probabilities of a subbasin to nested lists, NaN as None."""
+    return [[None if np.isnan(p) else round(float(p), 4) for p in day] for day in probabilities]
@@ -1,9 +1,18 @@
 import logging
+import os
+import time
 from datetime import datetime, timedelta
 from dgrehydro import db
+from dgrehydro.config.products import RIVERINE_FLOOD
 
 from dgrehydro.ingestors.hype.hype_fetch import fetch_daily_hype_data
-from dgrehydro.ingestors.hype.process_hype import process_hype_data
+from dgrehydro.ingestors.hype.process_hype import process_hype_data, get_hype_data_dir
+from dgrehydro.models.riverinefloodrun import RiverineFloodRun
+from dgrehydro.service.alert_rules import queue_alerts
+from dgrehydro.service.data_events import on_ingest_commit
+from dgrehydro.service.forecast_run_db import register_forecast_run
+from dgrehydro.service.partitions import ensure_month_partitions
+from dgrehydro.utils import files_sha256
 
 
 def ingest_hype_data(date: str, since: str):
@@ -54,14 +63,35 @@ def ingest_hype_for_date(date: str):
     model_path = "bf-hype1.0_chirps2.0_gefs_noEOWL_noINSITU"
     logging.info("[INGESTION][HYPE]: Processing model %s for date %s", model_path, date)
     try:
-        db_riverine_floods = process_hype_data(model_path, date)
+        started_at = time.monotonic()
+        db_riverine_flood_runs = process_hype_data(model_path, date)
         logging.info("[INGESTION][HYPE]: Ingest in base")
-        for db_riverine_flood in db_riverine_floods:
-            db.session.add(db_riverine_flood)
+        ensure_month_partitions(RiverineFloodRun.__tablename__, [run.init_date for run in db_riverine_flood_runs])
+        for db_riverine_flood_run in db_riverine_flood_runs:
+            db.session.add(db_riverine_flood_run)
 
-        db.session.flush(db_riverine_floods)
+        db.session.flush(db_riverine_flood_runs)
+
+        forecast_dates = sorted({day for run in db_riverine_flood_runs for day in run.forecast_dates})
+        if db_riverine_flood_runs:
+            init_date = db_riverine_flood_runs[0].init_date
+            data_dir = get_hype_data_dir(model_path, date)
+            source_files = sorted(os.path.join(data_dir, f) for f in os.listdir(data_dir) if "timeCOUT" in f)
+            register_forecast_run(RIVERINE_FLOOD,
+                                  init_date=init_date,
+                                  forecast_dates=forecast_dates,
+                                  row_count=sum(len(run.levels) for run in db_riverine_flood_runs),
+                                  duration=time.monotonic() - started_at,
+                                  source_hash=files_sha256(source_files))
+            queue_alerts(RIVERINE_FLOOD,
+                         init_date=init_date,
+                         keys=[run.subid for run in db_riverine_flood_runs for _ in run.levels],
+                         days=[day for run in db_riverine_flood_runs for day in range(len(run.levels))],
+                         levels=[level for run in db_riverine_flood_runs for level in run.levels])
         db.session.commit()
 
+        on_ingest_commit(RIVERINE_FLOOD, forecast_dates)
+
     except Exception as e:
         logging.error("[INGESTION][HYPE]: Failed to process model %s: %s", model_path, str(e))
         return None
@@ -6,10 +6,12 @@ import pandas as pd
 import numpy as np
 
 from dgrehydro import SETTINGS
+from dgrehydro.ingestors.hype.ensemble import member_files, stack_members, exceedance_probabilities, \
+    to_probability_matrix
 from dgrehydro.ingestors.hype.hype_fetch import HYPE_FOLDER
 from dgrehydro.ingestors.hype.hype_io import read_time_output
 from dgrehydro.models._geo_riversegment import RiverSegment
-from dgrehydro.models.riverineflood import RiverineFlood
+from dgrehydro.models.riverinefloodrun import RiverineFloodRun
 
 
 def wldef(subid, thisq1, retlev2, wl_rp):
@@ -23,14 +25,20 @@ def wldef(subid, thisq1, retlev2, wl_rp):
                 mywl = k + 1
     return mywl
 
-def process_hype_data(model: str, date_str: str) -> bool:
-    root_data_dir = os.path.join(SETTINGS.get('DATA_DIR'), HYPE_FOLDER)
-    data_dir = os.path.join(root_data_dir, model, date_str)
+def to_discharge_array(values) -> list:
+    """Convert a discharge series to a list of floats, missing values as None."""
+    return [None if pd.isna(q) else float(q) for q in pd.to_numeric(values, errors="coerce")]
+
+def get_hype_data_dir(model: str, date_str: str) -> str:
+    return os.path.join(SETTINGS.get('DATA_DIR'), HYPE_FOLDER, model, date_str)
+
+def process_hype_data(model: str, date_str: str) -> list[RiverineFloodRun]:
+    data_dir = get_hype_data_dir(model, date_str)
     static_dir = os.path.abspath(os.path.join(SETTINGS.get('STATIC_DATA_DIR'), "hype"))
 
     if not os.path.exists(data_dir):
         logging.warn(f"[HYPE][PROCESS] Data have not been downloaded yet for date {date_str}.")
-        return False
+        return []
 
     # latest_init_date = RiverineFlood.query.order_by(desc(RiverineFlood.init_date)).first()
     # if latest_init_date < date_str:
@@ -40,7 +48,8 @@ def process_hype_data(model: str, date_str: str) -> bool:
     threshold_file = os.path.join(static_dir, 'riverine', "thresholds-rp-cout.txt")
 
     all_files = os.listdir(data_dir)
-    forecast_file = next(f for f in all_files if "forecast_timeCOUT" in f)
+    ensemble_files = member_files(all_files)
+    forecast_file = next(f for f in all_files if "forecast_timeCOUT" in f and f not in ensemble_files)
     hindcast_file = next(f for f in all_files if "hindcast_timeCOUT" in f)
 
     # Read forecast
@@ -61,6 +70,12 @@ def process_hype_data(model: str, date_str: str) -> bool:
     hindcast_data.insert(0, "index", range(1, len(hindcast_data) + 1))
     hindcast_data.to_csv(os.path.join(data_dir, "hindcast.csv"), index=False)
 
+    # Hindcast discharge, one column per subid
+    hindq = read_time_output(os.path.join(data_dir, hindcast_file))
+    hindcast_start = pd.to_datetime(hindq["DATE"].iloc[0]) if len(hindq) else None
+    hindq = hindq.drop(columns=["DATE"])
+    hindq.columns = hindq.columns.str.replace("X", "")
+
     # 3. Prepare colorscales
     # Read return level thresholds
     retlev = pd.read_csv(threshold_file, sep='\s+')
@@ -96,7 +111,7 @@ def process_hype_data(model: str, date_str: str) -> bool:
             retlev2 = retlev2[common_cols]
         else:
             print("No common columns found. Skipping.")
-            return
+            return []
 
     # Calculate warning levels for each day
     thiswls = []
@@ -108,6 +123,19 @@ def process_hype_data(model: str, date_str: str) -> bool:
             thiswl.append(wl_val)
         thiswls.append(thiswl)
 
+    # Probability of exceeding each return level, from the ensemble members when published with the run
+    exceedance = None
+    if ensemble_files:
+        members = []
+        for member_file in ensemble_files:
+            member = read_time_output(os.path.join(data_dir, member_file))
+            member.columns = member.columns.str.replace("X", "")
+            members.append(member)
+        ensemble = stack_members(members, all_dates, list(thisq.columns))
+        exceedance = exceedance_probabilities(ensemble, retlev2.apply(pd.to_numeric, errors="coerce").to_numpy(dtype=np.float32))
+        logging.info(f"[HYPE][PROCESS] Exceedance probabilities computed from {len(ensemble_files)} members.")
+    subid_index = {int(sid): i for i, sid in enumerate(thisq.columns)}
+
     # Convert to DataFrame
     thiswls_array = np.array(thiswls).T
 
@@ -137,7 +165,7 @@ def process_hype_data(model: str, date_str: str) -> bool:
         "Date": [str(d)[:10] for d in all_dates] + ["Max of 10 days forecast"]
     })
 
-    riverine_floods = []
+    riverine_flood_runs = []
 
     day_cols = [col for col in colorscales_df.columns if re.match(r'^day\d+$', col)]
     day_date_map = map_day_date(forecast_dates_df)
@@ -145,27 +173,30 @@ def process_hype_data(model: str, date_str: str) -> bool:
 
     for _, row in colorscales_df.iterrows():
         fid = int(row["index"])
-        subid = str(row["SUBID"])
+        subid = int(row["SUBID"])
 
         db_river_segment = RiverSegment.query.get(subid)
         if db_river_segment is None:
             logging.warn(f"[HYPE][PROCESS] SubID {subid} not found in RiverSegment table. Skipping.")
             continue
 
-        for day_col in day_cols:
-            date = day_date_map[day_col]
-            forecast_date = pd.to_datetime(date)
-            value = int(row[day_col])
-            rf = RiverineFlood(
-                fid=fid,
-                subid=subid,
-                init_date=init_date,
-                forecast_date=forecast_date,
-                init_value=value,
-                value=value
-            )
-            riverine_floods.append(rf)
-    return riverine_floods
+        levels = [int(row[day_col]) for day_col in day_cols]
+        hindcast_discharge = to_discharge_array(hindq[str(subid)]) if str(subid) in hindq.columns else None
+        riverine_flood_runs.append(RiverineFloodRun(
+            subid=subid,
+            init_date=init_date,
+            fid=fid,
+            init_levels=levels,
+            levels=list(levels),
+            discharge=to_discharge_array(thisq[str(subid)]),
+            max_level=int(row["max"]),
+            hindcast_start=hindcast_start if hindcast_discharge is not None else None,
+            hindcast_discharge=hindcast_discharge,
+            ensemble_members=len(ensemble_files) if exceedance is not None else None,
+            return_periods=wl_rp if exceedance is not None else None,
+            exceedance=to_probability_matrix(exceedance[:, subid_index[subid]]) if exceedance is not None else None
+        ))
+    return riverine_flood_runs
 
 def map_day_date(df):
     mapping = {
@@ -0,0 +1,68 @@
+from dgrehydro import db
+
+
+class SegmentMunicipality(db.Model):
+    """Municipality crossed by a river segment, weighted by the share of the segment length inside it."""
+    __tablename__ = "dgre_segment_municipality"
+    __table_args__ = (
+        db.Index('idx_segment_municipality_municipality', 'municipality_subid'),
+    )
+
+    segment_subid = db.Column(db.Integer, db.ForeignKey('dgre_river_segment.subid', ondelete="CASCADE"),
+                              primary_key=True)
+    municipality_subid = db.Column(db.Integer, db.ForeignKey('dgre_municipality.subid', ondelete="CASCADE"),
+                                   primary_key=True)
+    weight = db.Column(db.Float, nullable=False)
+
+    def __repr__(self):
+        return f'<SegmentMunicipality {self.segment_subid} - {self.municipality_subid}>'
+
+    def serialize(self):
+        return {
+            "segment_subid": self.segment_subid,
+            "municipality_subid": self.municipality_subid,
+            "weight": self.weight,
+        }
+
+
+class MunicipalityRegion(db.Model):
+    """Region overlapping a municipality, weighted by the share of the municipality area inside it."""
+    __tablename__ = "dgre_municipality_region"
+    __table_args__ = (
+        db.Index('idx_municipality_region_region', 'region_gid'),
+    )
+
+    municipality_subid = db.Column(db.Integer, db.ForeignKey('dgre_municipality.subid', ondelete="CASCADE"),
+                                   primary_key=True)
+    region_gid = db.Column(db.String(256), db.ForeignKey('dgre_geo_region.gid', ondelete="CASCADE"),
+                           primary_key=True)
+    weight = db.Column(db.Float, nullable=False)
+
+    def __repr__(self):
+        return f'<MunicipalityRegion {self.municipality_subid} - {self.region_gid}>'
+
+    def serialize(self):
+        return {
+            "municipality_subid": self.municipality_subid,
+            "region_gid": self.region_gid,
+            "weight": self.weight,
+        }
+
+
+class StationMunicipality(db.Model):
+    """Municipality containing a critical point station."""
+    __tablename__ = "dgre_station_municipality"
+
+    station_name = db.Column(db.String(256), db.ForeignKey('dgre_poi_station.station_name', ondelete="CASCADE"),
+                             primary_key=True)
+    municipality_subid = db.Column(db.Integer, db.ForeignKey('dgre_municipality.subid', ondelete="CASCADE"),
+                                   nullable=False, index=True)
+
+    def __repr__(self):
+        return f'<StationMunicipality {self.station_name} - {self.municipality_subid}>'
+
+    def serialize(self):
+        return {
+            "station_name": self.station_name,
+            "municipality_subid": self.municipality_subid,
+        }
@@ -0,0 +1,58 @@
+from datetime import datetime
+
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
+
+from dgrehydro import db
+
+
+class AlertOutbox(db.Model):
+    """Alert raised by a rule on an ingested run, waiting to be delivered."""
+    __tablename__ = "dgre_alert_outbox"
+    __table_args__ = (
+        db.Index('idx_alert_outbox_status_next_attempt', 'status', 'next_attempt_at'),
+        db.Index('idx_alert_outbox_product_init_date', 'product', 'init_date'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    rule = db.Column(db.String(256), nullable=False)
+    product = db.Column(db.String(64), nullable=False)
+    init_date = db.Column(db.DateTime, nullable=False)
+    payload = db.Column(JSONB, nullable=False)
+    recipients = db.Column(ARRAY(db.String), nullable=False)
+    status = db.Column(db.String(16), nullable=False)
+    attempts = db.Column(db.Integer, nullable=False)
+    # UTC
+    next_attempt_at = db.Column(db.DateTime, nullable=False)
+    last_error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, nullable=False, server_default=db.text("timezone('utc', now())"))
+    sent_at = db.Column(db.DateTime, nullable=True)
+
+    def __init__(self, rule, product, init_date, payload, recipients, status="pending"):
+        self.rule = rule
+        self.product = product
+        self.init_date = init_date
+        self.payload = payload
+        self.recipients = recipients
+        self.status = status
+        self.attempts = 0
+        self.next_attempt_at = datetime.utcnow()
+
+    def __repr__(self):
+        return f'<AlertOutbox {self.rule} - {self.init_date}>'
+
+    def serialize(self):
+        alert = {
+            "id": self.id,
+            "rule": self.rule,
+            "product": self.product,
+            "init_date": self.init_date.isoformat() if self.init_date else None,
+            "payload": self.payload,
+            "recipients": self.recipients,
+            "status": self.status,
+            "attempts": self.attempts,
+            "next_attempt_at": self.next_attempt_at.isoformat() if self.next_attempt_at else None,
+            "last_error": self.last_error,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "sent_at": self.sent_at.isoformat() if self.sent_at else None,
+        }
+        return alert
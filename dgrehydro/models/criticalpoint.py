@@ -5,11 +5,13 @@ class CriticalPoint(db.Model):
     __tablename__ = "dgre_critical_point"
     __table_args__ = (
         db.UniqueConstraint("station_name", "measurement_date", "forecast_date", name='unique_critical_point_measurement'),
+        {'postgresql_partition_by': 'RANGE (measurement_date)'},
     )
 
-    id = db.Column(db.Integer, primary_key=True)
+    # The partition key has to be part of the primary key
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     station_name = db.Column(db.String, nullable=False)
-    measurement_date = db.Column(db.DateTime, nullable=False)
+    measurement_date = db.Column(db.DateTime, primary_key=True, nullable=False)
     forecast_date = db.Column(db.DateTime, nullable=False)
     flow = db.Column(db.Float, nullable=True)
     water_level = db.Column(db.Float, nullable=True)
@@ -0,0 +1,39 @@
+from dgrehydro import db
+
+
+class CriticalPointRollupMixin:
+    """Aggregates of the real-time critical point measurements of a station over a time bucket."""
+    station_name = db.Column(db.String, primary_key=True)
+    bucket = db.Column(db.DateTime, primary_key=True)
+    count = db.Column(db.Integer, nullable=False)
+    water_level_min = db.Column(db.Float, nullable=True)
+    water_level_max = db.Column(db.Float, nullable=True)
+    water_level_avg = db.Column(db.Float, nullable=True)
+    flow_min = db.Column(db.Float, nullable=True)
+    flow_max = db.Column(db.Float, nullable=True)
+    flow_avg = db.Column(db.Float, nullable=True)
+
+    def __repr__(self):
+        return f'<{type(self).__name__} {self.station_name} - {self.bucket}>'
+
+    def serialize(self):
+        rollup = {
+            "station_name": self.station_name,
+            "bucket": self.bucket.isoformat() if self.bucket else None,
+            "count": self.count,
+            "water_level_min": self.water_level_min,
+            "water_level_max": self.water_level_max,
+            "water_level_avg": self.water_level_avg,
+            "flow_min": self.flow_min,
+            "flow_max": self.flow_max,
+            "flow_avg": self.flow_avg,
+        }
+        return rollup
+
+
+class CriticalPointHourly(CriticalPointRollupMixin, db.Model):
+    __tablename__ = "dgre_critical_point_hourly"
+
+
+class CriticalPointDaily(CriticalPointRollupMixin, db.Model):
+    __tablename__ = "dgre_critical_point_daily"
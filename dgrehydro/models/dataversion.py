@@ -0,0 +1,25 @@
+from dgrehydro import db
+
+
+class DataVersion(db.Model):
+    """Version of the data of a product, bumped by every ingestion and manual update."""
+    __tablename__ = "dgre_data_version"
+
+    product = db.Column(db.String(64), primary_key=True)
+    version = db.Column(db.BigInteger, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, nullable=False, server_default=db.func.now())
+
+    def __init__(self, product, version=0):
+        self.product = product
+        self.version = version
+
+    def __repr__(self):
+        return f'<DataVersion {self.product} - {self.version}>'
+
+    def serialize(self):
+        data_version = {
+            "product": self.product,
+            "version": self.version,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+        }
+        return data_version
@@ -4,13 +4,15 @@ class FlashFlood(db.Model):
     __tablename__ = "dgre_flash_flood"
     __table_args__ = (
         db.UniqueConstraint("subid", "forecast_date", name='unique_flash_flood_date'),
+        {'postgresql_partition_by': 'RANGE (forecast_date)'},
     )
 
-    id = db.Column(db.Integer, primary_key=True)
+    # The partition key has to be part of the primary key
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     fid = db.Column(db.Integer, nullable=False)
     subid = db.Column(db.Integer, nullable=False)
     adm3_fr = db.Column(db.String, nullable=False)
-    forecast_date = db.Column(db.DateTime, nullable=False)
+    forecast_date = db.Column(db.DateTime, primary_key=True, nullable=False)
     value = db.Column(db.Integer, nullable=False)
     init_value = db.Column(db.Integer, nullable=False)
     weighted_ffft = db.Column(db.Float, nullable=False)
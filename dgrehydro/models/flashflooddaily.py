@@ -0,0 +1,33 @@
+from dgrehydro import db
+
+
+class FlashFloodDaily(db.Model):
+    """Daily aggregate of the flash flood forecasts of a municipality, a province or a region."""
+    __tablename__ = "dgre_flash_flood_daily"
+    __table_args__ = (
+        db.Index('idx_flash_flood_daily_level_day', 'level', 'day'),
+    )
+
+    level = db.Column(db.String, primary_key=True)
+    # subid of a municipality, name of a province, gid of a region
+    area_id = db.Column(db.String, primary_key=True)
+    day = db.Column(db.Date, primary_key=True)
+    name = db.Column(db.String, nullable=False)
+    max_value = db.Column(db.Integer, nullable=False)
+    mean_weighted_ffft = db.Column(db.Float, nullable=False)
+    count = db.Column(db.Integer, nullable=False)
+
+    def __repr__(self):
+        return f'<FlashFloodDaily {self.level} {self.area_id} - {self.day}>'
+
+    def serialize(self):
+        flash_flood_daily = {
+            "level": self.level,
+            "area_id": self.area_id,
+            "day": self.day.isoformat() if self.day else None,
+            "name": self.name,
+            "max_value": self.max_value,
+            "mean_weighted_ffft": self.mean_weighted_ffft,
+            "count": self.count,
+        }
+        return flash_flood_daily
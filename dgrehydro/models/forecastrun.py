@@ -0,0 +1,40 @@
+from sqlalchemy.dialects.postgresql import ARRAY
+
+from dgrehydro import db
+
+
+class ForecastRun(db.Model):
+    __tablename__ = "dgre_forecast_run"
+
+    id = db.Column(db.Integer, primary_key=True)
+    product = db.Column(db.String(64), nullable=False)
+    init_date = db.Column(db.DateTime, nullable=False)
+    forecast_dates = db.Column(ARRAY(db.DateTime), nullable=False)
+    row_count = db.Column(db.Integer, nullable=False)
+    duration = db.Column(db.Float, nullable=True)
+    source_hash = db.Column(db.String(64), nullable=True)
+    ingested_at = db.Column(db.DateTime, nullable=False, server_default=db.func.now())
+
+    def __init__(self, product, init_date, forecast_dates, row_count, duration=None, source_hash=None):
+        self.product = product
+        self.init_date = init_date
+        self.forecast_dates = forecast_dates
+        self.row_count = row_count
+        self.duration = duration
+        self.source_hash = source_hash
+
+    def __repr__(self):
+        return f'<ForecastRun {self.product} - {self.init_date}>'
+
+    def serialize(self):
+        forecast_run = {
+            "id": self.id,
+            "product": self.product,
+            "init_date": self.init_date.isoformat() if self.init_date else None,
+            "forecast_dates": [date.isoformat() for date in self.forecast_dates],
+            "row_count": self.row_count,
+            "duration": self.duration,
+            "source_hash": self.source_hash,
+            "ingested_at": self.ingested_at.isoformat() if self.ingested_at else None,
+        }
+        return forecast_run
@@ -0,0 +1,23 @@
+from dgrehydro import db
+
+
+class GeoJsonCache(db.Model):
+    """Precompressed GeoJSON FeatureCollection of one product for one (init date, forecast date)."""
+    __tablename__ = "dgre_geojson_cache"
+
+    product = db.Column(db.String(64), primary_key=True)
+    init_date = db.Column(db.DateTime, primary_key=True)
+    forecast_date = db.Column(db.DateTime, primary_key=True)
+    gzip = db.Column(db.LargeBinary, nullable=False)
+    brotli = db.Column(db.LargeBinary, nullable=True)
+    updated_at = db.Column(db.DateTime, nullable=False, server_default=db.func.now())
+
+    def __init__(self, product, init_date, forecast_date, gzip, brotli=None):
+        self.product = product
+        self.init_date = init_date
+        self.forecast_date = forecast_date
+        self.gzip = gzip
+        self.brotli = brotli
+
+    def __repr__(self):
+        return f'<GeoJsonCache {self.product} - {self.init_date} - {self.forecast_date}>'
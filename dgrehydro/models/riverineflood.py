@@ -2,15 +2,20 @@ from dgrehydro import db
 
 
 class RiverineFlood(db.Model):
+    """
+    One warning level per subbasin and forecast day, read from the ``dgre_riverine_flood`` view.
+
+    The view unnests the arrays of ``RiverineFloodRun``, which are the only stored copy of the levels. Updating
+    ``value`` or ``init_value`` reports them into the run through an ``INSTEAD OF`` trigger, rows are never
+    inserted here.
+    """
     __tablename__ = "dgre_riverine_flood"
-    __table_args__ = (
-        db.UniqueConstraint("subid", "init_date", "forecast_date", name='unique_riverine_flood_date'),
-    )
-    id = db.Column(db.Integer, primary_key=True)
+
+    id = db.Column(db.BigInteger, nullable=False)
     fid = db.Column(db.Integer, nullable=False)
-    subid = db.Column(db.String, nullable=False)
-    init_date = db.Column(db.DateTime, nullable=False)
-    forecast_date = db.Column(db.DateTime, nullable=False)
+    subid = db.Column(db.Integer, primary_key=True)
+    init_date = db.Column(db.DateTime, primary_key=True)
+    forecast_date = db.Column(db.DateTime, primary_key=True)
     value = db.Column(db.Integer, nullable=False)
     init_value = db.Column(db.Integer, nullable=False)
 
@@ -29,7 +34,8 @@ class RiverineFlood(db.Model):
         riverine_flood = {
             "id": self.id,
             "fid": self.fid,
-            "subid": self.subid,
+            # subids have always been served as strings
+            "subid": str(self.subid),
             "init_date": self.init_date,
             "forecast_date": self.forecast_date,
             "init_value": self.init_value,
@@ -0,0 +1,77 @@
+from datetime import timedelta
+
+from sqlalchemy.dialects.postgresql import ARRAY, REAL
+
+from dgrehydro import db
+
+
+class RiverineFloodRun(db.Model):
+    """
+    Compact layout of a HYPE run: one row per subbasin and init date, holding the daily values as arrays.
+
+    Element ``i`` of the forecast arrays is the value for ``init_date + i days``, element ``i`` of
+    ``hindcast_discharge`` is the simulated discharge for ``hindcast_start + i days``. For runs published with
+    ensemble members, ``exceedance[i][k]`` is the share of the members exceeding the ``return_periods[k]`` return
+    level on day ``i``.
+    """
+    __tablename__ = "dgre_riverine_flood_run"
+    __table_args__ = {'postgresql_partition_by': 'RANGE (init_date)'}
+
+    subid = db.Column(db.Integer, db.ForeignKey('dgre_river_segment.subid', ondelete="CASCADE"), primary_key=True)
+    init_date = db.Column(db.DateTime, primary_key=True)
+    fid = db.Column(db.Integer, nullable=False)
+    init_levels = db.Column(ARRAY(db.SmallInteger), nullable=False)
+    levels = db.Column(ARRAY(db.SmallInteger), nullable=False)
+    discharge = db.Column(ARRAY(REAL), nullable=True)
+    max_level = db.Column(db.SmallInteger, nullable=False)
+    hindcast_start = db.Column(db.DateTime, nullable=True)
+    hindcast_discharge = db.Column(ARRAY(REAL), nullable=True)
+    ensemble_members = db.Column(db.SmallInteger, nullable=True)
+    return_periods = db.Column(ARRAY(db.SmallInteger), nullable=True)
+    exceedance = db.Column(ARRAY(REAL, dimensions=2), nullable=True)
+
+    def __init__(self, subid, init_date, fid, init_levels, levels, discharge, max_level, hindcast_start=None,
+                 hindcast_discharge=None, ensemble_members=None, return_periods=None, exceedance=None):
+        self.subid = subid
+        self.init_date = init_date
+        self.fid = fid
+        self.init_levels = init_levels
+        self.levels = levels
+        self.discharge = discharge
+        self.max_level = max_level
+        self.hindcast_start = hindcast_start
+        self.hindcast_discharge = hindcast_discharge
+        self.ensemble_members = ensemble_members
+        self.return_periods = return_periods
+        self.exceedance = exceedance
+
+    def __repr__(self):
+        return f'<RiverineFloodRun {self.subid} - {self.init_date}>'
+
+    @property
+    def forecast_dates(self):
+        return [self.init_date + timedelta(days=i) for i in range(len(self.levels))]
+
+    @property
+    def hindcast_dates(self):
+        if self.hindcast_start is None or self.hindcast_discharge is None:
+            return []
+        return [self.hindcast_start + timedelta(days=i) for i in range(len(self.hindcast_discharge))]
+
+    def serialize(self):
+        riverine_flood_run = {
+            "subid": self.subid,
+            "fid": self.fid,
+            "init_date": self.init_date,
+            "forecast_dates": self.forecast_dates,
+            "init_levels": self.init_levels,
+            "levels": self.levels,
+            "discharge": self.discharge,
+            "max_level": self.max_level,
+            "hindcast_dates": self.hindcast_dates,
+            "hindcast_discharge": self.hindcast_discharge,
+            "ensemble_members": self.ensemble_members,
+            "return_periods": self.return_periods,
+            "exceedance": self.exceedance,
+        }
+        return riverine_flood_run
@@ -0,0 +1,43 @@
+from dgrehydro import db
+
+
+class RunChange(db.Model):
+    """Warning level of a subbasin, municipality or station that changed since the previous run."""
+    __tablename__ = "dgre_run_change"
+    __table_args__ = (
+        db.Index('idx_run_change_product_init_date', 'product', 'init_date'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    product = db.Column(db.String(64), nullable=False)
+    init_date = db.Column(db.DateTime, nullable=False)
+    previous_init_date = db.Column(db.DateTime, nullable=False)
+    # subid of a subbasin or a municipality, name of a station
+    item_id = db.Column(db.String, nullable=False)
+    previous_level = db.Column(db.SmallInteger, nullable=True)
+    level = db.Column(db.SmallInteger, nullable=False)
+    change = db.Column(db.String(16), nullable=False)
+
+    def __init__(self, product, init_date, previous_init_date, item_id, previous_level, level, change):
+        self.product = product
+        self.init_date = init_date
+        self.previous_init_date = previous_init_date
+        self.item_id = item_id
+        self.previous_level = previous_level
+        self.level = level
+        self.change = change
+
+    def __repr__(self):
+        return f'<RunChange {self.product} - {self.init_date} - {self.item_id}>'
+
+    def serialize(self):
+        run_change = {
+            "product": self.product,
+            "init_date": self.init_date.isoformat() if self.init_date else None,
+            "previous_init_date": self.previous_init_date.isoformat() if self.previous_init_date else None,
+            "item_id": self.item_id,
+            "previous_level": self.previous_level,
+            "level": self.level,
+            "change": self.change,
+        }
+        return run_change
@@ -1,14 +1,64 @@
+import json
 import logging
+from datetime import datetime, timedelta
 
-from flask import request, jsonify
-from sqlalchemy import desc
+from flask import Response, request, jsonify, stream_with_context
 
 from dgrehydro import db
+from dgrehydro.config.products import CRITICAL_POINT
+from dgrehydro.models._geo_poistation import PoiStation
 from dgrehydro.models.criticalpoint import CriticalPoint
 from dgrehydro.routes import endpoints
+from dgrehydro.service.criticalpoint_db import CRITICAL_POINT_ORDER, select_critical_points, encode_cursor, \
+    after_cursor, get_critical_point_history, HISTORY_VARIABLES, HISTORY_METHODS, LTTB
+from dgrehydro.service.batch_override import MAX_BATCH_SIZE, BatchField, read_batch_rows, apply_batch_update
+from dgrehydro.service.data_events import on_override_commit, refresh_rollups
+from dgrehydro.service.forecast_run_db import get_latest_forecast_run
+from dgrehydro.service.response_cache import cached_response
+from dgrehydro.service.serialization import ROWS, FORMATS, select_to_json, json_response
+from dgrehydro.utils import parse_bbox, day_range, parse_datetime
+
+MAX_PAGE_SIZE = 1000
+STREAM_BATCH_SIZE = 1000
+DEFAULT_HISTORY_POINTS = 500
+MAX_HISTORY_POINTS = 5000
+NDJSON = "ndjson"
+STREAM_FORMATS = [NDJSON, "array"]
+
+
+def filter_by_bbox(query, bbox):
+    """Restrict a critical point query to the stations located within ``bbox``."""
+    return query.join(PoiStation, PoiStation.station_name == CriticalPoint.station_name).filter(
+        db.func.ST_Intersects(PoiStation.geom, db.func.ST_MakeEnvelope(*bbox, 4326))
+    )
+
+
+def filter_on_day(query, column, day):
+    """Filter ``column`` on a calendar day with a half-open range, so that its index can be used."""
+    start, end = day_range(day)
+    return query.filter(column >= start, column < end)
+
+
+def stream_critical_points(query, stream):
+    """Stream the rows of ``query`` from a server-side cursor, so memory does not grow with the history."""
+    def generate():
+        rows = db.session.execute(query.execution_options(yield_per=STREAM_BATCH_SIZE))
+        if stream == NDJSON:
+            for row in rows:
+                yield json.dumps(dict(row._mapping)) + "\n"
+        else:
+            separator = "["
+            for row in rows:
+                yield separator + json.dumps(dict(row._mapping))
+                separator = ","
+            yield "[]" if separator == "[" else "]"
+
+    mimetype = "application/x-ndjson" if stream == NDJSON else "application/json"
+    return Response(stream_with_context(generate()), mimetype=mimetype)
 
 
 @endpoints.route('/criticalpoint', strict_slashes=False, methods=['GET'])
+@cached_response(CRITICAL_POINT)
 def get_critical_points():
     """
     Get critical point data with optional filters.
@@ -18,35 +68,78 @@ def get_critical_points():
     - measurement_date: Filter by measurement date (YYYY-MM-DD)
     - forecast_date: Filter by forecast date (YYYY-MM-DD)
     - realtime_only: If 'true', only return real-time data (forecast_date == measurement_date)
+    - bbox: Only return stations within minx,miny,maxx,maxy (EPSG:4326)
+    - format: rows (default) or columnar for parallel arrays keyed by field
+    - limit: Return pages of at most limit rows as {"data": [...], "next_cursor": ...}
+    - cursor: next_cursor of the previous page
+    - stream: ndjson or array to stream all the matching rows, one JSON line each or as a chunked JSON array
     """
     try:
         station_name = request.args.get('station_name')
         measurement_date = request.args.get('measurement_date')
         forecast_date = request.args.get('forecast_date')
         realtime_only = request.args.get('realtime_only', 'false').lower() == 'true'
+        bbox = request.args.get('bbox')
+        output_format = request.args.get('format', ROWS)
+        limit = request.args.get('limit', type=int)
+        cursor = request.args.get('cursor')
+        stream = request.args.get('stream')
 
         logging.info(f"[GET][CRITICAL_POINT] Filters: station={station_name}, measurement_date={measurement_date}, "
-                    f"forecast_date={forecast_date}, realtime_only={realtime_only}")
+                    f"forecast_date={forecast_date}, realtime_only={realtime_only}, bbox={bbox}, format={output_format}, "
+                    f"limit={limit}, cursor={cursor}, stream={stream}")
+
+        try:
+            bbox = parse_bbox(bbox) if bbox else None
+        except ValueError as e:
+            return {"status": "error", "message": str(e)}, 400
+
+        if output_format not in FORMATS:
+            return {"status": "error", "message": f"format must be one of {', '.join(FORMATS)}"}, 400
+
+        if limit is not None and not 0 < limit <= MAX_PAGE_SIZE:
+            return {"status": "error", "message": f"limit must be between 1 and {MAX_PAGE_SIZE}"}, 400
+
+        if stream is not None and stream not in STREAM_FORMATS:
+            return {"status": "error", "message": f"stream must be one of {', '.join(STREAM_FORMATS)}"}, 400
 
-        query = CriticalPoint.query
+        query = select_critical_points()
+
+        if cursor:
+            try:
+                query = after_cursor(query, cursor)
+            except ValueError as e:
+                return {"status": "error", "message": str(e)}, 400
+
+        if bbox:
+            query = filter_by_bbox(query, bbox)
 
         if station_name:
             query = query.filter(CriticalPoint.station_name == station_name)
 
         if measurement_date:
-            query = query.filter(db.func.date(CriticalPoint.measurement_date) == measurement_date)
+            query = filter_on_day(query, CriticalPoint.measurement_date, measurement_date)
 
         if forecast_date:
-            query = query.filter(db.func.date(CriticalPoint.forecast_date) == forecast_date)
+            query = filter_on_day(query, CriticalPoint.forecast_date, forecast_date)
 
         if realtime_only:
             query = query.filter(CriticalPoint.measurement_date == CriticalPoint.forecast_date)
 
         # Order by measurement date and station name
-        query = query.order_by(desc(CriticalPoint.measurement_date), CriticalPoint.station_name)
+        query = query.order_by(*CRITICAL_POINT_ORDER)
+
+        if stream is not None:
+            return stream_critical_points(query, stream)
 
-        critical_points = query.all()
-        return [cp.serialize() for cp in critical_points], 200
+        if limit is not None:
+            data = select_to_json(query.limit(limit), output_format, CRITICAL_POINT_ORDER)
+            # A full page is followed by a cursor pointing after its last row
+            last_row = db.session.execute(query.offset(limit - 1).limit(1)).first()
+            next_cursor = encode_cursor(last_row) if last_row is not None else None
+            return json_response(f'{{"data": {data}, "next_cursor": {json.dumps(next_cursor)}}}')
+
+        return json_response(select_to_json(query, output_format, CRITICAL_POINT_ORDER))
 
     except Exception as e:
         logging.error(f"[GET][CRITICAL_POINT] Error fetching critical points: {e}")
@@ -54,12 +147,26 @@ def get_critical_points():
 
 
 @endpoints.route('/criticalpoint/stations', strict_slashes=False, methods=['GET'])
+@cached_response(CRITICAL_POINT)
 def get_critical_point_stations():
     """
     Get list of all available critical point stations.
+
+    Query parameters:
+    - bbox: Only return stations within minx,miny,maxx,maxy (EPSG:4326)
     """
     try:
-        stations = db.session.query(CriticalPoint.station_name).distinct().order_by(CriticalPoint.station_name).all()
+        bbox = request.args.get('bbox')
+        try:
+            bbox = parse_bbox(bbox) if bbox else None
+        except ValueError as e:
+            return {"status": "error", "message": str(e)}, 400
+
+        query = db.session.query(CriticalPoint.station_name)
+        if bbox:
+            query = filter_by_bbox(query, bbox)
+
+        stations = query.distinct().order_by(CriticalPoint.station_name).all()
         station_list = [station[0] for station in stations]
 
         return jsonify({"stations": station_list}), 200
@@ -70,28 +177,43 @@ def get_critical_point_stations():
 
 
 @endpoints.route('/criticalpoint/latest', strict_slashes=False, methods=['GET'])
+@cached_response(CRITICAL_POINT)
 def get_latest_critical_points():
     """
     Get the latest real-time measurements for all stations.
+
+    Query parameters:
+    - bbox: Only return stations within minx,miny,maxx,maxy (EPSG:4326)
+    - format: rows (default) or columnar for parallel arrays keyed by field
     """
     try:
+        bbox = request.args.get('bbox')
+        output_format = request.args.get('format', ROWS)
+        try:
+            bbox = parse_bbox(bbox) if bbox else None
+        except ValueError as e:
+            return {"status": "error", "message": str(e)}, 400
+
+        if output_format not in FORMATS:
+            return {"status": "error", "message": f"format must be one of {', '.join(FORMATS)}"}, 400
+
         # Get the most recent measurement date
-        latest_measurement = db.session.query(db.func.max(CriticalPoint.measurement_date)).scalar()
+        forecast_run = get_latest_forecast_run(CRITICAL_POINT)
 
-        if not latest_measurement:
+        if not forecast_run:
             return {"status": "error", "message": "No data available"}, 404
 
+        latest_measurement = forecast_run.init_date
+
         # Get all real-time data (measurement_date == forecast_date) for that date
-        query = CriticalPoint.query.filter(
+        query = select_critical_points().filter(
             CriticalPoint.measurement_date == latest_measurement,
             CriticalPoint.measurement_date == CriticalPoint.forecast_date
-        ).order_by(CriticalPoint.station_name)
-
-        critical_points = query.all()
-        return jsonify({
-            "measurement_date": latest_measurement.isoformat(),
-            "data": [cp.serialize() for cp in critical_points]
-        }), 200
+        )
+        if bbox:
+            query = filter_by_bbox(query, bbox)
+        data = select_to_json(query, output_format, (CriticalPoint.station_name,))
+        return json_response(f'{{"measurement_date": {json.dumps(latest_measurement.isoformat())}, "data": {data}}}')
 
     except Exception as e:
         logging.error(f"[GET][CRITICAL_POINT] Error fetching latest critical points: {e}")
@@ -99,22 +221,28 @@ def get_latest_critical_points():
 
 
 @endpoints.route('/criticalpoint/<station_name>/forecast', strict_slashes=False, methods=['GET'])
+@cached_response(CRITICAL_POINT)
 def get_critical_point_station_forecast(station_name):
     """
     Get forecast data for a specific station.
 
     Query parameters:
     - measurement_date: Base date for forecast (defaults to latest)
+    - format: rows (default) or columnar for parallel arrays keyed by field
     """
     try:
         measurement_date = request.args.get('measurement_date')
+        output_format = request.args.get('format', ROWS)
+
+        if output_format not in FORMATS:
+            return {"status": "error", "message": f"format must be one of {', '.join(FORMATS)}"}, 400
 
         logging.info(f"[GET][CRITICAL_POINT] Getting forecast for station: {station_name}, date: {measurement_date}")
 
-        query = CriticalPoint.query.filter(CriticalPoint.station_name == station_name)
+        query = select_critical_points().filter(CriticalPoint.station_name == station_name)
 
         if measurement_date:
-            query = query.filter(db.func.date(CriticalPoint.measurement_date) == measurement_date)
+            query = filter_on_day(query, CriticalPoint.measurement_date, measurement_date)
         else:
             # Get the latest measurement date for this station
             latest_date = db.session.query(db.func.max(CriticalPoint.measurement_date)).filter(
@@ -124,22 +252,66 @@ def get_critical_point_station_forecast(station_name):
                 query = query.filter(CriticalPoint.measurement_date == latest_date)
 
         query = query.order_by(CriticalPoint.forecast_date)
-        critical_points = query.all()
+        first_measurement_date = db.session.execute(
+            query.with_only_columns(CriticalPoint.measurement_date).limit(1)
+        ).scalar()
 
-        if not critical_points:
+        if first_measurement_date is None:
             return {"status": "error", "message": f"No data found for station {station_name}"}, 404
 
-        return jsonify({
-            "station_name": station_name,
-            "measurement_date": critical_points[0].measurement_date.isoformat(),
-            "forecast": [cp.serialize() for cp in critical_points]
-        }), 200
+        forecast = select_to_json(query, output_format, (CriticalPoint.forecast_date,))
+        return json_response(f'{{"station_name": {json.dumps(station_name)}, '
+                             f'"measurement_date": {json.dumps(first_measurement_date.isoformat())}, '
+                             f'"forecast": {forecast}}}')
 
     except Exception as e:
         logging.error(f"[GET][CRITICAL_POINT] Error fetching forecast: {e}")
         return {"status": "error", "message": str(e)}, 500
 
 
+@endpoints.route('/criticalpoint/<station_name>/history', strict_slashes=False, methods=['GET'])
+@cached_response(CRITICAL_POINT)
+def get_critical_point_station_history(station_name):
+    """
+    Get the downsampled real-time history of a station, read from the hourly or daily rollups.
+
+    Query parameters:
+    - variable: water_level (default) or flow
+    - start: Start of the range (defaults to one year before end)
+    - end: End of the range, excluded (defaults to now)
+    - points: Maximum number of points (default 500)
+    - method: lttb (default) for averages selected by Largest-Triangle-Three-Buckets, or minmax for min/max envelopes
+    """
+    try:
+        variable = request.args.get('variable', 'water_level')
+        start = request.args.get('start')
+        end = request.args.get('end')
+        points = request.args.get('points', DEFAULT_HISTORY_POINTS, type=int)
+        method = request.args.get('method', LTTB)
+
+        logging.info(f"[GET][CRITICAL_POINT] History of station: {station_name}, variable: {variable}, start: {start}, "
+                     f"end: {end}, points: {points}, method: {method}")
+
+        if variable not in HISTORY_VARIABLES:
+            return {"status": "error", "message": f"variable must be one of {', '.join(HISTORY_VARIABLES)}"}, 400
+        if method not in HISTORY_METHODS:
+            return {"status": "error", "message": f"method must be one of {', '.join(HISTORY_METHODS)}"}, 400
+        if not 3 <= points <= MAX_HISTORY_POINTS:
+            return {"status": "error", "message": f"points must be between 3 and {MAX_HISTORY_POINTS}"}, 400
+
+        try:
+            end = parse_datetime(end) if end else datetime.utcnow()
+            start = parse_datetime(start) if start else end - timedelta(days=365)
+        except ValueError:
+            return {"status": "error", "message": f"Invalid date range {start} {end}"}, 400
+
+        return jsonify(get_critical_point_history(station_name, start, end, variable, points, method)), 200
+
+    except Exception as e:
+        logging.error(f"[GET][CRITICAL_POINT] Error fetching history: {e}")
+        return {"status": "error", "message": str(e)}, 500
+
+
 @endpoints.route('/criticalpoint/<station_name>', strict_slashes=False, methods=['POST'])
 def update_critical_point(station_name):
     """
@@ -183,7 +355,9 @@ def update_critical_point(station_name):
         if water_level is not None:
             db_record.water_level = water_level
 
+        refresh_rollups(CRITICAL_POINT, [db_record.forecast_date])
         db.session.commit()
+        on_override_commit(CRITICAL_POINT, [db_record.forecast_date])
 
         return db_record.serialize(), 200
 
@@ -192,7 +366,51 @@ def update_critical_point(station_name):
         return {"status": "error", "message": str(e)}, 500
 
 
+CRITICAL_POINT_BATCH_KEYS = [
+    BatchField("station_name", "varchar", str),
+    BatchField("measurement_date", "timestamp", parse_datetime),
+    BatchField("forecast_date", "timestamp", parse_datetime),
+]
+CRITICAL_POINT_BATCH_VALUES = [
+    BatchField("flow", "double precision", float, required=False),
+    BatchField("water_level", "double precision", float, required=False),
+]
+
+
+@endpoints.route('/criticalpoint/batch', strict_slashes=False, methods=['POST'])
+def update_critical_points_batch():
+    """
+    Update many critical point records in one transaction.
+
+    Body: a JSON array of {"station_name", "measurement_date", "forecast_date", "flow", "water_level"}
+    objects, or a CSV with these columns (text/csv body or multipart "file" upload). Missing flow or
+    water_level values are left unchanged. Returns the status of every row, in order.
+    """
+    try:
+        rows = read_batch_rows(request)
+        if len(rows) > MAX_BATCH_SIZE:
+            return {"status": "error", "message": f"At most {MAX_BATCH_SIZE} rows per batch"}, 400
+        logging.info(f"[UPDATE][CRITICAL_POINT][BATCH]: {len(rows)} rows")
+
+        set_clause = "flow = COALESCE(v.flow, t.flow), water_level = COALESCE(v.water_level, t.water_level)"
+        statuses, updated = apply_batch_update(CriticalPoint.__tablename__, CRITICAL_POINT_BATCH_KEYS,
+                                               CRITICAL_POINT_BATCH_VALUES, set_clause, rows)
+        refresh_rollups(CRITICAL_POINT, [row["forecast_date"] for row in updated])
+        db.session.commit()
+        on_override_commit(CRITICAL_POINT, [row["forecast_date"] for row in updated])
+
+        return jsonify({"updated": len(updated), "rows": statuses}), 200
+
+    except ValueError as e:
+        return {"status": "error", "message": str(e)}, 400
+    except Exception as e:
+        db.session.rollback()
+        logging.error(f"[UPDATE][CRITICAL_POINT][BATCH] Error updating critical points: {e}")
+        return {"status": "error", "message": str(e)}, 500
+
+
 @endpoints.route('/criticalpoint/forecast_dates', strict_slashes=False, methods=['GET'])
+@cached_response(CRITICAL_POINT)
 def get_critical_point_measurement_dates():
     """
     Get list of all forecast dates for the latest measurement date.
@@ -201,21 +419,16 @@ def get_critical_point_measurement_dates():
     try:
         logging.info("[GET][CRITICAL_POINT]: Get forecast dates for latest measurement")
 
-        # Get the latest measurement date
-        latest_measurement = db.session.query(db.func.max(CriticalPoint.measurement_date)).scalar()
+        # The forecast dates of the latest measurement are kept in the run registry
+        forecast_run = get_latest_forecast_run(CRITICAL_POINT)
 
-        if not latest_measurement:
+        if not forecast_run:
             return {"status": "error", "message": "No data available"}, 404
 
-        # Get all distinct forecast dates for the latest measurement date
-        forecast_dates = db.session.query(CriticalPoint.forecast_date).filter(
-            CriticalPoint.measurement_date == latest_measurement
-        ).distinct().order_by(CriticalPoint.forecast_date).all()
-
-        date_list = [date[0].strftime("%Y-%m-%dT%H:%M:%S.000Z") for date in forecast_dates]
+        date_list = [date.strftime("%Y-%m-%dT%H:%M:%S.000Z") for date in forecast_run.forecast_dates]
 
         response = {
-            "measurement_date": latest_measurement.strftime("%Y-%m-%dT%H:%M:%S.000Z"),
+            "measurement_date": forecast_run.init_date.strftime("%Y-%m-%dT%H:%M:%S.000Z"),
             "timestamps": date_list,
             "count": len(date_list)
         }
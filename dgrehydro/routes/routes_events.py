@@ -0,0 +1,81 @@
+import json
+import logging
+import queue
+import time
+
+from flask import Response, request
+
+from dgrehydro import db
+from dgrehydro.config.products import PRODUCTS
+from dgrehydro.routes import endpoints
+from dgrehydro.service.data_version_db import get_data_versions
+from dgrehydro.service.event_feed import event_feed
+
+# Seconds between two heartbeats keeping idle connections open through proxies
+SSE_HEARTBEAT_INTERVAL = 15
+
+# Seconds after which a stream is closed to release the worker thread, EventSource clients reconnect
+SSE_MAX_DURATION = 600
+
+# Milliseconds clients wait before reconnecting
+SSE_RETRY = 3000
+
+
+def format_event(event: str, data: str) -> str:
+    return f"event: {event}\ndata: {data}\n\n"
+
+
+def stream_events(events: queue.Queue, products: list[str], versions: dict):
+    # Clients refetch the products whose version changed while they were disconnected
+    yield f"retry: {SSE_RETRY}\n" + format_event("versions", json.dumps(versions))
+
+    deadline = time.monotonic() + SSE_MAX_DURATION
+    while time.monotonic() < deadline:
+        try:
+            product, payload = events.get(timeout=SSE_HEARTBEAT_INTERVAL)
+        except queue.Empty:
+            yield ": heartbeat\n\n"
+            continue
+        if product in products:
+            yield format_event("data", payload)
+
+
+@endpoints.route('/events', strict_slashes=False, methods=['GET'])
+def get_events():
+    """
+    Server-sent events published whenever an ingestion or an override commits new values.
+
+    Query parameters:
+    - products: Comma separated products to follow (defaults to all)
+
+    The stream starts with a ``versions`` event holding the data version of each product, followed by a ``data``
+    event per change with its product, ``ingest`` or ``override``, the new version and the changed forecast dates.
+    """
+    products = request.args.get('products')
+    products = products.split(',') if products else PRODUCTS
+    unknown = [product for product in products if product not in PRODUCTS]
+    if unknown:
+        return {"status": "error", "message": f"products must be among {', '.join(PRODUCTS)}"}, 400
+
+    events = None
+    try:
+        logging.info(f"[GET][EVENTS] products: {products}")
+        # The stream runs after the application context is gone, the listener connects with these arguments
+        connect_args = db.engine.url.translate_connect_args(username="user", database="dbname")
+        # Subscribe before reading the versions so that no event committed in between is lost
+        events = event_feed.subscribe(connect_args)
+        versions = {product: data_version.version for product, data_version in get_data_versions(products).items()}
+
+        response = Response(stream_events(events, products, versions), mimetype="text/event-stream")
+        # Also called when the client leaves before the stream started
+        response.call_on_close(lambda: event_feed.unsubscribe(events))
+        response.cache_control.no_cache = True
+        # Disable the buffering of the nginx proxy
+        response.headers["X-Accel-Buffering"] = "no"
+        return response
+
+    except Exception as e:
+        if events is not None:
+            event_feed.unsubscribe(events)
+        logging.error(f"[GET][EVENTS] Error opening the event stream: {e}")
+        return {"status": "error", "message": str(e)}, 500
@@ -1,26 +1,42 @@
 import datetime
 import logging
 
-from flask import request, jsonify
-from sqlalchemy import desc
+from flask import Response, request, jsonify
 
 from dgrehydro import db
+from dgrehydro.config.products import FLASH_FLOOD
 from dgrehydro.models.flashflood import FlashFlood
+from dgrehydro.models.flashflooddaily import FlashFloodDaily
 from dgrehydro.routes import endpoints
-from dgrehydro.service.flash_db import flashfloods_to_geojson
+from dgrehydro.service.batch_override import MAX_BATCH_SIZE, BatchField, read_batch_rows, apply_batch_update
+from dgrehydro.service.data_events import on_override_commit, refresh_rollups
+from dgrehydro.service.flash_db import flashfloods_to_geojson, flashfloods_bundle_to_geojson, flashfloods_values, \
+    select_flash_floods, select_flash_flood_daily, ADMIN_LEVELS, MUNICIPALITY
+from dgrehydro.service.forecast_run_db import get_latest_forecast_runs, get_latest_forecast_run
+from dgrehydro.service.geojson_cache import get_cached_geojson, encode_cached_geojson
+from dgrehydro.service.response_cache import cached_response
+from dgrehydro.service.serialization import ROWS, FORMATS, select_to_json, json_response
+from dgrehydro.utils import SERIES_DAYS, parse_bbox, day_range, parse_datetime
+
+# Default range in days of the daily rollups endpoint
+DAILY_ROLLUP_DAYS = 30
 
 
 @endpoints.route('/flashflood', strict_slashes=False, methods=['GET'])
+@cached_response(FLASH_FLOOD)
 def get_flash_floods():
     try:
         today = datetime.datetime.now().strftime("%Y-%m-%d")
         forecast_date = request.args.get('forecast_date', today)
-        logging.info(f"[GET][FLASH_FLOOD] forecast date: {forecast_date}")
+        output_format = request.args.get('format', ROWS)
+        logging.info(f"[GET][FLASH_FLOOD] forecast date: {forecast_date}, format: {output_format}")
+
+        if output_format not in FORMATS:
+            return {"status": "error", "message": f"format must be one of {', '.join(FORMATS)}"}, 400
 
-        query = FlashFlood.query.filter(FlashFlood.forecast_date == forecast_date)
+        statement = select_flash_floods().where(FlashFlood.forecast_date == forecast_date)
 
-        flash_floods = query.all()
-        return [flood.serialize() for flood in flash_floods], 200
+        return json_response(select_to_json(statement, output_format))
     except Exception as e:
         logging.error(f"Error fetching flash floods: {e}")
         return {"status": "error", "message": str(e)}, 500
@@ -43,7 +59,9 @@ def update_flash_flood(subid):
             return {"status": "error", "message": "Record not found"}, 404
 
         db_record_to_update.value = value
+        refresh_rollups(FLASH_FLOOD, [db_record_to_update.forecast_date])
         db.session.commit()
+        on_override_commit(FLASH_FLOOD, [db_record_to_update.forecast_date])
 
         return db_record_to_update.serialize(), 200
 
@@ -51,19 +69,49 @@ def update_flash_flood(subid):
         logging.error(f"[UPDATE][FLASH_FLOOD] Error updating flash flood: {e}")
         return {"status": "error", "message": str(e)}, 500
 
+FLASH_FLOOD_BATCH_KEYS = [
+    BatchField("subid", "integer", int),
+    BatchField("forecast_date", "timestamp", parse_datetime),
+]
+FLASH_FLOOD_BATCH_VALUES = [BatchField("value", "integer", int)]
+
+@endpoints.route('/flashflood/batch', strict_slashes=False, methods=['POST'])
+def update_flash_floods_batch():
+    """
+    Update many flash flood values in one transaction.
+
+    Body: a JSON array of {"subid", "forecast_date", "value"} objects, or a CSV with these columns
+    (text/csv body or multipart "file" upload). Returns the status of every row, in order.
+    """
+    try:
+        rows = read_batch_rows(request)
+        if len(rows) > MAX_BATCH_SIZE:
+            return {"status": "error", "message": f"At most {MAX_BATCH_SIZE} rows per batch"}, 400
+        logging.info(f"[UPDATE][FLASH_FLOOD][BATCH]: {len(rows)} rows")
+
+        statuses, updated = apply_batch_update(FlashFlood.__tablename__, FLASH_FLOOD_BATCH_KEYS,
+                                               FLASH_FLOOD_BATCH_VALUES, "value = v.value", rows)
+        refresh_rollups(FLASH_FLOOD, [row["forecast_date"] for row in updated])
+        db.session.commit()
+        on_override_commit(FLASH_FLOOD, [row["forecast_date"] for row in updated])
+
+        return jsonify({"updated": len(updated), "rows": statuses}), 200
+
+    except ValueError as e:
+        return {"status": "error", "message": str(e)}, 400
+    except Exception as e:
+        db.session.rollback()
+        logging.error(f"[UPDATE][FLASH_FLOOD][BATCH] Error updating flash floods: {e}")
+        return {"status": "error", "message": str(e)}, 500
+
 @endpoints.route('/flashflood/forecast_dates', strict_slashes=False, methods=['GET'])
+@cached_response(FLASH_FLOOD)
 def get_flash_flood_dates():
     try:
         logging.info("[GET][FLASH_FLOOD]: get forececast dates")
-        db_flashflood = FlashFlood.query.order_by(desc(FlashFlood.forecast_date)).first()
-        dates = []
-
-        if db_flashflood:
-            latest_date = db_flashflood.forecast_date
-            dates.append(latest_date)
-
-            for i in range(1, 4):
-                dates.append(latest_date - datetime.timedelta(hours=i*6))
+        # Each 6 hourly slot is registered as its own run, the latest 4 cover the last day
+        forecast_runs = get_latest_forecast_runs(FLASH_FLOOD, limit=4)
+        dates = [forecast_run.init_date for forecast_run in forecast_runs]
 
         dates = [date.strftime("%Y-%m-%dT%H:%M:%S.000Z") for date in dates]
 
@@ -77,16 +125,178 @@ def get_flash_flood_dates():
         return {"status": "error", "message": str(e)}, 500
 
 @endpoints.route('/flashfloods', strict_slashes=False, methods=['GET'])
+@cached_response(FLASH_FLOOD)
 def get_flash_floods_as_geojson():
     try:
         today = datetime.datetime.now().strftime("%Y-%m-%d")
         forecast_date = request.args.get('forecast_date', today)
-        logging.info(f"[GET][FLASH_FLOODS AS GEOJSON] forecast date: {forecast_date}")
+        bbox = request.args.get('bbox')
+        logging.info(f"[GET][FLASH_FLOODS AS GEOJSON] forecast date: {forecast_date}, bbox: {bbox}")
+
+        try:
+            bbox = parse_bbox(bbox) if bbox else None
+        except ValueError as e:
+            return {"status": "error", "message": str(e)}, 400
 
-        result = flashfloods_to_geojson(forecast_date)
+        try:
+            forecast_date = parse_datetime(forecast_date)
+        except ValueError:
+            return {"status": "error", "message": f"Invalid forecast date {forecast_date}"}, 400
+
+        if bbox is None:
+            cached = get_cached_geojson(FLASH_FLOOD, forecast_date, forecast_date)
+            if cached is not None:
+                body, content_encoding = encode_cached_geojson(cached, request.accept_encodings)
+                response = Response(body, mimetype="application/json")
+                response.content_encoding = content_encoding
+                response.vary.add("Accept-Encoding")
+                return response
+
+        result = flashfloods_to_geojson(forecast_date, bbox)
         return jsonify(result), 200
 
     except Exception as e:
         logging.error(f"Error fetching flash floods: dates {e}")
         return {"status": "error", "message": str(e)}, 500
 
+
+@endpoints.route('/flashfloods/bundle', strict_slashes=False, methods=['GET'])
+@cached_response(FLASH_FLOOD)
+def get_flash_floods_bundle_as_geojson():
+    try:
+        date = request.args.get('date')
+        bbox = request.args.get('bbox')
+        logging.info(f"[GET][FLASH_FLOODS BUNDLE AS GEOJSON] date: {date}, bbox: {bbox}")
+
+        try:
+            bbox = parse_bbox(bbox) if bbox else None
+        except ValueError as e:
+            return {"status": "error", "message": str(e)}, 400
+
+        if date is None:
+            forecast_run = get_latest_forecast_run(FLASH_FLOOD)
+            if forecast_run is None:
+                return {"status": "error", "message": "No flash flood run found"}, 404
+            date = forecast_run.init_date.isoformat()
+
+        try:
+            start_date, end_date = day_range(date)
+        except ValueError:
+            return {"status": "error", "message": f"Invalid date {date}"}, 400
+
+        result = flashfloods_bundle_to_geojson(start_date, end_date, bbox)
+        return jsonify(result), 200
+
+    except Exception as e:
+        logging.error(f"Error fetching flash floods bundle: {e}")
+        return {"status": "error", "message": str(e)}, 500
+
+@endpoints.route('/flashfloods/values', strict_slashes=False, methods=['GET'])
+@cached_response(FLASH_FLOOD)
+def get_flash_floods_values():
+    try:
+        date = request.args.get('date')
+        logging.info(f"[GET][FLASH_FLOODS VALUES] date: {date}")
+
+        if date is None:
+            forecast_run = get_latest_forecast_run(FLASH_FLOOD)
+            if forecast_run is None:
+                return {"status": "error", "message": "No flash flood run found"}, 404
+            date = forecast_run.init_date.isoformat()
+
+        try:
+            start_date, end_date = day_range(date)
+        except ValueError:
+            return {"status": "error", "message": f"Invalid date {date}"}, 400
+
+        result = flashfloods_values(start_date, end_date)
+        return jsonify(result), 200
+
+    except Exception as e:
+        logging.error(f"Error fetching flash floods values: {e}")
+        return {"status": "error", "message": str(e)}, 500
+
+@endpoints.route('/flashflood/<int:subid>/series', strict_slashes=False, methods=['GET'])
+@cached_response(FLASH_FLOOD)
+def get_flash_flood_series(subid):
+    """
+    Get every value of a municipality with a forecast date in [start, end).
+
+    Query parameters:
+    - start: First forecast date (defaults to 30 days ago)
+    - end: Forecast date after the last one (defaults to no bound)
+    - format: rows (default) or columnar for parallel arrays keyed by field
+    """
+    try:
+        start = request.args.get('start')
+        end = request.args.get('end')
+        output_format = request.args.get('format', ROWS)
+        logging.info(f"[GET][FLASH_FLOOD][SERIES] subid: {subid}, start: {start}, end: {end}, format: {output_format}")
+
+        if output_format not in FORMATS:
+            return {"status": "error", "message": f"format must be one of {', '.join(FORMATS)}"}, 400
+
+        try:
+            start = parse_datetime(start) if start else datetime.datetime.utcnow() - datetime.timedelta(days=SERIES_DAYS)
+            end = parse_datetime(end) if end else None
+        except ValueError:
+            return {"status": "error", "message": f"Invalid date range {start} {end}"}, 400
+
+        # Served by the (subid, forecast_date) unique index
+        statement = select_flash_floods().where(FlashFlood.subid == subid, FlashFlood.forecast_date >= start)
+        if end is not None:
+            statement = statement.where(FlashFlood.forecast_date < end)
+        order_by = (FlashFlood.forecast_date,)
+
+        return json_response(select_to_json(statement, output_format, order_by))
+
+    except Exception as e:
+        logging.error(f"Error fetching flash flood series: {e}")
+        return {"status": "error", "message": str(e)}, 500
+
+
+@endpoints.route('/flashflood/daily', strict_slashes=False, methods=['GET'])
+@cached_response(FLASH_FLOOD)
+def get_flash_flood_daily():
+    """
+    Get the daily maximum vigilance and mean weighted FFFT of the municipalities, provinces or regions.
+
+    Query parameters:
+    - level: municipality (default), province or region
+    - area_id: Restrict to one area, the subid of a municipality, the name of a province or the gid of a region
+    - start: First day (defaults to 30 days ago)
+    - end: Day after the last one (defaults to no bound)
+    - format: rows (default) or columnar for parallel arrays keyed by field
+    """
+    try:
+        level = request.args.get('level', MUNICIPALITY)
+        area_id = request.args.get('area_id')
+        start = request.args.get('start')
+        end = request.args.get('end')
+        output_format = request.args.get('format', ROWS)
+        logging.info(f"[GET][FLASH_FLOOD][DAILY] level: {level}, area_id: {area_id}, start: {start}, end: {end}, "
+                     f"format: {output_format}")
+
+        if level not in ADMIN_LEVELS:
+            return {"status": "error", "message": f"level must be one of {', '.join(ADMIN_LEVELS)}"}, 400
+        if output_format not in FORMATS:
+            return {"status": "error", "message": f"format must be one of {', '.join(FORMATS)}"}, 400
+
+        try:
+            start = parse_datetime(start).date() if start else datetime.date.today() - datetime.timedelta(days=DAILY_ROLLUP_DAYS)
+            end = parse_datetime(end).date() if end else None
+        except ValueError:
+            return {"status": "error", "message": f"Invalid date range {start} {end}"}, 400
+
+        statement = select_flash_flood_daily().where(FlashFloodDaily.level == level, FlashFloodDaily.day >= start)
+        if end is not None:
+            statement = statement.where(FlashFloodDaily.day < end)
+        if area_id is not None:
+            statement = statement.where(FlashFloodDaily.area_id == area_id)
+        order_by = (FlashFloodDaily.day, FlashFloodDaily.area_id)
+
+        return json_response(select_to_json(statement, output_format, order_by))
+
+    except Exception as e:
+        logging.error(f"Error fetching flash flood daily rollups: {e}")
+        return {"status": "error", "message": str(e)}, 500
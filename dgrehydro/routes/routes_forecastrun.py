@@ -0,0 +1,89 @@
+import logging
+
+from flask import request, jsonify
+
+from dgrehydro.config.products import PRODUCTS
+from dgrehydro.models.runchange import RunChange
+from dgrehydro.routes import endpoints
+from dgrehydro.service.forecast_run_db import get_latest_forecast_runs, get_latest_forecast_run
+from dgrehydro.service.response_cache import cached_response
+from dgrehydro.service.run_changes_db import select_run_changes
+from dgrehydro.service.run_diff import CHANGES
+from dgrehydro.service.serialization import ROWS, FORMATS, select_to_json, json_response
+from dgrehydro.utils import parse_datetime
+
+
+@endpoints.route('/forecastruns', strict_slashes=False, methods=['GET'])
+def get_forecast_runs():
+    """
+    Get the ingested runs of a product, most recent first.
+
+    Query parameters:
+    - product: riverine_flood, flash_flood or critical_point
+    - limit: Number of runs to return (default 10)
+    """
+    try:
+        product = request.args.get('product')
+        limit = request.args.get('limit', 10, type=int)
+
+        if product not in PRODUCTS:
+            return {"status": "error", "message": f"product must be one of {', '.join(PRODUCTS)}"}, 400
+
+        logging.info(f"[GET][FORECAST_RUN] product: {product}, limit: {limit}")
+
+        forecast_runs = get_latest_forecast_runs(product, limit=limit)
+        return jsonify([forecast_run.serialize() for forecast_run in forecast_runs]), 200
+
+    except Exception as e:
+        logging.error(f"[GET][FORECAST_RUN] Error fetching forecast runs: {e}")
+        return {"status": "error", "message": str(e)}, 500
+
+
+@endpoints.route('/changes', strict_slashes=False, methods=['GET'])
+@cached_response(*PRODUCTS)
+def get_run_changes():
+    """
+    Get the warning levels that changed between a run and the previous one.
+
+    Query parameters:
+    - product: riverine_flood, flash_flood or critical_point
+    - init_date: Init date of the run (defaults to the latest run)
+    - change: Comma separated changes to return among upgraded, downgraded and new_alert (defaults to all)
+    - format: rows (default) or columnar for parallel arrays keyed by field
+    """
+    try:
+        product = request.args.get('product')
+        init_date = request.args.get('init_date')
+        changes = request.args.get('change')
+        output_format = request.args.get('format', ROWS)
+        logging.info(f"[GET][RUN_CHANGE] product: {product}, init date: {init_date}, change: {changes}, "
+                     f"format: {output_format}")
+
+        if product not in PRODUCTS:
+            return {"status": "error", "message": f"product must be one of {', '.join(PRODUCTS)}"}, 400
+        if output_format not in FORMATS:
+            return {"status": "error", "message": f"format must be one of {', '.join(FORMATS)}"}, 400
+        changes = changes.split(',') if changes else CHANGES
+        if any(change not in CHANGES for change in changes):
+            return {"status": "error", "message": f"change must be among {', '.join(CHANGES)}"}, 400
+
+        if init_date is None:
+            forecast_run = get_latest_forecast_run(product)
+            if forecast_run is None:
+                return {"status": "error", "message": f"No {product} run found"}, 404
+            init_date = forecast_run.init_date
+        else:
+            try:
+                init_date = parse_datetime(init_date)
+            except ValueError:
+                return {"status": "error", "message": f"Invalid init date {init_date}"}, 400
+
+        statement = select_run_changes().where(RunChange.product == product, RunChange.init_date == init_date,
+                                               RunChange.change.in_(changes))
+        order_by = (RunChange.change, RunChange.level.desc(), RunChange.item_id)
+
+        return json_response(select_to_json(statement, output_format, order_by))
+
+    except Exception as e:
+        logging.error(f"[GET][RUN_CHANGE] Error fetching run changes: {e}")
+        return {"status": "error", "message": str(e)}, 500
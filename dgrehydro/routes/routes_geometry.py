@@ -0,0 +1,35 @@
+import logging
+
+from flask import Response, request
+
+from dgrehydro.routes import endpoints
+from dgrehydro.service.geometry_db import GEOMETRY_LAYERS, get_geometries
+
+# Geometries only change when load_geometries runs, clients revalidate with the ETag afterwards
+GEOMETRY_MAX_AGE = 7 * 24 * 3600
+
+
+@endpoints.route('/geometries/<layer>', strict_slashes=False, methods=['GET'])
+def get_geometry_layer(layer):
+    """
+    Get the static geometries of a layer, to be joined client side with the values endpoints on subid.
+
+    Path parameters:
+    - layer: river_segment or municipality
+    """
+    if layer not in GEOMETRY_LAYERS:
+        return {"status": "error", "message": f"Unknown layer {layer}"}, 404
+
+    try:
+        logging.info(f"[GET][GEOMETRY] layer: {layer}")
+        geojson, content_hash = get_geometries(layer)
+
+        response = Response(geojson, mimetype="application/geo+json")
+        response.set_etag(content_hash)
+        response.cache_control.public = True
+        response.cache_control.max_age = GEOMETRY_MAX_AGE
+        return response.make_conditional(request)
+
+    except Exception as e:
+        logging.error(f"[GET][GEOMETRY] Error fetching geometries {layer}: {e}")
+        return {"status": "error", "message": str(e)}, 500
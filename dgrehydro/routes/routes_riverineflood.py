@@ -1,28 +1,41 @@
 import datetime
 import logging
 
-from flask import request, jsonify
-from sqlalchemy import desc
+from flask import Response, request, jsonify
 
 from dgrehydro import db
+from dgrehydro.config.products import RIVERINE_FLOOD
 from dgrehydro.models.riverineflood import RiverineFlood
+from dgrehydro.models.riverinefloodrun import RiverineFloodRun
 from dgrehydro.routes import endpoints
-from dgrehydro.service.riverine_db import riverinesfloods_to_geojson
+from dgrehydro.service.batch_override import MAX_BATCH_SIZE, BatchField, read_batch_rows, apply_batch_update
+from dgrehydro.service.data_events import on_override_commit
+from dgrehydro.service.forecast_run_db import get_latest_forecast_run
+from dgrehydro.service.geojson_cache import get_cached_geojson, encode_cached_geojson
+from dgrehydro.service.response_cache import cached_response
+from dgrehydro.service.riverine_db import riverinesfloods_to_geojson, riverinefloods_max_to_geojson, \
+    riverinefloods_bundle_to_geojson, riverinefloods_values, riverinefloods_exceedance, select_riverine_floods, \
+    update_riverine_flood_levels
+from dgrehydro.service.serialization import ROWS, FORMATS, select_to_json, json_response
+from dgrehydro.utils import SERIES_DAYS, parse_bbox, parse_datetime
 
-FORECAST_DAYS = 10
 
 @endpoints.route('/riverineflood', strict_slashes=False, methods=['GET'])
+@cached_response(RIVERINE_FLOOD)
 def get_riverine_floods():
     try:
         today = datetime.datetime.now().strftime("%Y-%m-%d")
         init_date = request.args.get('init_date', today)
         forecast_date = request.args.get('forecast_date', today)
-        logging.info(f"[GET][RIVERINE_FLOOD] init date: {init_date}, forecast date: {forecast_date}")
+        output_format = request.args.get('format', ROWS)
+        logging.info(f"[GET][RIVERINE_FLOOD] init date: {init_date}, forecast date: {forecast_date}, format: {output_format}")
 
-        query = RiverineFlood.query.filter((RiverineFlood.init_date == init_date) & (RiverineFlood.forecast_date == forecast_date))
+        if output_format not in FORMATS:
+            return {"status": "error", "message": f"format must be one of {', '.join(FORMATS)}"}, 400
 
-        riverine_floods = query.all()
-        return [flood.serialize() for flood in riverine_floods], 200
+        statement = select_riverine_floods().where((RiverineFlood.init_date == init_date) & (RiverineFlood.forecast_date == forecast_date))
+
+        return json_response(select_to_json(statement, output_format))
     except Exception as e:
         logging.error(f"Error fetching riverine floods: {e}")
         return {"status": "error", "message": str(e)}, 500
@@ -47,6 +60,7 @@ def update_riverine_flood(subid):
 
         db_record_to_update.value = value
         db.session.commit()
+        on_override_commit(RIVERINE_FLOOD, [db_record_to_update.forecast_date], db_record_to_update.init_date)
 
         return db_record_to_update.serialize(), 200
 
@@ -54,19 +68,53 @@ def update_riverine_flood(subid):
         logging.error(f"[UPDATE][RIVERINE_FLOOD] Error updating riverine flood: {e}")
         return {"status": "error", "message": str(e)}, 500
 
+RIVERINE_FLOOD_BATCH_KEYS = [
+    BatchField("subid", "integer", int),
+    BatchField("init_date", "timestamp", parse_datetime),
+    BatchField("forecast_date", "timestamp", parse_datetime),
+]
+RIVERINE_FLOOD_BATCH_VALUES = [BatchField("value", "integer", int)]
+
+@endpoints.route('/riverineflood/batch', strict_slashes=False, methods=['POST'])
+def update_riverine_floods_batch():
+    """
+    Update many riverine flood values in one transaction.
+
+    Body: a JSON array of {"subid", "init_date", "forecast_date", "value"} objects, or a CSV with these
+    columns (text/csv body or multipart "file" upload). Returns the status of every row, in order.
+    """
+    try:
+        rows = read_batch_rows(request)
+        if len(rows) > MAX_BATCH_SIZE:
+            return {"status": "error", "message": f"At most {MAX_BATCH_SIZE} rows per batch"}, 400
+        logging.info(f"[UPDATE][RIVERINE_FLOOD][BATCH]: {len(rows)} rows")
+
+        # Written to the packed runs directly, once per run instead of once per day through the view trigger
+        statuses, updated = apply_batch_update(RiverineFlood.__tablename__, RIVERINE_FLOOD_BATCH_KEYS,
+                                               RIVERINE_FLOOD_BATCH_VALUES, "value = v.value", rows,
+                                               update=update_riverine_flood_levels)
+        db.session.commit()
+
+        for init_date in {row["init_date"] for row in updated}:
+            on_override_commit(RIVERINE_FLOOD, [row["forecast_date"] for row in updated if row["init_date"] == init_date],
+                               init_date)
+
+        return jsonify({"updated": len(updated), "rows": statuses}), 200
+
+    except ValueError as e:
+        return {"status": "error", "message": str(e)}, 400
+    except Exception as e:
+        db.session.rollback()
+        logging.error(f"[UPDATE][RIVERINE_FLOOD][BATCH] Error updating riverine floods: {e}")
+        return {"status": "error", "message": str(e)}, 500
+
 @endpoints.route('/riverineflood/forecast_dates', strict_slashes=False, methods=['GET'])
+@cached_response(RIVERINE_FLOOD)
 def get_riverine_floods_dates():
     try:
         logging.info("[GET][RIVERINE_FLOOD]: get forececast dates")
-        latest_init_date = RiverineFlood.query.order_by(desc(RiverineFlood.init_date)).first()
-        dates = []
-
-        if latest_init_date:
-            latest_init_date = latest_init_date.init_date
-            dates.append(latest_init_date)
-
-            for i in range(1, FORECAST_DAYS):
-                dates.append(latest_init_date + datetime.timedelta(days=i))
+        forecast_run = get_latest_forecast_run(RIVERINE_FLOOD)
+        dates = forecast_run.forecast_dates if forecast_run else []
 
         dates = [date.strftime("%Y-%m-%dT%H:%M:%S.000Z") for date in dates]
 
@@ -80,17 +128,214 @@ def get_riverine_floods_dates():
         return {"status": "error", "message": str(e)}, 500
 
 @endpoints.route('/riverinefloods', strict_slashes=False, methods=['GET'])
+@cached_response(RIVERINE_FLOOD)
 def get_riverine_floods_as_geojson():
     try:
         today = datetime.datetime.now().strftime("%Y-%m-%d")
         init_date = request.args.get('init_date', today)
         forecast_date = request.args.get('forecast_date', today)
-        logging.info(f"[GET][RIVERINE_FLOODS AS GEOJSON] init date: {init_date}, forecast date: {forecast_date}")
+        bbox = request.args.get('bbox')
+        logging.info(f"[GET][RIVERINE_FLOODS AS GEOJSON] init date: {init_date}, forecast date: {forecast_date}, bbox: {bbox}")
+
+        try:
+            bbox = parse_bbox(bbox) if bbox else None
+        except ValueError as e:
+            return {"status": "error", "message": str(e)}, 400
 
-        result = riverinesfloods_to_geojson(init_date, forecast_date)
+        try:
+            init_date, forecast_date = parse_datetime(init_date), parse_datetime(forecast_date)
+        except ValueError:
+            return {"status": "error", "message": f"Invalid date {init_date} {forecast_date}"}, 400
+
+        if bbox is None:
+            cached = get_cached_geojson(RIVERINE_FLOOD, init_date, forecast_date)
+            if cached is not None:
+                body, content_encoding = encode_cached_geojson(cached, request.accept_encodings)
+                response = Response(body, mimetype="application/json")
+                response.content_encoding = content_encoding
+                response.vary.add("Accept-Encoding")
+                return response
+
+        result = riverinesfloods_to_geojson(init_date, forecast_date, bbox)
         return jsonify(result), 200
 
     except Exception as e:
         logging.error(f"Error fetching riverine floods: dates {e}")
         return {"status": "error", "message": str(e)}, 500
 
+
+@endpoints.route('/riverinefloods/max', strict_slashes=False, methods=['GET'])
+@cached_response(RIVERINE_FLOOD)
+def get_riverine_floods_max_as_geojson():
+    try:
+        init_date = request.args.get('init_date')
+        bbox = request.args.get('bbox')
+        logging.info(f"[GET][RIVERINE_FLOODS MAX AS GEOJSON] init date: {init_date}, bbox: {bbox}")
+
+        try:
+            bbox = parse_bbox(bbox) if bbox else None
+        except ValueError as e:
+            return {"status": "error", "message": str(e)}, 400
+
+        if init_date is None:
+            forecast_run = get_latest_forecast_run(RIVERINE_FLOOD)
+            if forecast_run is None:
+                return {"status": "error", "message": "No riverine flood run found"}, 404
+            init_date = forecast_run.init_date
+
+        result = riverinefloods_max_to_geojson(init_date, bbox)
+        return jsonify(result), 200
+
+    except Exception as e:
+        logging.error(f"Error fetching riverine floods max: {e}")
+        return {"status": "error", "message": str(e)}, 500
+
+@endpoints.route('/riverinefloods/bundle', strict_slashes=False, methods=['GET'])
+@cached_response(RIVERINE_FLOOD)
+def get_riverine_floods_bundle_as_geojson():
+    try:
+        init_date = request.args.get('init_date')
+        bbox = request.args.get('bbox')
+        logging.info(f"[GET][RIVERINE_FLOODS BUNDLE AS GEOJSON] init date: {init_date}, bbox: {bbox}")
+
+        try:
+            bbox = parse_bbox(bbox) if bbox else None
+        except ValueError as e:
+            return {"status": "error", "message": str(e)}, 400
+
+        if init_date is None:
+            forecast_run = get_latest_forecast_run(RIVERINE_FLOOD)
+            if forecast_run is None:
+                return {"status": "error", "message": "No riverine flood run found"}, 404
+            init_date = forecast_run.init_date
+
+        result = riverinefloods_bundle_to_geojson(init_date, bbox)
+        return jsonify(result), 200
+
+    except Exception as e:
+        logging.error(f"Error fetching riverine floods bundle: {e}")
+        return {"status": "error", "message": str(e)}, 500
+
+@endpoints.route('/riverinefloods/values', strict_slashes=False, methods=['GET'])
+@cached_response(RIVERINE_FLOOD)
+def get_riverine_floods_values():
+    try:
+        init_date = request.args.get('init_date')
+        logging.info(f"[GET][RIVERINE_FLOODS VALUES] init date: {init_date}")
+
+        if init_date is None:
+            forecast_run = get_latest_forecast_run(RIVERINE_FLOOD)
+            if forecast_run is None:
+                return {"status": "error", "message": "No riverine flood run found"}, 404
+            init_date = forecast_run.init_date
+
+        result = riverinefloods_values(init_date)
+        return jsonify(result), 200
+
+    except Exception as e:
+        logging.error(f"Error fetching riverine floods values: {e}")
+        return {"status": "error", "message": str(e)}, 500
+
+@endpoints.route('/riverinefloods/exceedance', strict_slashes=False, methods=['GET'])
+@cached_response(RIVERINE_FLOOD)
+def get_riverine_floods_exceedance():
+    try:
+        init_date = request.args.get('init_date')
+        return_period = request.args.get('return_period')
+        logging.info(f"[GET][RIVERINE_FLOODS EXCEEDANCE] init date: {init_date}, return period: {return_period}")
+
+        try:
+            return_period = int(return_period)
+        except (TypeError, ValueError):
+            return {"status": "error", "message": f"Invalid return period {return_period}"}, 400
+
+        if init_date is None:
+            forecast_run = get_latest_forecast_run(RIVERINE_FLOOD)
+            if forecast_run is None:
+                return {"status": "error", "message": "No riverine flood run found"}, 404
+            init_date = forecast_run.init_date
+
+        result = riverinefloods_exceedance(init_date, return_period)
+        return jsonify(result), 200
+
+    except Exception as e:
+        logging.error(f"Error fetching riverine floods exceedance: {e}")
+        return {"status": "error", "message": str(e)}, 500
+
+@endpoints.route('/riverineflood/<int:subid>/hydrograph', strict_slashes=False, methods=['GET'])
+@cached_response(RIVERINE_FLOOD)
+def get_riverine_flood_hydrograph(subid):
+    try:
+        init_date = request.args.get('init_date')
+        logging.info(f"[GET][RIVERINE_FLOOD][HYDROGRAPH] subid: {subid}, init date: {init_date}")
+
+        if init_date is None:
+            forecast_run = get_latest_forecast_run(RIVERINE_FLOOD)
+            if forecast_run is None:
+                return {"status": "error", "message": "No riverine flood run found"}, 404
+            init_date = forecast_run.init_date
+
+        riverine_flood_run = RiverineFloodRun.query.get((subid, init_date))
+        if riverine_flood_run is None:
+            return {"status": "error", "message": "Record not found"}, 404
+
+        date_format = "%Y-%m-%dT%H:%M:%S.000Z"
+        response = {
+            "subid": riverine_flood_run.subid,
+            "init_date": riverine_flood_run.init_date.strftime(date_format),
+            "hindcast": {
+                "dates": [date.strftime(date_format) for date in riverine_flood_run.hindcast_dates],
+                "discharge": riverine_flood_run.hindcast_discharge or [],
+            },
+            "forecast": {
+                "dates": [date.strftime(date_format) for date in riverine_flood_run.forecast_dates],
+                "discharge": riverine_flood_run.discharge or [],
+                "levels": riverine_flood_run.levels,
+                "ensemble_members": riverine_flood_run.ensemble_members,
+                "return_periods": riverine_flood_run.return_periods or [],
+                "exceedance": riverine_flood_run.exceedance or [],
+            },
+        }
+        return jsonify(response), 200
+
+    except Exception as e:
+        logging.error(f"Error fetching riverine flood hydrograph: {e}")
+        return {"status": "error", "message": str(e)}, 500
+
+@endpoints.route('/riverineflood/<int:subid>/series', strict_slashes=False, methods=['GET'])
+@cached_response(RIVERINE_FLOOD)
+def get_riverine_flood_series(subid):
+    """
+    Get every value of a subbasin for the runs initialised in [start, end).
+
+    Query parameters:
+    - start: First init date (defaults to 30 days ago)
+    - end: Init date after the last one (defaults to no bound)
+    - format: rows (default) or columnar for parallel arrays keyed by field
+    """
+    try:
+        start = request.args.get('start')
+        end = request.args.get('end')
+        output_format = request.args.get('format', ROWS)
+        logging.info(f"[GET][RIVERINE_FLOOD][SERIES] subid: {subid}, start: {start}, end: {end}, format: {output_format}")
+
+        if output_format not in FORMATS:
+            return {"status": "error", "message": f"format must be one of {', '.join(FORMATS)}"}, 400
+
+        try:
+            start = parse_datetime(start) if start else datetime.datetime.utcnow() - datetime.timedelta(days=SERIES_DAYS)
+            end = parse_datetime(end) if end else None
+        except ValueError:
+            return {"status": "error", "message": f"Invalid date range {start} {end}"}, 400
+
+        # Served by the (subid, init_date) primary key of the packed runs
+        statement = select_riverine_floods().where(RiverineFlood.subid == subid, RiverineFlood.init_date >= start)
+        if end is not None:
+            statement = statement.where(RiverineFlood.init_date < end)
+        order_by = (RiverineFlood.init_date, RiverineFlood.forecast_date)
+
+        return json_response(select_to_json(statement, output_format, order_by))
+
+    except Exception as e:
+        logging.error(f"Error fetching riverine flood series: {e}")
+        return {"status": "error", "message": str(e)}, 500
@@ -0,0 +1,68 @@
+import logging
+
+from flask import request
+
+from dgrehydro.config.products import PRODUCTS, RIVERINE_FLOOD
+from dgrehydro.routes import endpoints
+from dgrehydro.service.flash_db import ADMIN_LEVELS, REGION
+from dgrehydro.service.forecast_run_db import get_latest_forecast_run
+from dgrehydro.service.response_cache import cached_response
+from dgrehydro.service.serialization import json_response
+from dgrehydro.service.summary_db import summarize_levels
+from dgrehydro.utils import parse_datetime
+
+# Default warning level counted by the summaries
+SUMMARY_MIN_LEVEL = 2
+
+
+@endpoints.route('/summary/<product>', strict_slashes=False, methods=['GET'])
+@cached_response(*PRODUCTS)
+def get_summary(product):
+    """
+    Get the warning levels of a product aggregated per municipality, province or region.
+
+    Path parameters:
+    - product: riverine_flood, flash_flood or critical_point
+
+    Query parameters:
+    - level: region (default), province or municipality
+    - min_level: Level counted in count_at_level and weight_at_level (default 2)
+    - init_date: Riverine flood run (defaults to the latest run)
+    - forecast_date: Forecast date (defaults to the maximum over the run for riverine floods, to the latest run
+      for the other products)
+    """
+    if product not in PRODUCTS:
+        return {"status": "error", "message": f"Unknown product {product}"}, 404
+
+    try:
+        level = request.args.get('level', REGION)
+        min_level = request.args.get('min_level', SUMMARY_MIN_LEVEL, type=int)
+        init_date = request.args.get('init_date')
+        forecast_date = request.args.get('forecast_date')
+        logging.info(f"[GET][SUMMARY] product: {product}, level: {level}, min_level: {min_level}, "
+                     f"init date: {init_date}, forecast date: {forecast_date}")
+
+        if level not in ADMIN_LEVELS:
+            return {"status": "error", "message": f"level must be one of {', '.join(ADMIN_LEVELS)}"}, 400
+
+        try:
+            init_date = parse_datetime(init_date) if init_date else None
+            forecast_date = parse_datetime(forecast_date) if forecast_date else None
+        except ValueError:
+            return {"status": "error", "message": f"Invalid dates {init_date} {forecast_date}"}, 400
+
+        needs_run = init_date is None if product == RIVERINE_FLOOD else forecast_date is None
+        if needs_run:
+            forecast_run = get_latest_forecast_run(product)
+            if forecast_run is None:
+                return {"status": "error", "message": f"No {product} run found"}, 404
+            if product == RIVERINE_FLOOD:
+                init_date = forecast_run.init_date
+            else:
+                forecast_date = forecast_run.init_date
+
+        return json_response(summarize_levels(product, level, min_level, forecast_date, init_date))
+
+    except Exception as e:
+        logging.error(f"[GET][SUMMARY] Error summarizing {product}: {e}")
+        return {"status": "error", "message": str(e)}, 500
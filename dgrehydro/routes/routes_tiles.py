@@ -0,0 +1,52 @@
+import logging
+
+from flask import Response
+
+from dgrehydro import SETTINGS
+from dgrehydro.routes import endpoints
+from dgrehydro.service.tile_cache import TILE_LAYERS, TILE_MIMETYPE, BURKINA_BBOX, get_tile, is_tile_in_bbox, \
+    has_tile_date
+from dgrehydro.utils import parse_datetime
+
+
+@endpoints.route('/tiles/<layer>/<forecast_date>/<int:z>/<int:x>/<int:y>.pbf', strict_slashes=False, methods=['GET'])
+def get_cached_tile(layer, forecast_date, z, x, y):
+    """
+    Get a vector tile from the on-disk cache, rendering it on a cache miss.
+
+    Path parameters:
+    - layer: riverine_flood, riverine_flood_max, flash_flood or critical_point
+    - forecast_date: Forecast date (ISO 8601, e.g. 2025-10-08T12:00:00), init date of the run for riverine_flood_max
+
+    Tiles are served up to zoom ``TILE_CACHE_MAX_ZOOM``, for the dates of the ingested runs. Tiles outside of
+    Burkina Faso are empty.
+    """
+    if layer not in TILE_LAYERS:
+        return {"status": "error", "message": f"Unknown layer {layer}"}, 404
+
+    max_zoom = SETTINGS.get('TILE_CACHE_MAX_ZOOM')
+    if z > max_zoom:
+        return {"status": "error", "message": f"Zoom must be at most {max_zoom}"}, 400
+    if x >= 2 ** z or y >= 2 ** z:
+        return {"status": "error", "message": f"Invalid tile {z}/{x}/{y}"}, 400
+
+    try:
+        forecast_date = parse_datetime(forecast_date)
+    except ValueError:
+        return {"status": "error", "message": f"Invalid forecast date {forecast_date}"}, 400
+
+    if not is_tile_in_bbox(BURKINA_BBOX, z, x, y):
+        return Response(status=204)
+
+    try:
+        if not has_tile_date(layer, forecast_date):
+            return {"status": "error", "message": f"No {layer} data for {forecast_date.isoformat()}"}, 404
+
+        tile = get_tile(layer, forecast_date, z, x, y)
+        if not tile:
+            return Response(status=204)
+        return Response(tile, mimetype=TILE_MIMETYPE)
+
+    except Exception as e:
+        logging.error(f"[GET][TILES] Error fetching tile {layer}/{forecast_date}/{z}/{x}/{y}: {e}")
+        return {"status": "error", "message": str(e)}, 500
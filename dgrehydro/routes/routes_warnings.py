@@ -0,0 +1,45 @@
+import logging
+
+from flask import request, jsonify
+
+from dgrehydro.routes import endpoints
+from dgrehydro.service.spatial_index import get_spatial_index
+from dgrehydro.service.warnings_db import get_current_warnings
+
+# Maximum search radius in meters
+MAX_WARNING_RADIUS = 50000
+
+
+@endpoints.route('/warnings/at', strict_slashes=False, methods=['GET'])
+def get_warnings_at():
+    """
+    Get the riverine, flash flood and critical point warnings applying to a location.
+
+    Query parameters:
+    - lat, lon: Location (EPSG:4326)
+    - radius: Search radius in meters (default 0, the municipality containing the location and the segments and
+      stations within WARNING_TOLERANCE meters of it)
+
+    Geometries are matched with in-memory STRtrees, the values are the current ones.
+    """
+    try:
+        lat = request.args.get('lat', type=float)
+        lon = request.args.get('lon', type=float)
+        radius = request.args.get('radius', 0, type=float)
+        logging.info(f"[GET][WARNINGS AT] lat: {lat}, lon: {lon}, radius: {radius}")
+
+        if lat is None or lon is None or not -90 <= lat <= 90 or not -180 <= lon <= 180:
+            return {"status": "error", "message": "lat and lon are required, in degrees"}, 400
+        if not 0 <= radius <= MAX_WARNING_RADIUS:
+            return {"status": "error", "message": f"radius must be between 0 and {MAX_WARNING_RADIUS} meters"}, 400
+
+        segment_subids = get_spatial_index("river_segment").query(lon, lat, radius)
+        municipality_subids = get_spatial_index("municipality").query(lon, lat, radius)
+        station_names = get_spatial_index("poi_station").query(lon, lat, radius)
+
+        warnings = get_current_warnings(segment_subids, municipality_subids, station_names)
+        return jsonify({"lat": lat, "lon": lon, "radius": radius, **warnings}), 200
+
+    except Exception as e:
+        logging.error(f"[GET][WARNINGS AT] Error fetching warnings: {e}")
+        return {"status": "error", "message": str(e)}, 500
@@ -0,0 +1,123 @@
+import json
+import logging
+import os
+import smtplib
+from datetime import datetime, timedelta
+from email.message import EmailMessage
+
+from dgrehydro import SETTINGS, db
+from dgrehydro.models.alertoutbox import AlertOutbox
+
+PENDING = "pending"
+SENT = "sent"
+FAILED = "failed"
+
+# Delay before the first retry, doubled on each failure up to ALERT_RETRY_MAX_DELAY
+ALERT_RETRY_DELAY = timedelta(minutes=1)
+ALERT_RETRY_MAX_DELAY = timedelta(hours=1)
+
+
+def format_alert(alert: AlertOutbox) -> str:
+    lines = [alert.payload.get("message", alert.rule), f"Run: {alert.init_date.isoformat()}", ""]
+    lines += [f"- {item['id']}: level {item['level']}" for item in alert.payload.get("items", [])]
+    return "\n".join(lines)
+
+
+class FileBackend:
+    """Append the alerts as JSON lines to ``alerts.jsonl``, stand-in for a real channel."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def send(self, alert: AlertOutbox):
+        os.makedirs(self.directory, exist_ok=True)
+        with open(os.path.join(self.directory, "alerts.jsonl"), "a") as f:
+            f.write(json.dumps(alert.serialize()) + "\n")
+
+
+class SmtpBackend:
+    """Send the alerts by email to the recipients of their rule."""
+
+    def __init__(self, host: str, port: int, sender: str, user: str = None, password: str = None):
+        self.host = host
+        self.port = port
+        self.sender = sender
+        self.user = user
+        self.password = password
+
+    def send(self, alert: AlertOutbox):
+        if not alert.recipients:
+            raise ValueError(f"No recipient for rule {alert.rule}")
+
+        message = EmailMessage()
+        message["Subject"] = f"[DGRE] {alert.payload.get('message', alert.rule)}"
+        message["From"] = self.sender
+        message["To"] = ", ".join(alert.recipients)
+        message.set_content(format_alert(alert))
+
+        with smtplib.SMTP(self.host, self.port, timeout=30) as smtp:
+            if self.user:
+                smtp.starttls()
+                smtp.login(self.user, self.password)
+            smtp.send_message(message)
+
+
+ALERT_BACKENDS = {
+    "file": lambda: FileBackend(SETTINGS.get('ALERT_DIR') or os.path.join(SETTINGS.get('DATA_DIR'), 'alerts')),
+    "smtp": lambda: SmtpBackend(SETTINGS.get('SMTP_HOST'), SETTINGS.get('SMTP_PORT'), SETTINGS.get('SMTP_SENDER'),
+                                SETTINGS.get('SMTP_USER'), SETTINGS.get('SMTP_PASSWORD')),
+}
+
+
+def get_alert_backend(name: str = None):
+    name = name or SETTINGS.get('ALERT_BACKEND')
+    if name not in ALERT_BACKENDS:
+        raise ValueError(f"Unknown alert backend {name}, expected one of {', '.join(ALERT_BACKENDS)}")
+    return ALERT_BACKENDS[name]()
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """Exponential backoff after ``attempts`` failed deliveries."""
+    return min(ALERT_RETRY_DELAY * 2 ** (attempts - 1), ALERT_RETRY_MAX_DELAY)
+
+
+def deliver_pending_alerts(backend, limit: int = 100) -> tuple[int, int]:
+    """
+    Deliver the pending alerts that are due, oldest first, committing after each one.
+
+    Each alert is locked while it is delivered so that concurrent workers skip it. Failed deliveries are
+    retried with an exponential backoff, up to ``ALERT_MAX_ATTEMPTS`` attempts. Return the number of alerts
+    sent and failed in this pass.
+    """
+    max_attempts = SETTINGS.get('ALERT_MAX_ATTEMPTS')
+    sent = failed = 0
+    for _ in range(limit):
+        now = datetime.utcnow()
+        alert = (AlertOutbox.query
+                 .filter(AlertOutbox.status == PENDING, AlertOutbox.next_attempt_at <= now)
+                 .order_by(AlertOutbox.id)
+                 .with_for_update(skip_locked=True)
+                 .first())
+        if alert is None:
+            break
+
+        try:
+            backend.send(alert)
+            alert.status = SENT
+            alert.sent_at = datetime.utcnow()
+            sent += 1
+        except Exception as e:
+            alert.attempts += 1
+            alert.last_error = str(e)
+            if alert.attempts >= max_attempts:
+                alert.status = FAILED
+                logging.error(f"[ALERTS][DELIVERY]: Giving up alert {alert.id} after {alert.attempts} attempts: {e}")
+            else:
+                alert.next_attempt_at = now + retry_delay(alert.attempts)
+                logging.warning(f"[ALERTS][DELIVERY]: Failed to deliver alert {alert.id}, retrying at "
+                                f"{alert.next_attempt_at}: {e}")
+            failed += 1
+        db.session.commit()
+
+    logging.info(f"[ALERTS][DELIVERY]: {sent} alerts sent, {failed} failed")
+    return sent, failed
@@ -0,0 +1,117 @@
+import json
+import logging
+import os
+from dataclasses import dataclass, field
+from datetime import datetime
+
+import numpy as np
+
+from dgrehydro import SETTINGS, db
+from dgrehydro.config.products import PRODUCTS
+from dgrehydro.models.alertoutbox import AlertOutbox
+from dgrehydro.service.run_diff import MISSING
+
+
+@dataclass
+class AlertRule:
+    """
+    Alert raised when at least ``min_count`` items reach ``min_level``.
+
+    ``within_days`` restricts the levels to the first forecast days of the run, ``items`` to some subids or
+    station names.
+    """
+    name: str
+    product: str
+    min_level: int
+    within_days: int = None
+    items: list = None
+    min_count: int = 1
+    recipients: list = field(default_factory=list)
+
+
+def load_alert_rules(path: str = None) -> list[AlertRule]:
+    """Read the rules of ``ALERT_RULES_FILE``, a JSON array of ``AlertRule`` fields. No file means no rule."""
+    path = path or SETTINGS.get('ALERT_RULES_FILE')
+    if not path or not os.path.exists(path):
+        return []
+
+    with open(path, "r") as f:
+        rules = [AlertRule(**rule) for rule in json.load(f)]
+    for rule in rules:
+        if rule.product not in PRODUCTS:
+            raise ValueError(f"Unknown product {rule.product} in alert rule {rule.name}")
+    return rules
+
+
+def daily_levels(keys, days, levels) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Pivot ``(key, day, level)`` triples into unique keys and a matrix of their levels per forecast day.
+
+    ``days`` are offsets from the init date of the run. Days without a level are ``MISSING``, the highest
+    level is kept for a key and day given twice.
+    """
+    unique_keys, inverse = np.unique(np.asarray(keys), return_inverse=True)
+    days = np.asarray(days, dtype=np.int64)
+    width = int(days.max()) + 1 if len(days) else 0
+    matrix = np.full((len(unique_keys), width), MISSING, dtype=np.int16)
+    np.maximum.at(matrix, (inverse, days), np.asarray(levels, dtype=np.int16))
+    return unique_keys, matrix
+
+
+def evaluate_rule(rule: AlertRule, keys: np.ndarray, matrix: np.ndarray) -> dict:
+    """Return the payload of the alert raised by ``rule`` on the levels of a run, or None."""
+    window = matrix[:, :rule.within_days] if rule.within_days else matrix
+    item_levels = window.max(axis=1, initial=MISSING)
+
+    matched = item_levels >= rule.min_level
+    if rule.items:
+        matched &= np.isin(keys.astype(str), [str(item) for item in rule.items])
+
+    count = int(matched.sum())
+    if count == 0 or count < rule.min_count:
+        return None
+
+    return {
+        "message": f"{rule.name}: {count} {rule.product} item(s) at level {rule.min_level} or above",
+        "min_level": rule.min_level,
+        "within_days": rule.within_days,
+        "count": count,
+        "items": [{"id": key, "level": int(level)}
+                  for key, level in zip(keys[matched].tolist(), item_levels[matched].tolist())],
+    }
+
+
+def queue_alerts(product: str, init_date: datetime, keys, days, levels, rules: list[AlertRule] = None) -> list:
+    """
+    Evaluate the rules of ``product`` on the levels of a run and add the raised alerts to the current session.
+
+    It is called by the ingestors before committing so that the alerts are committed along with the run, from
+    the ``(key, day, level)`` values they hold. A rule raises a single alert per run. Failures are logged and
+    never abort the ingestion.
+    """
+    try:
+        rules = [rule for rule in (load_alert_rules() if rules is None else rules) if rule.product == product]
+        if not rules or not len(keys):
+            return []
+
+        keys, matrix = daily_levels(keys, days, levels)
+        alerts = []
+        # A savepoint keeps the run committable if the outbox fails
+        with db.session.begin_nested():
+            queued = {rule for (rule,) in db.session.query(AlertOutbox.rule)
+                      .filter(AlertOutbox.product == product, AlertOutbox.init_date == init_date)}
+
+            for rule in rules:
+                if rule.name in queued:
+                    continue
+                payload = evaluate_rule(rule, keys, matrix)
+                if payload is not None:
+                    alert = AlertOutbox(rule.name, product, init_date, payload, rule.recipients)
+                    db.session.add(alert)
+                    alerts.append(alert)
+
+        logging.info(f"[ALERTS][{product.upper()}]: {len(alerts)} alerts raised by {len(rules)} rules on {init_date}")
+        return alerts
+    except Exception as e:
+        logging.error(f"[ALERTS][{product.upper()}]: Failed to evaluate alert rules: {e}")
+        return []
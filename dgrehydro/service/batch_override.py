@@ -0,0 +1,109 @@
+import csv
+import io
+from dataclasses import dataclass
+from typing import Callable
+
+from sqlalchemy import text
+
+from dgrehydro import db
+
+MAX_BATCH_SIZE = 1000
+
+UPDATED = "updated"
+NOT_FOUND = "not_found"
+INVALID = "invalid"
+
+
+@dataclass
+class BatchField:
+    name: str
+    sql_type: str
+    parse: Callable
+    required: bool = True
+
+
+def read_batch_rows(request) -> list[dict]:
+    """Read the overrides of a batch request: a JSON array, a text/csv body or a CSV file upload."""
+    if "file" in request.files:
+        return list(csv.DictReader(io.StringIO(request.files["file"].read().decode("utf-8-sig"))))
+    if request.mimetype == "text/csv":
+        return list(csv.DictReader(io.StringIO(request.get_data().decode("utf-8-sig"))))
+
+    rows = request.get_json(silent=True)
+    if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+        raise ValueError("Expected a JSON array of objects or a CSV file")
+    return rows
+
+
+def parse_batch_row(row: dict, fields: list[BatchField]) -> dict:
+    parsed = {}
+    for field in fields:
+        value = row.get(field.name)
+        if value is None or value == "":
+            if field.required:
+                raise ValueError(f"{field.name} is required")
+            parsed[field.name] = None
+        else:
+            parsed[field.name] = field.parse(value)
+    return parsed
+
+
+def values_clause(rows: list[dict], fields: list[BatchField]) -> tuple[str, dict]:
+    """Build a typed ``(VALUES ...) AS v(...)`` clause and its parameters."""
+    parameters = {}
+    values = []
+    for i, row in enumerate(rows):
+        placeholders = []
+        for field in fields:
+            parameters[f"{field.name}_{i}"] = row[field.name]
+            placeholders.append(f"CAST(:{field.name}_{i} AS {field.sql_type})")
+        values.append(f"({', '.join(placeholders)})")
+    columns = ", ".join(field.name for field in fields)
+    return f"(VALUES {', '.join(values)}) AS v({columns})", parameters
+
+
+def apply_batch_update(table: str, key_fields: list[BatchField], value_fields: list[BatchField], set_clause: str,
+                       rows: list[dict], update: Callable[[str, dict], set] = None) -> tuple[list[dict], list[dict]]:
+    """
+    Apply many overrides of ``table`` with a single ``UPDATE ... FROM (VALUES ...)``, without committing.
+
+    ``update`` replaces that statement when given: it is called with the ``values_clause`` of the rows and its
+    parameters, and returns the keys of the updated rows.
+
+    Return the status of every input row, in order, and the parsed rows that were updated.
+    """
+    statuses = [None] * len(rows)
+    parsed_rows = {}
+    for i, row in enumerate(rows):
+        try:
+            parsed = parse_batch_row(row, key_fields + value_fields)
+        except (ValueError, TypeError) as e:
+            statuses[i] = {"index": i, "status": INVALID, "message": str(e)}
+            continue
+
+        key = tuple(parsed[field.name] for field in key_fields)
+        if key in parsed_rows:
+            statuses[i] = {"index": i, "status": INVALID, "message": "Duplicate row"}
+            continue
+        parsed_rows[key] = (i, parsed)
+
+    updated_keys = set()
+    if parsed_rows:
+        values, parameters = values_clause([parsed for _, parsed in parsed_rows.values()], key_fields + value_fields)
+        if update is not None:
+            updated_keys = update(values, parameters)
+        else:
+            conditions = " AND ".join(f"t.{field.name} = v.{field.name}" for field in key_fields)
+            returning = ", ".join(f"t.{field.name}" for field in key_fields)
+            statement = text(f"UPDATE {table} t SET {set_clause} FROM {values} WHERE {conditions} "
+                             f"RETURNING {returning}")
+            updated_keys = {tuple(row) for row in db.session.execute(statement, parameters)}
+
+    updated = []
+    for key, (i, parsed) in parsed_rows.items():
+        if key in updated_keys:
+            statuses[i] = {"index": i, "status": UPDATED}
+            updated.append(parsed)
+        else:
+            statuses[i] = {"index": i, "status": NOT_FOUND}
+    return statuses, updated
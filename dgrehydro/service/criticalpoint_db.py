@@ -0,0 +1,141 @@
+import base64
+import json
+import logging
+from datetime import datetime, timedelta
+
+import numpy as np
+from sqlalchemy import Float, Numeric, Select, and_, desc, func, or_, select, text, tuple_
+
+from dgrehydro import db
+from dgrehydro.models.criticalpoint import CriticalPoint
+from dgrehydro.models.criticalpointrollup import CriticalPointHourly, CriticalPointDaily
+from dgrehydro.service.downsampling import lttb, minmax
+from dgrehydro.service.serialization import ISO_DATE_FORMAT
+
+# Rollup tables and their date_trunc unit
+CRITICAL_POINT_ROLLUPS = {
+    CriticalPointHourly: "hour",
+    CriticalPointDaily: "day",
+}
+
+# Ranges with more hours than this are read from the daily rollup
+MAX_HOURLY_BUCKETS = 10000
+
+HISTORY_VARIABLES = ["water_level", "flow"]
+LTTB = "lttb"
+MINMAX = "minmax"
+HISTORY_METHODS = [LTTB, MINMAX]
+
+# Keyset order, served by idx_critical_point_measurement_station_forecast
+CRITICAL_POINT_ORDER = (desc(CriticalPoint.measurement_date), CriticalPoint.station_name, CriticalPoint.forecast_date)
+
+
+def select_critical_points():
+    """Select critical points with the columns of ``CriticalPoint.serialize``, computed in SQL."""
+    horizon_seconds = func.extract("epoch", CriticalPoint.forecast_date - CriticalPoint.measurement_date)
+    return select(
+        CriticalPoint.id,
+        CriticalPoint.station_name,
+        func.to_char(CriticalPoint.measurement_date, ISO_DATE_FORMAT).label("measurement_date"),
+        func.to_char(CriticalPoint.forecast_date, ISO_DATE_FORMAT).label("forecast_date"),
+        CriticalPoint.flow,
+        CriticalPoint.water_level,
+        CriticalPoint.water_level_alert,
+        (CriticalPoint.forecast_date == CriticalPoint.measurement_date).label("is_realtime"),
+        (horizon_seconds / 3600).cast(Float).label("forecast_horizon_hours"),
+        func.round((horizon_seconds / 86400).cast(Numeric), 2).cast(Float).label("forecast_horizon_days"),
+    )
+
+
+def encode_cursor(row) -> str:
+    """Opaque cursor pointing after ``row``, a row of ``select_critical_points``."""
+    key = [row.measurement_date, row.station_name, row.forecast_date]
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, str, datetime]:
+    try:
+        measurement_date, station_name, forecast_date = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(measurement_date), station_name, datetime.fromisoformat(forecast_date)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor {cursor}") from e
+
+
+def after_cursor(statement: Select, cursor: str) -> Select:
+    """Keep the rows following ``cursor`` in ``CRITICAL_POINT_ORDER``."""
+    measurement_date, station_name, forecast_date = decode_cursor(cursor)
+    return statement.filter(or_(
+        CriticalPoint.measurement_date < measurement_date,
+        and_(CriticalPoint.measurement_date == measurement_date,
+             tuple_(CriticalPoint.station_name, CriticalPoint.forecast_date) > tuple_(station_name, forecast_date))
+    ))
+
+
+def refresh_critical_point_rollups(dates):
+    """Recompute the hourly and daily rollups of the days of ``dates``, without committing."""
+    days = sorted({date.replace(hour=0, minute=0, second=0, microsecond=0) for date in dates})
+    for day in days:
+        parameters = {'start': day, 'end': day + timedelta(days=1)}
+        for rollup, unit in CRITICAL_POINT_ROLLUPS.items():
+            db.session.execute(text(f"""
+                INSERT INTO {rollup.__tablename__} (station_name, bucket, count, water_level_min, water_level_max,
+                                                    water_level_avg, flow_min, flow_max, flow_avg)
+                SELECT station_name, date_trunc('{unit}', measurement_date), COUNT(*),
+                       MIN(water_level), MAX(water_level), AVG(water_level),
+                       MIN(flow), MAX(flow), AVG(flow)
+                FROM dgre_critical_point
+                WHERE measurement_date = forecast_date
+                  AND measurement_date >= :start
+                  AND measurement_date < :end
+                GROUP BY 1, 2
+                ON CONFLICT (station_name, bucket) DO UPDATE
+                    SET count           = excluded.count,
+                        water_level_min = excluded.water_level_min,
+                        water_level_max = excluded.water_level_max,
+                        water_level_avg = excluded.water_level_avg,
+                        flow_min        = excluded.flow_min,
+                        flow_max        = excluded.flow_max,
+                        flow_avg        = excluded.flow_avg"""), parameters)
+    logging.info(f"[CRITICAL_POINT][ROLLUPS]: Refreshed {len(days)} days")
+
+
+def get_critical_point_history(station_name: str, start: datetime, end: datetime, variable: str, points: int,
+                               method: str) -> dict:
+    """
+    History of ``variable`` for a station, downsampled to at most ``points`` points.
+
+    The hourly rollup is used unless the range spans more than ``MAX_HOURLY_BUCKETS`` hours. ``lttb`` returns
+    the hourly or daily averages selected by Largest-Triangle-Three-Buckets, ``minmax`` the min/max envelope
+    of ``points // 2`` buckets.
+    """
+    use_hourly = (end - start) <= timedelta(hours=MAX_HOURLY_BUCKETS)
+    rollup = CriticalPointHourly if use_hourly else CriticalPointDaily
+
+    columns = [getattr(rollup, f"{variable}_{aggregate}") for aggregate in ("avg", "min", "max")]
+    rows = db.session.execute(
+        select(rollup.bucket, *columns)
+        .where(rollup.station_name == station_name, rollup.bucket >= start, rollup.bucket < end)
+        .where(columns[0].is_not(None))
+        .order_by(rollup.bucket)
+    ).all()
+
+    buckets = [row[0] for row in rows]
+    averages, mins, maxs = (np.array([row[i] for row in rows], dtype=float) for i in (1, 2, 3))
+
+    history = {
+        "station_name": station_name,
+        "variable": variable,
+        "method": method,
+        "resolution": "hourly" if use_hourly else "daily",
+    }
+    if method == MINMAX:
+        starts, bucket_mins, bucket_maxs = minmax(np.arange(len(buckets)), mins, maxs, max(points // 2, 1))
+        history["dates"] = [buckets[i].isoformat() for i in starts]
+        history["min"] = bucket_mins.tolist()
+        history["max"] = bucket_maxs.tolist()
+    else:
+        timestamps = np.array([bucket.timestamp() for bucket in buckets], dtype=float)
+        indices = lttb(timestamps, averages, points)
+        history["dates"] = [buckets[i].isoformat() for i in indices]
+        history["values"] = averages[indices].tolist()
+    return history
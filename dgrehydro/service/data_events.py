@@ -0,0 +1,150 @@
+import logging
+
+from sqlalchemy import text
+
+from dgrehydro import db
+from dgrehydro.config.products import RIVERINE_FLOOD, CRITICAL_POINT, FLASH_FLOOD
+from dgrehydro.service.criticalpoint_db import refresh_critical_point_rollups
+from dgrehydro.service.flash_db import refresh_flash_flood_daily
+from dgrehydro.service.data_version_db import bump_data_version
+from dgrehydro.service.geojson_cache import refresh_geojson_cache
+from dgrehydro.service.response_cache import response_cache
+from dgrehydro.service.run_changes_db import record_run_changes
+from dgrehydro.service.tile_cache import RIVERINE_FLOOD_MAX, invalidate_tiles, seed_tiles
+
+DATA_EVENTS_CHANNEL = "dgre_data_events"
+INGEST_EVENT = "ingest"
+OVERRIDE_EVENT = "override"
+
+
+def invalidate_responses(product: str):
+    """
+    Make the cached responses depending on ``product`` stale.
+
+    Bumping the data version changes their cache key in every worker, the entries that can no longer be
+    reached expire with age. Entries of the other products are kept.
+    """
+    try:
+        bump_data_version(product)
+    except Exception as e:
+        logging.error(f"[DATA EVENTS][{product.upper()}]: Failed to invalidate cached responses: {e}")
+        return
+
+    try:
+        response_cache.prune()
+    except Exception as e:
+        logging.error(f"[DATA EVENTS][{product.upper()}]: Failed to prune cached responses: {e}")
+
+
+def refresh_rollups(product: str, forecast_dates):
+    """
+    Refresh the rollups of the days of ``forecast_dates``, without committing.
+
+    Called in the transaction of the ingestion or correction, so that the rollups are never committed out of
+    sync with the rows they aggregate.
+    """
+    if product not in (CRITICAL_POINT, FLASH_FLOOD):
+        return
+
+    db.session.flush()
+    if product == CRITICAL_POINT:
+        # Real-time measurements have their forecast date equal to their measurement date
+        refresh_critical_point_rollups(forecast_dates)
+    else:
+        refresh_flash_flood_daily(forecast_dates)
+
+
+def refresh_run_changes(product: str, init_date):
+    """Compare the run of ``init_date`` with the previous one, in its own transaction."""
+    try:
+        record_run_changes(product, init_date)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        logging.error(f"[DATA EVENTS][{product.upper()}]: Failed to record run changes: {e}")
+
+
+def notify_data_event(product: str, event: str, forecast_dates, init_date=None):
+    """
+    Publish a data event on ``DATA_EVENTS_CHANNEL`` with ``pg_notify``, delivered to the listeners on commit.
+
+    The payload holds the new data version of ``product`` and the range of the changed forecast dates.
+    """
+    forecast_dates = sorted(set(forecast_dates))
+    try:
+        db.session.execute(text("""
+            SELECT pg_notify(:channel, json_build_object(
+                    'product', CAST(:product AS text),
+                    'event', CAST(:event AS text),
+                    'version', (SELECT version FROM dgre_data_version WHERE product = :product),
+                    'init_date', CAST(:init_date AS timestamp),
+                    'start_date', CAST(:start_date AS timestamp),
+                    'end_date', CAST(:end_date AS timestamp),
+                    'count', CAST(:count AS integer))::text)"""), {
+            'channel': DATA_EVENTS_CHANNEL,
+            'product': product,
+            'event': event,
+            'init_date': init_date,
+            'start_date': forecast_dates[0] if forecast_dates else None,
+            'end_date': forecast_dates[-1] if forecast_dates else None,
+            'count': len(forecast_dates),
+        })
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        logging.error(f"[DATA EVENTS][{product.upper()}]: Failed to notify {event}: {e}")
+
+
+def on_ingest_commit(product: str, forecast_dates):
+    """
+    Refresh the data derived from ``product`` once an ingestion has been committed.
+
+    The rollups are refreshed before, by ``refresh_rollups`` in the transaction of the ingestion.
+    """
+    forecast_dates = sorted(set(forecast_dates))
+    if not forecast_dates:
+        return
+
+    # The first forecast date of a run is its init date, for every product
+    run_init_date = forecast_dates[0]
+
+    refresh_run_changes(product, run_init_date)
+    invalidate_responses(product)
+
+    # Only the cached riverine FeatureCollections are keyed by run
+    init_date = run_init_date if product == RIVERINE_FLOOD else None
+
+    try:
+        refresh_geojson_cache(product, forecast_dates, init_date)
+    except Exception as e:
+        logging.error(f"[DATA EVENTS][{product.upper()}]: Failed to refresh geojson cache: {e}")
+
+    # Clients refetch once the FeatureCollections are cached, tiles missing from the cache are rendered on demand
+    notify_data_event(product, INGEST_EVENT, forecast_dates, init_date)
+
+    try:
+        if product == RIVERINE_FLOOD:
+            # Riverine tiles are always rendered from the latest run, a new run makes all of them stale
+            invalidate_tiles(product)
+            invalidate_tiles(RIVERINE_FLOOD_MAX)
+            seed_tiles(RIVERINE_FLOOD_MAX, [init_date])
+        seed_tiles(product, forecast_dates)
+    except Exception as e:
+        logging.error(f"[DATA EVENTS][{product.upper()}]: Failed to seed tiles: {e}")
+
+
+def on_override_commit(product: str, forecast_dates, init_date=None):
+    """Refresh the data derived from ``product`` once a manual correction has been committed."""
+    invalidate_responses(product)
+
+    for forecast_date in set(forecast_dates):
+        invalidate_tiles(product, forecast_date)
+    if product == RIVERINE_FLOOD:
+        invalidate_tiles(RIVERINE_FLOOD_MAX)
+
+    try:
+        refresh_geojson_cache(product, forecast_dates, init_date)
+    except Exception as e:
+        logging.error(f"[DATA EVENTS][{product.upper()}]: Failed to refresh geojson cache: {e}")
+
+    notify_data_event(product, OVERRIDE_EVENT, forecast_dates, init_date)
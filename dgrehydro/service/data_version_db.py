@@ -0,0 +1,20 @@
+from sqlalchemy import text
+
+from dgrehydro import db
+from dgrehydro.models.dataversion import DataVersion
+
+
+def bump_data_version(product: str):
+    """Increment the data version of ``product``, in its own transaction. ``updated_at`` is stored in UTC."""
+    db.session.execute(text("""INSERT INTO dgre_data_version (product, version, updated_at)
+                               VALUES (:product, 1, timezone('utc', now()))
+                               ON CONFLICT (product) DO UPDATE
+                                   SET version    = dgre_data_version.version + 1,
+                                       updated_at = timezone('utc', now())"""), {'product': product})
+    db.session.commit()
+
+
+def get_data_versions(products) -> dict[str, DataVersion]:
+    """Return the data versions of ``products``, products never ingested are missing."""
+    data_versions = DataVersion.query.filter(DataVersion.product.in_(products)).all()
+    return {data_version.product: data_version for data_version in data_versions}
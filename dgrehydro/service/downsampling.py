@@ -0,0 +1,44 @@
+import numpy as np
+
+
+def lttb(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets: indices of ``threshold`` points keeping the visual shape of (x, y).
+
+    The first and last points are always kept, every bucket in between keeps the point forming the largest
+    triangle with the previously kept point and the average of the next bucket.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    bucket_size = (n - 2) / (threshold - 2)
+
+    indices = np.empty(threshold, dtype=int)
+    indices[0] = a = 0
+    for i in range(threshold - 2):
+        start = int(i * bucket_size) + 1
+        end = int((i + 1) * bucket_size) + 1
+        next_end = min(int((i + 2) * bucket_size) + 1, n)
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+
+        areas = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(areas))
+        indices[i + 1] = a
+    indices[-1] = n - 1
+    return indices
+
+
+def minmax(x: np.ndarray, mins: np.ndarray, maxs: np.ndarray, buckets: int):
+    """Merge consecutive points into ``buckets`` (start x, min, max) envelopes."""
+    if buckets >= len(x):
+        return np.asarray(x), np.asarray(mins), np.asarray(maxs)
+
+    groups = np.array_split(np.arange(len(x)), buckets)
+    starts = np.array([x[group[0]] for group in groups])
+    bucket_mins = np.array([np.nanmin(mins[group]) for group in groups])
+    bucket_maxs = np.array([np.nanmax(maxs[group]) for group in groups])
+    return starts, bucket_mins, bucket_maxs
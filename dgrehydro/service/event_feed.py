@@ -0,0 +1,108 @@
+import json
+import logging
+import queue
+import select
+import threading
+import time
+import psycopg2
+
+from dgrehydro.service.data_events import DATA_EVENTS_CHANNEL
+
+# Seconds between two checks of the listener stop flag, and before reconnecting after an error
+LISTEN_POLL_INTERVAL = 5
+
+# Events buffered per subscriber, the oldest are dropped for clients that do not keep up
+SUBSCRIBER_QUEUE_SIZE = 100
+
+
+class EventFeed:
+    """
+    Fan out the data events of ``DATA_EVENTS_CHANNEL`` to the subscribers of this worker.
+
+    A single thread per worker holds a dedicated connection listening on the channel, it is started with the
+    first subscription. The thread runs outside of any application context, so subscribers pass the connection
+    arguments of the database.
+    """
+
+    def __init__(self, channel: str):
+        self.channel = channel
+        self.subscribers = set()
+        self.lock = threading.Lock()
+        self.thread = None
+        self.connect_args = None
+
+    def subscribe(self, connect_args: dict) -> queue.Queue:
+        """
+        Return a queue receiving ``(product, payload)`` for every event published until ``unsubscribe``.
+
+        ``connect_args`` are the psycopg2 connection arguments used if the listener has to be started.
+        """
+        events = queue.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        with self.lock:
+            self.subscribers.add(events)
+            if self.thread is None or not self.thread.is_alive():
+                self.connect_args = connect_args
+                self.thread = threading.Thread(target=self.listen, name="event-feed", daemon=True)
+                self.thread.start()
+        return events
+
+    def unsubscribe(self, events: queue.Queue):
+        with self.lock:
+            self.subscribers.discard(events)
+
+    def publish(self, payload: str):
+        try:
+            product = json.loads(payload).get("product")
+        except ValueError:
+            logging.error(f"[EVENT FEED]: Invalid payload {payload}")
+            return
+
+        with self.lock:
+            subscribers = list(self.subscribers)
+        for events in subscribers:
+            while True:
+                try:
+                    events.put_nowait((product, payload))
+                    break
+                except queue.Full:
+                    try:
+                        events.get_nowait()
+                    except queue.Empty:
+                        pass
+
+    def connect(self):
+        connection = psycopg2.connect(**self.connect_args)
+        connection.set_session(autocommit=True)
+        with connection.cursor() as cursor:
+            cursor.execute(f"LISTEN {self.channel}")
+        return connection
+
+    def listen(self):
+        connection = None
+        while True:
+            with self.lock:
+                if not self.subscribers:
+                    # Stop listening once the last client left, the next subscription starts a new thread
+                    self.thread = None
+                    break
+            try:
+                if connection is None:
+                    connection = self.connect()
+                    logging.info(f"[EVENT FEED]: Listening on {self.channel}")
+                if select.select([connection], [], [], LISTEN_POLL_INTERVAL) == ([], [], []):
+                    continue
+                connection.poll()
+                while connection.notifies:
+                    self.publish(connection.notifies.pop(0).payload)
+            except Exception as e:
+                logging.error(f"[EVENT FEED]: Listener failed, reconnecting: {e}")
+                if connection is not None:
+                    connection.close()
+                connection = None
+                time.sleep(LISTEN_POLL_INTERVAL)
+
+        if connection is not None:
+            connection.close()
+
+
+event_feed = EventFeed(DATA_EVENTS_CHANNEL)
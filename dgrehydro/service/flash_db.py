@@ -1,12 +1,42 @@
-from sqlalchemy import text, CursorResult
+import logging
+from datetime import datetime, timedelta
+
+from sqlalchemy import text, CursorResult, func, select
 from sqlalchemy.dialects.postgresql import Any
 
 from dgrehydro import db
+from dgrehydro.models.flashflood import FlashFlood
+from dgrehydro.models.flashflooddaily import FlashFloodDaily
+from dgrehydro.service.serialization import HTTP_DATE_FORMAT
+
+MUNICIPALITY = "municipality"
+PROVINCE = "province"
+REGION = "region"
+ADMIN_LEVELS = [MUNICIPALITY, PROVINCE, REGION]
+
 
+def select_flash_floods():
+    """Select flash floods with the columns of ``FlashFlood.serialize``, computed in SQL."""
+    return select(
+        FlashFlood.id,
+        FlashFlood.fid,
+        FlashFlood.subid,
+        FlashFlood.adm3_fr,
+        func.to_char(FlashFlood.forecast_date, HTTP_DATE_FORMAT).label("forecast_date"),
+        FlashFlood.init_value,
+        FlashFlood.value,
+        FlashFlood.weighted_ffft,
+    )
 
-def flashfloods_to_geojson(forecast_date) -> CursorResult[Any]:
+
+def flashfloods_to_geojson(forecast_date, bbox=None) -> CursorResult[Any]:
     parameters = {'forecast_date': forecast_date}
-    statement = text("""WITH flood_geom AS (SELECT f.id,
+    bbox_filter = ""
+    if bbox is not None:
+        parameters.update(zip(('min_x', 'min_y', 'max_x', 'max_y'), bbox))
+        bbox_filter = "AND ST_Intersects(s.geom, ST_MakeEnvelope(:min_x, :min_y, :max_x, :max_y, 4326))"
+
+    statement = text(f"""WITH flood_geom AS (SELECT f.id,
                                                    f.fid,
                                                    f.subid,
                                                    f.forecast_date,
@@ -20,7 +50,8 @@ def flashfloods_to_geojson(forecast_date) -> CursorResult[Any]:
                                                  dgre_municipality s
                                                  ON
                                                      f.subid = s.subid
-                                            WHERE f.forecast_date = :forecast_date)
+                                            WHERE f.forecast_date = :forecast_date
+                                              {bbox_filter})
                         SELECT jsonb_build_object(
                                        'type', 'FeatureCollection',
                                        'features', jsonb_agg(
@@ -34,3 +65,143 @@ def flashfloods_to_geojson(forecast_date) -> CursorResult[Any]:
                         FROM flood_geom t;
                      """)
     return db.session.execute(statement, parameters).scalar()
+
+
+def flashfloods_bundle_to_geojson(start_date, end_date, bbox=None) -> CursorResult[Any]:
+    """
+    All forecast dates in [start_date, end_date), each geometry once with the values as arrays.
+
+    Arrays follow the order of the top level ``forecast_dates``, missing values are null.
+    """
+    parameters = {'start_date': start_date, 'end_date': end_date}
+    bbox_filter = ""
+    if bbox is not None:
+        parameters.update(zip(('min_x', 'min_y', 'max_x', 'max_y'), bbox))
+        bbox_filter = "WHERE ST_Intersects(s.geom, ST_MakeEnvelope(:min_x, :min_y, :max_x, :max_y, 4326))"
+
+    statement = text(f"""WITH dates AS (SELECT DISTINCT forecast_date
+                                       FROM dgre_flash_flood
+                                       WHERE forecast_date >= :start_date
+                                         AND forecast_date < :end_date),
+                             flood_geom AS (SELECT s.subid,
+                                                   s.adm2_fr,
+                                                   s.adm3_fr,
+                                                   array_agg(f.init_value ORDER BY d.forecast_date) AS init_values,
+                                                   array_agg(f.value ORDER BY d.forecast_date) AS values,
+                                                   s.geom
+                                            FROM dgre_municipality s
+                                                     CROSS JOIN
+                                                 dates d
+                                                     LEFT JOIN
+                                                 dgre_flash_flood f
+                                                 ON
+                                                     f.subid = s.subid AND f.forecast_date = d.forecast_date
+                                            {bbox_filter}
+                                            GROUP BY s.subid)
+                        SELECT jsonb_build_object(
+                                       'type', 'FeatureCollection',
+                                       'forecast_dates', (SELECT jsonb_agg(forecast_date ORDER BY forecast_date) FROM dates),
+                                       'features', jsonb_agg(
+                                               jsonb_build_object(
+                                                       'type', 'Feature',
+                                                       'geometry', ST_AsGeoJSON(geom, 4326)::jsonb,
+                                                       'properties', to_jsonb(t) - 'geom'
+                                               )
+                                                   )
+                               ) AS geojson
+                        FROM flood_geom t;
+                     """)
+    return db.session.execute(statement, parameters).scalar()
+
+
+def flashfloods_values(start_date, end_date) -> CursorResult[Any]:
+    """Values of the forecast dates in [start_date, end_date) keyed by subid, to be joined with the municipalities."""
+    statement = text("""WITH dates AS (SELECT DISTINCT forecast_date
+                                       FROM dgre_flash_flood
+                                       WHERE forecast_date >= :start_date
+                                         AND forecast_date < :end_date),
+                             flood_values AS (SELECT s.subid,
+                                                     array_agg(f.value ORDER BY d.forecast_date) AS values
+                                              FROM dgre_municipality s
+                                                       CROSS JOIN
+                                                   dates d
+                                                       LEFT JOIN
+                                                   dgre_flash_flood f
+                                                   ON
+                                                       f.subid = s.subid AND f.forecast_date = d.forecast_date
+                                              GROUP BY s.subid)
+                        SELECT jsonb_build_object(
+                                       'forecast_dates', (SELECT jsonb_agg(forecast_date ORDER BY forecast_date) FROM dates),
+                                       'values', coalesce(jsonb_object_agg(subid::text, values), '{}'::jsonb)
+                               ) AS values
+                        FROM flood_values;
+                     """)
+    return db.session.execute(statement, {'start_date': start_date, 'end_date': end_date}).scalar()
+
+
+def refresh_flash_flood_daily(dates):
+    """
+    Recompute the daily rollups of the municipalities, provinces and regions for the days of ``dates``, without
+    committing.
+
+    A municipality belongs to the region covering most of its area in ``dgre_municipality_region``. The rows of
+    each day are replaced, so that areas no longer holding any municipality are removed.
+    """
+    days = sorted({date.replace(hour=0, minute=0, second=0, microsecond=0) for date in dates})
+    for day in days:
+        db.session.execute(text(f"DELETE FROM {FlashFloodDaily.__tablename__} WHERE day = CAST(:day AS date)"),
+                           {'day': day})
+        db.session.execute(text(f"""
+            WITH areas AS (SELECT m.subid, m.adm3_fr, m.adm2_fr, r.gid AS region_gid, r.name AS region_name
+                           FROM dgre_municipality m
+                                    LEFT JOIN LATERAL (SELECT region_gid
+                                                       FROM dgre_municipality_region
+                                                       WHERE municipality_subid = m.subid
+                                                       ORDER BY weight DESC
+                                                       LIMIT 1) mr ON true
+                                    LEFT JOIN dgre_geo_region r ON r.gid = mr.region_gid),
+                 rollups AS (SELECT CASE
+                                        WHEN GROUPING(a.subid) = 0 THEN '{MUNICIPALITY}'
+                                        WHEN GROUPING(a.adm2_fr) = 0 THEN '{PROVINCE}'
+                                        ELSE '{REGION}' END                   AS level,
+                                    COALESCE(a.subid::text, a.adm2_fr, a.region_gid) AS area_id,
+                                    f.forecast_date::date                      AS day,
+                                    COALESCE(a.adm3_fr, a.adm2_fr, a.region_name) AS name,
+                                    MAX(f.value)                               AS max_value,
+                                    AVG(f.weighted_ffft)                       AS mean_weighted_ffft,
+                                    COUNT(*)                                   AS count
+                             FROM dgre_flash_flood f
+                                      JOIN areas a ON a.subid = f.subid
+                             WHERE f.forecast_date >= :start
+                               AND f.forecast_date < :end
+                             GROUP BY f.forecast_date::date,
+                                      GROUPING SETS ((a.subid, a.adm3_fr), (a.adm2_fr), (a.region_gid, a.region_name)))
+            INSERT INTO {FlashFloodDaily.__tablename__} (level, area_id, day, name, max_value, mean_weighted_ffft, count)
+            SELECT level, area_id, day, name, max_value, mean_weighted_ffft, count
+            FROM rollups
+            WHERE area_id IS NOT NULL
+            ON CONFLICT (level, area_id, day) DO UPDATE
+                SET name               = excluded.name,
+                    max_value          = excluded.max_value,
+                    mean_weighted_ffft = excluded.mean_weighted_ffft,
+                    count              = excluded.count"""), {'start': day, 'end': day + timedelta(days=1)})
+    logging.info(f"[FLASH_FLOOD][ROLLUPS]: Refreshed {len(days)} days")
+
+
+def get_flash_flood_daily_days() -> list[datetime]:
+    """Days holding daily rollups, as datetimes at midnight."""
+    statement = text(f"SELECT DISTINCT CAST(day AS timestamp) FROM {FlashFloodDaily.__tablename__} ORDER BY 1")
+    return list(db.session.execute(statement).scalars())
+
+
+def select_flash_flood_daily():
+    """Select daily rollups with the columns of ``FlashFloodDaily.serialize``, days are serialized as ISO dates."""
+    return select(
+        FlashFloodDaily.level,
+        FlashFloodDaily.area_id,
+        FlashFloodDaily.day,
+        FlashFloodDaily.name,
+        FlashFloodDaily.max_value,
+        FlashFloodDaily.mean_weighted_ffft,
+        FlashFloodDaily.count,
+    )
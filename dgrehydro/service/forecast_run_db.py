@@ -0,0 +1,65 @@
+import logging
+from datetime import datetime
+
+from sqlalchemy import desc
+
+from dgrehydro import db
+from dgrehydro.models.forecastrun import ForecastRun
+
+
+def register_forecast_run(product: str, init_date: datetime, forecast_dates, row_count: int,
+                          duration: float = None, source_hash: str = None) -> ForecastRun:
+    """
+    Add the registry entry of an ingested run to the current session.
+
+    It must be called before the ingested rows are committed so that the run and its data are
+    committed in the same transaction.
+    """
+    forecast_run = ForecastRun(
+        product=product,
+        init_date=init_date,
+        forecast_dates=sorted(set(forecast_dates)),
+        row_count=row_count,
+        duration=duration,
+        source_hash=source_hash,
+    )
+    db.session.add(forecast_run)
+    logging.info(f"[FORECAST RUN][{product.upper()}]: Registered run {init_date} ({row_count} rows)")
+    return forecast_run
+
+
+def get_latest_forecast_runs(product: str, limit: int = 1) -> list[ForecastRun]:
+    """Return the latest runs of ``product``, most recent first."""
+    return (ForecastRun.query
+            .filter(ForecastRun.product == product)
+            .order_by(desc(ForecastRun.init_date), desc(ForecastRun.ingested_at))
+            .limit(limit)
+            .all())
+
+
+def get_latest_forecast_run(product: str) -> ForecastRun:
+    forecast_runs = get_latest_forecast_runs(product)
+    return forecast_runs[0] if forecast_runs else None
+
+
+def get_previous_forecast_run(product: str, init_date: datetime) -> ForecastRun:
+    """Return the latest run of ``product`` initialized before ``init_date``."""
+    return (ForecastRun.query
+            .filter(ForecastRun.product == product, ForecastRun.init_date < init_date)
+            .order_by(desc(ForecastRun.init_date), desc(ForecastRun.ingested_at))
+            .first())
+
+
+def has_forecast_date(product: str, forecast_date: datetime) -> bool:
+    """Whether a run of ``product`` forecasts ``forecast_date``."""
+    return db.session.query(ForecastRun.query
+                            .filter(ForecastRun.product == product,
+                                    ForecastRun.forecast_dates.any(forecast_date))
+                            .exists()).scalar()
+
+
+def has_init_date(product: str, init_date: datetime) -> bool:
+    """Whether a run of ``product`` was initialized at ``init_date``."""
+    return db.session.query(ForecastRun.query
+                            .filter(ForecastRun.product == product, ForecastRun.init_date == init_date)
+                            .exists()).scalar()
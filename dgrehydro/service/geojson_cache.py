@@ -0,0 +1,79 @@
+import gzip
+import json
+import logging
+
+import brotli
+from sqlalchemy import text
+
+from dgrehydro import db
+from dgrehydro.config.products import RIVERINE_FLOOD, FLASH_FLOOD
+from dgrehydro.models.geojsoncache import GeoJsonCache
+from dgrehydro.service.flash_db import flashfloods_to_geojson
+from dgrehydro.service.riverine_db import riverinesfloods_to_geojson
+
+GEOJSON_PRODUCTS = [RIVERINE_FLOOD, FLASH_FLOOD]
+
+
+def build_geojson(product: str, init_date, forecast_date) -> bytes:
+    if product == RIVERINE_FLOOD:
+        geojson = riverinesfloods_to_geojson(init_date, forecast_date)
+    else:
+        geojson = flashfloods_to_geojson(forecast_date)
+    return json.dumps(geojson, separators=(",", ":"), sort_keys=True).encode()
+
+
+def store_geojson(product: str, init_date, forecast_date):
+    """Build the FeatureCollection of one (init date, forecast date) and store it compressed."""
+    body = build_geojson(product, init_date, forecast_date)
+    parameters = {
+        'product': product,
+        'init_date': init_date,
+        'forecast_date': forecast_date,
+        'gzip': gzip.compress(body, compresslevel=9),
+        'brotli': brotli.compress(body),
+    }
+    db.session.execute(text("""INSERT INTO dgre_geojson_cache (product, init_date, forecast_date, gzip, brotli)
+                               VALUES (:product, :init_date, :forecast_date, :gzip, :brotli)
+                               ON CONFLICT (product, init_date, forecast_date) DO UPDATE
+                                   SET gzip       = excluded.gzip,
+                                       brotli     = excluded.brotli,
+                                       updated_at = now()"""), parameters)
+
+
+def refresh_geojson_cache(product: str, forecast_dates, init_date=None):
+    """
+    Rebuild the cached FeatureCollections of ``forecast_dates``.
+
+    Flash floods are keyed by their forecast date only, so their init date is the forecast date. Riverine
+    entries are rebuilt for ``init_date``, or dropped when it is not known.
+    """
+    if product not in GEOJSON_PRODUCTS:
+        return
+
+    for forecast_date in sorted(set(forecast_dates)):
+        if product == FLASH_FLOOD:
+            store_geojson(product, forecast_date, forecast_date)
+        elif init_date is not None:
+            store_geojson(product, init_date, forecast_date)
+        else:
+            GeoJsonCache.query.filter_by(product=product, forecast_date=forecast_date).delete()
+    db.session.commit()
+    logging.info(f"[GEOJSON CACHE][{product.upper()}]: Refreshed {len(set(forecast_dates))} forecast dates")
+
+
+def get_cached_geojson(product: str, init_date, forecast_date) -> GeoJsonCache:
+    return GeoJsonCache.query.get((product, init_date, forecast_date))
+
+
+def encode_cached_geojson(entry: GeoJsonCache, accept_encodings) -> tuple[bytes, str]:
+    """
+    Return the body and ``Content-Encoding`` of a cached entry for the parsed ``Accept-Encoding`` of a client.
+
+    Encodings are picked by preference of the server, brotli then gzip, among those the client accepts with a
+    non-zero quality. Entries stored before brotli was required may lack it.
+    """
+    if entry.brotli is not None and accept_encodings["br"] > 0:
+        return entry.brotli, "br"
+    if accept_encodings["gzip"] > 0:
+        return entry.gzip, "gzip"
+    return gzip.decompress(entry.gzip), None
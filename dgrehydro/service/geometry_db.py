@@ -0,0 +1,57 @@
+import hashlib
+import json
+
+from sqlalchemy import text
+
+from dgrehydro import db
+
+# Static geometry layers mapped to their table and the properties served with the geometry
+GEOMETRY_LAYERS = {
+    "river_segment": ("dgre_river_segment", ["subid::text AS subid"]),
+    "municipality": ("dgre_municipality", ["subid", "adm2_fr", "adm3_fr"]),
+}
+
+# Serialized layers, reused as long as the table fingerprint does not change
+_geometries = {}
+
+
+def table_fingerprint(table: str) -> str:
+    """Cheap fingerprint of a table, changes whenever a row is inserted, updated or deleted."""
+    statement = text(f"SELECT count(*) || ':' || coalesce(max(xmin::text::bigint), 0) FROM {table}")
+    return db.session.execute(statement).scalar()
+
+
+def get_geometry_fingerprint(layer: str) -> str:
+    table, _ = GEOMETRY_LAYERS[layer]
+    return table_fingerprint(table)
+
+
+def geometries_to_geojson(layer: str) -> str:
+    table, properties = GEOMETRY_LAYERS[layer]
+    statement = text(f"""WITH geom AS (SELECT {', '.join(properties)},
+                                             geom
+                                      FROM {table})
+                        SELECT jsonb_build_object(
+                                       'type', 'FeatureCollection',
+                                       'features', jsonb_agg(
+                                               jsonb_build_object(
+                                                       'type', 'Feature',
+                                                       'geometry', ST_AsGeoJSON(geom, 4326)::jsonb,
+                                                       'properties', to_jsonb(t) - 'geom'
+                                               )
+                                                   )
+                               ) AS geojson
+                        FROM geom t;
+                     """)
+    return json.dumps(db.session.execute(statement).scalar(), separators=(",", ":"))
+
+
+def get_geometries(layer: str) -> tuple[str, str]:
+    """Return the GeoJSON of a geometry layer and the SHA-256 of its content."""
+    fingerprint = get_geometry_fingerprint(layer)
+    cached = _geometries.get(layer)
+    if cached is None or cached[0] != fingerprint:
+        geojson = geometries_to_geojson(layer)
+        cached = (fingerprint, geojson, hashlib.sha256(geojson.encode()).hexdigest())
+        _geometries[layer] = cached
+    return cached[1], cached[2]
@@ -0,0 +1,113 @@
+import logging
+import os
+import re
+from datetime import datetime
+
+import pandas as pd
+from sqlalchemy import text
+
+from dgrehydro import SETTINGS, db
+
+# Partitioned tables and their monthly range partition key
+PARTITIONED_TABLES = {
+    "dgre_riverine_flood_run": "init_date",
+    "dgre_flash_flood": "forecast_date",
+    "dgre_critical_point": "measurement_date",
+}
+
+# Order of the exported rows, the packed riverine runs have no id
+EXPORT_ORDER = {
+    "dgre_riverine_flood_run": "init_date, subid",
+}
+
+
+def month_start(date: datetime) -> datetime:
+    return datetime(date.year, date.month, 1)
+
+
+def add_months(month: datetime, months: int) -> datetime:
+    year, month_index = divmod(month.year * 12 + month.month - 1 + months, 12)
+    return datetime(year, month_index + 1, 1)
+
+
+def get_partition_name(table: str, month: datetime) -> str:
+    return f"{table}_p{month:%Y%m}"
+
+
+def ensure_month_partitions(table: str, dates):
+    """Create the monthly partitions of ``table`` needed to store rows at ``dates``."""
+    created = False
+    for month in sorted({month_start(date) for date in dates}):
+        partition = get_partition_name(table, month)
+        if db.session.execute(text("SELECT to_regclass(:partition)"), {'partition': partition}).scalar():
+            continue
+
+        logging.info(f"[PARTITIONS]: Creating partition {partition}")
+        db.session.execute(text(f"""CREATE TABLE IF NOT EXISTS {partition} PARTITION OF {table}
+                                    FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{add_months(month, 1):%Y-%m-%d}')"""))
+        created = True
+
+    if created:
+        db.session.commit()
+
+
+def list_month_partitions(table: str) -> list[tuple[str, datetime]]:
+    """Return the (name, month) of the monthly partitions attached to ``table``."""
+    statement = text("""SELECT c.relname
+                        FROM pg_inherits i
+                                 JOIN pg_class c ON c.oid = i.inhrelid
+                        WHERE i.inhparent = CAST(:table AS regclass)""")
+    pattern = re.compile(rf"^{table}_p(\d{{4}})(\d{{2}})$")
+
+    partitions = []
+    for name in db.session.execute(statement, {'table': table}).scalars():
+        match = pattern.match(name)
+        if match:
+            partitions.append((name, datetime(int(match.group(1)), int(match.group(2)), 1)))
+    return sorted(partitions, key=lambda partition: partition[1])
+
+
+def export_partition(table: str, partition: str) -> str:
+    """Export a partition to a zstd compressed Parquet file under DATA_DIR/archive/<table>/."""
+    archive_dir = os.path.join(SETTINGS.get('DATA_DIR'), 'archive', table)
+    os.makedirs(archive_dir, exist_ok=True)
+    archive_file = os.path.join(archive_dir, f"{partition}.parquet")
+
+    statement = text(f"SELECT * FROM {partition} ORDER BY {EXPORT_ORDER.get(table, 'id')}")
+    data_frame = pd.read_sql_query(statement, db.session.connection())
+    tmp_file = f"{archive_file}.tmp"
+    data_frame.to_parquet(tmp_file, compression="zstd", index=False)
+    os.replace(tmp_file, archive_file)
+
+    logging.info(f"[PARTITIONS]: Exported {len(data_frame)} rows of {partition} to {archive_file}")
+    return archive_file
+
+
+def archive_old_partitions(keep_months: int) -> list[str]:
+    """
+    Export to Parquet, detach and drop the partitions older than ``keep_months`` months.
+
+    The current month always counts as the first month kept.
+    """
+    cutoff = add_months(month_start(datetime.utcnow()), -(keep_months - 1))
+    logging.info(f"[PARTITIONS]: Archiving partitions older than {cutoff:%Y-%m}")
+
+    archived = []
+    for table in PARTITIONED_TABLES:
+        for partition, month in list_month_partitions(table):
+            if month >= cutoff:
+                continue
+
+            export_partition(table, partition)
+            db.session.execute(text(f"ALTER TABLE {table} DETACH PARTITION {partition}"))
+            db.session.execute(text(f"DROP TABLE {partition}"))
+            db.session.commit()
+
+            logging.info(f"[PARTITIONS]: Archived {partition}")
+            archived.append(partition)
+
+    # Cached FeatureCollections of the archived months can no longer be rebuilt
+    db.session.execute(text("DELETE FROM dgre_geojson_cache WHERE init_date < :cutoff"), {'cutoff': cutoff})
+    db.session.commit()
+
+    return archived
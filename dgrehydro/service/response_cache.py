@@ -0,0 +1,225 @@
+import functools
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+
+from flask import Response, current_app, request
+
+from dgrehydro import SETTINGS
+from dgrehydro.service.data_version_db import get_data_versions
+
+
+@dataclass
+class CachedResponse:
+    body: bytes
+    status: int
+    mimetype: str
+
+
+class MemoryCache:
+    """In-process LRU, bounded both in number of entries and in total body size."""
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key: str) -> CachedResponse:
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: CachedResponse):
+        if len(entry.body) > self.max_bytes:
+            return
+        with self.lock:
+            previous = self.entries.pop(key, None)
+            if previous is not None:
+                self.size -= len(previous.body)
+            self.entries[key] = entry
+            self.size += len(entry.body)
+            while len(self.entries) > self.max_entries or self.size > self.max_bytes:
+                _, evicted = self.entries.popitem(last=False)
+                self.size -= len(evicted.body)
+
+
+class FileCache:
+    """
+    Cache shared by the gunicorn workers of a host, one entry per file.
+
+    A file holds a JSON header with the status and mimetype on its first line, followed by the body. Entries
+    older than ``max_age`` seconds are ignored and removed by ``prune``, those no longer reachable after a data
+    version bump expire the same way.
+    """
+
+    def __init__(self, directory: str, max_age: int):
+        self.directory = directory
+        self.max_age = max_age
+
+    def get_path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key)
+
+    def get(self, key: str) -> CachedResponse:
+        path = self.get_path(key)
+        try:
+            if time.time() - os.path.getmtime(path) > self.max_age:
+                return None
+            with open(path, "rb") as f:
+                header = json.loads(f.readline())
+                return CachedResponse(f.read(), int(header["status"]), header["mimetype"])
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def set(self, key: str, entry: CachedResponse):
+        path = self.get_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        header = json.dumps({"status": entry.status, "mimetype": entry.mimetype})
+        # Write then rename so that concurrent readers never see a partial entry
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(header.encode() + b"\n")
+            f.write(entry.body)
+        os.replace(tmp_path, path)
+
+    def prune(self) -> int:
+        """Remove the entries older than ``max_age``, return the number of removed files."""
+        expires_before = time.time() - self.max_age
+        removed = 0
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    if os.path.getmtime(path) < expires_before:
+                        os.remove(path)
+                        removed += 1
+                except OSError:
+                    pass
+        return removed
+
+
+class ResponseCache:
+    """Two level cache: the in-process LRU first, then the optional shared backend."""
+
+    def __init__(self, local: MemoryCache, shared=None):
+        self.local = local
+        self.shared = shared
+
+    def get(self, key: str) -> CachedResponse:
+        entry = self.local.get(key)
+        if entry is None and self.shared is not None:
+            entry = self.shared.get(key)
+            if entry is not None:
+                self.local.set(key, entry)
+        return entry
+
+    def set(self, key: str, entry: CachedResponse):
+        self.local.set(key, entry)
+        if self.shared is not None:
+            self.shared.set(key, entry)
+
+    def prune(self) -> int:
+        """Expire the old entries of the shared backend, the local LRU evicts the unreachable ones by itself."""
+        return self.shared.prune() if self.shared is not None else 0
+
+
+response_cache = ResponseCache(
+    MemoryCache(SETTINGS.get('RESPONSE_CACHE_MAX_ENTRIES'), SETTINGS.get('RESPONSE_CACHE_MAX_BYTES')),
+    FileCache(SETTINGS.get('RESPONSE_CACHE_DIR'), SETTINGS.get('RESPONSE_CACHE_MAX_AGE')) if SETTINGS.get('RESPONSE_CACHE_DIR') else None,
+)
+
+
+def make_cache_key(path: str, args, versions: dict) -> str:
+    """
+    Key a response by route, normalized query args and the data versions of its products.
+
+    Parameters are sorted so that their order does not matter. The current day is part of the key since
+    routes default their dates to today.
+    """
+    normalized_args = sorted((name, tuple(sorted(args.getlist(name)))) for name in args.keys())
+    key = repr((path, normalized_args, sorted(versions.items()), date.today().isoformat()))
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def get_last_modified(data_versions, today: date = None) -> datetime:
+    """
+    Last update of the data, as a UTC datetime truncated to the second like HTTP dates.
+
+    It is never before the start of ``today`` since responses defaulting to today change at midnight.
+    """
+    today = today or date.today()
+    updates = [data_version.updated_at.replace(microsecond=0)
+               for data_version in data_versions if data_version.updated_at]
+    return max(updates + [datetime.combine(today, datetime.min.time())]).replace(tzinfo=timezone.utc)
+
+
+def is_not_modified(etag: str, last_modified: datetime) -> bool:
+    """Evaluate the conditional headers of the request, ``If-None-Match`` taking precedence."""
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    if request.if_modified_since:
+        return last_modified <= request.if_modified_since
+    return False
+
+
+def set_validators(response: Response, etag: str, last_modified: datetime) -> Response:
+    response.set_etag(etag, weak=True)
+    response.last_modified = last_modified
+    # Clients may store the response but have to revalidate it before reuse
+    response.cache_control.no_cache = True
+    response.vary.add("Accept-Encoding")
+    return response
+
+
+def cached_response(*products):
+    """
+    Cache the successful responses of a GET route depending on the data of ``products``.
+
+    Ingestions and manual updates bump the data version of their product, which changes the key of every
+    response depending on it, in all workers. The key is also sent as a weak ``ETag`` with the last update
+    of the data as ``Last-Modified``, so conditional requests are answered with a ``304`` before running
+    the view.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            try:
+                data_versions = get_data_versions(products)
+            except Exception as e:
+                logging.error(f"[RESPONSE CACHE]: Failed to get data versions, not caching {request.path}: {e}")
+                return view(*args, **kwargs)
+            versions = {product: data_version.version for product, data_version in data_versions.items()}
+            key = make_cache_key(request.path, request.args, versions)
+            last_modified = get_last_modified(data_versions.values())
+
+            if is_not_modified(key, last_modified):
+                return set_validators(Response(status=304), key, last_modified)
+
+            entry = response_cache.get(key)
+            if entry is not None:
+                response = Response(entry.body, status=entry.status, mimetype=entry.mimetype)
+                return set_validators(response, key, last_modified)
+
+            response = current_app.make_response(view(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+
+            # Precompressed and streamed responses are not cached
+            if not response.content_encoding and not response.is_streamed:
+                try:
+                    response_cache.set(key, CachedResponse(response.get_data(), response.status_code,
+                                                           response.mimetype))
+                except Exception as e:
+                    logging.error(f"[RESPONSE CACHE]: Failed to store {request.path}: {e}")
+            return set_validators(response, key, last_modified)
+        return wrapper
+    return decorator
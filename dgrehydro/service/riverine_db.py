@@ -1,15 +1,71 @@
-from sqlalchemy import text, CursorResult
+from sqlalchemy import text, CursorResult, String, func, select
 from sqlalchemy.dialects.postgresql import Any
 
 from dgrehydro import db
+from dgrehydro.models.riverineflood import RiverineFlood
+from dgrehydro.service.serialization import HTTP_DATE_FORMAT
 
 
-def riverinesfloods_to_geojson(init_date, forecast_date) -> CursorResult[Any]:
+def select_riverine_floods():
+    """Select riverine floods with the columns of ``RiverineFlood.serialize``, computed in SQL."""
+    return select(
+        RiverineFlood.id,
+        RiverineFlood.fid,
+        RiverineFlood.subid.cast(String).label("subid"),
+        func.to_char(RiverineFlood.init_date, HTTP_DATE_FORMAT).label("init_date"),
+        func.to_char(RiverineFlood.forecast_date, HTTP_DATE_FORMAT).label("forecast_date"),
+        RiverineFlood.init_value,
+        RiverineFlood.value,
+    )
+
+
+def update_riverine_flood_levels(values: str, parameters: dict) -> set:
+    """
+    Override the daily levels of ``values``, a ``(subid, init_date, forecast_date, value)`` clause of
+    ``values_clause``, without committing.
+
+    The levels of a run are rebuilt and written once, whatever the number of its overridden days. Return the
+    (subid, init_date, forecast_date) keys of the overridden days.
+    """
+    statement = text(f"""WITH v AS (SELECT * FROM {values}),
+                              runs AS (SELECT r.subid,
+                                              r.init_date,
+                                              array_agg(COALESCE(v.value, r.levels[d.day]) ORDER BY d.day)::smallint[]
+                                                  AS levels,
+                                              array_agg(v.forecast_date) FILTER (WHERE v.value IS NOT NULL)
+                                                  AS forecast_dates
+                                       FROM dgre_riverine_flood_run r
+                                                CROSS JOIN LATERAL generate_subscripts(r.levels, 1) AS d(day)
+                                                LEFT JOIN v ON v.subid = r.subid
+                                           AND v.init_date = r.init_date
+                                           AND v.forecast_date = r.init_date + (d.day - 1) * interval '1 day'
+                                       WHERE (r.subid, r.init_date) IN (SELECT subid, init_date FROM v)
+                                       GROUP BY r.subid, r.init_date),
+                              updated AS (UPDATE dgre_riverine_flood_run r
+                                          SET levels    = runs.levels,
+                                              max_level = (SELECT MAX(level) FROM unnest(runs.levels) AS level)
+                                          FROM runs
+                                          WHERE r.subid = runs.subid
+                                            AND r.init_date = runs.init_date
+                                            AND runs.forecast_dates IS NOT NULL
+                                          RETURNING r.subid, r.init_date)
+                         SELECT runs.subid, runs.init_date, unnest(runs.forecast_dates)
+                         FROM runs
+                                  JOIN updated ON updated.subid = runs.subid AND updated.init_date = runs.init_date""")
+    return {tuple(row) for row in db.session.execute(statement, parameters)}
+
+
+def riverinesfloods_to_geojson(init_date, forecast_date, bbox=None) -> CursorResult[Any]:
 
     parameters = {'init_date': init_date, 'forecast_date': forecast_date}
-    statement = text("""WITH flood_geom AS (SELECT f.id,
+    bbox_filter = ""
+    if bbox is not None:
+        parameters.update(zip(('min_x', 'min_y', 'max_x', 'max_y'), bbox))
+        bbox_filter = "AND ST_Intersects(s.geom, ST_MakeEnvelope(:min_x, :min_y, :max_x, :max_y, 4326))"
+
+    statement = text(f"""WITH flood_geom AS (SELECT f.id,
                                                    f.fid,
-                                                   f.subid,
+                                                   f.subid::text AS subid,
                                                    f.init_date,
                                                    f.forecast_date,
                                                    f.init_value,
@@ -21,7 +77,43 @@ def riverinesfloods_to_geojson(init_date, forecast_date) -> CursorResult[Any]:
                                                  ON
                                                      f.subid = s.subid
                                             WHERE f.init_date = :init_date
-                                              AND f.forecast_date = :forecast_date)
+                                              AND f.forecast_date = :forecast_date
+                                              {bbox_filter})
+                        SELECT jsonb_build_object(
+                                       'type', 'FeatureCollection',
+                                       'features', jsonb_agg(
+                                               jsonb_build_object(
+                                                       'type', 'Feature',
+                                                       'geometry', ST_AsGeoJSON(geom, 4326)::jsonb,
+                                                       'properties', to_jsonb(t) - 'geom'
+                                               )
+                                                   )
+                               ) AS geojson
+                        FROM flood_geom t;
+                     """)
+    return db.session.execute(statement, parameters).scalar()
+
+
+def riverinefloods_max_to_geojson(init_date, bbox=None) -> CursorResult[Any]:
+
+    parameters = {'init_date': init_date}
+    bbox_filter = ""
+    if bbox is not None:
+        parameters.update(zip(('min_x', 'min_y', 'max_x', 'max_y'), bbox))
+        bbox_filter = "AND ST_Intersects(s.geom, ST_MakeEnvelope(:min_x, :min_y, :max_x, :max_y, 4326))"
+
+    statement = text(f"""WITH flood_geom AS (SELECT r.fid,
+                                                   r.subid::text AS subid,
+                                                   r.init_date,
+                                                   r.max_level AS value,
+                                                   s.geom
+                                            FROM dgre_riverine_flood_run r
+                                                     JOIN
+                                                 dgre_river_segment s
+                                                 ON
+                                                     r.subid = s.subid
+                                            WHERE r.init_date = :init_date
+                                              {bbox_filter})
                         SELECT jsonb_build_object(
                                        'type', 'FeatureCollection',
                                        'features', jsonb_agg(
@@ -35,3 +127,85 @@ def riverinesfloods_to_geojson(init_date, forecast_date) -> CursorResult[Any]:
                         FROM flood_geom t;
                      """)
     return db.session.execute(statement, parameters).scalar()
+
+
+def riverinefloods_bundle_to_geojson(init_date, bbox=None) -> CursorResult[Any]:
+    """All forecast days of one run, each geometry once with the daily levels as arrays."""
+
+    parameters = {'init_date': init_date}
+    bbox_filter = ""
+    if bbox is not None:
+        parameters.update(zip(('min_x', 'min_y', 'max_x', 'max_y'), bbox))
+        bbox_filter = "AND ST_Intersects(s.geom, ST_MakeEnvelope(:min_x, :min_y, :max_x, :max_y, 4326))"
+
+    statement = text(f"""WITH flood_geom AS (SELECT r.fid,
+                                                   r.subid::text AS subid,
+                                                   r.init_date,
+                                                   r.init_levels AS init_values,
+                                                   r.levels AS values,
+                                                   r.max_level,
+                                                   s.geom
+                                            FROM dgre_riverine_flood_run r
+                                                     JOIN
+                                                 dgre_river_segment s
+                                                 ON
+                                                     r.subid = s.subid
+                                            WHERE r.init_date = :init_date
+                                              {bbox_filter})
+                        SELECT jsonb_build_object(
+                                       'type', 'FeatureCollection',
+                                       'forecast_dates', (SELECT jsonb_agg(r.init_date + (d - 1) * interval '1 day' ORDER BY d)
+                                                          FROM (SELECT init_date, values FROM flood_geom LIMIT 1) r,
+                                                               generate_subscripts(r.values, 1) d),
+                                       'features', jsonb_agg(
+                                               jsonb_build_object(
+                                                       'type', 'Feature',
+                                                       'geometry', ST_AsGeoJSON(geom, 4326)::jsonb,
+                                                       'properties', to_jsonb(t) - 'geom'
+                                               )
+                                                   )
+                               ) AS geojson
+                        FROM flood_geom t;
+                     """)
+    return db.session.execute(statement, parameters).scalar()
+
+
+def riverinefloods_values(init_date) -> CursorResult[Any]:
+    """Daily levels of one run keyed by subid, to be joined with the river segment geometries."""
+    statement = text("""SELECT jsonb_build_object(
+                                   'init_date', CAST(:init_date AS timestamp),
+                                   'forecast_dates', (SELECT jsonb_agg(r.init_date + (d - 1) * interval '1 day' ORDER BY d)
+                                                      FROM (SELECT init_date, levels
+                                                            FROM dgre_riverine_flood_run
+                                                            WHERE init_date = :init_date
+                                                            LIMIT 1) r,
+                                                           generate_subscripts(r.levels, 1) d),
+                                   'values', coalesce(jsonb_object_agg(subid::text, levels), '{}'::jsonb)
+                           ) AS values
+                        FROM dgre_riverine_flood_run
+                        WHERE init_date = :init_date;
+                     """)
+    return db.session.execute(statement, {'init_date': init_date}).scalar()
+
+
+def riverinefloods_exceedance(init_date, return_period: int) -> dict:
+    """
+    Daily probabilities of exceeding the ``return_period`` return level in one run keyed by subid, the counterpart
+    of ``riverinefloods_values`` for the runs published with ensemble members.
+    """
+    statement = text("""SELECT jsonb_build_object(
+                                   'init_date', CAST(:init_date AS timestamp),
+                                   'return_period', :return_period,
+                                   'ensemble_members', max(ensemble_members),
+                                   'values', coalesce(jsonb_object_agg(subid::text, probabilities), '{}'::jsonb)
+                           ) AS values
+                        FROM (SELECT subid,
+                                     ensemble_members,
+                                     (SELECT array_agg(exceedance[d][k] ORDER BY d)
+                                      FROM generate_subscripts(exceedance, 1) d) AS probabilities
+                              FROM dgre_riverine_flood_run,
+                                   array_position(return_periods, CAST(:return_period AS smallint)) k
+                              WHERE init_date = :init_date
+                                AND k IS NOT NULL) r;
+                     """)
+    return db.session.execute(statement, {'init_date': init_date, 'return_period': return_period}).scalar()
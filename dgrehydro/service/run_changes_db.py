@@ -0,0 +1,91 @@
+import logging
+from datetime import datetime
+
+import numpy as np
+from sqlalchemy import delete, func, insert, select, text
+
+from dgrehydro import db
+from dgrehydro.config.products import RIVERINE_FLOOD, FLASH_FLOOD, CRITICAL_POINT
+from dgrehydro.models.runchange import RunChange
+from dgrehydro.service.forecast_run_db import get_previous_forecast_run
+from dgrehydro.service.run_diff import common_window_max, diff_levels, level_matrix
+from dgrehydro.service.serialization import ISO_DATE_FORMAT
+
+# Levels of the items of a run, ordered by key
+RUN_LEVELS = {
+    FLASH_FLOOD: """SELECT subid, value
+                    FROM dgre_flash_flood
+                    WHERE forecast_date = :init_date
+                    ORDER BY subid""",
+    CRITICAL_POINT: """SELECT station_name, water_level_alert
+                       FROM dgre_critical_point
+                       WHERE measurement_date = :init_date
+                         AND forecast_date = measurement_date
+                         AND water_level_alert IS NOT NULL
+                       ORDER BY station_name""",
+}
+
+
+def load_run_levels(product: str, init_date: datetime) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Keys and levels of the items of a run.
+
+    Riverine runs hold one row of daily levels per subbasin, the other products a single level per item.
+    """
+    if product == RIVERINE_FLOOD:
+        rows = db.session.execute(text("""SELECT subid, levels
+                                          FROM dgre_riverine_flood_run
+                                          WHERE init_date = :init_date
+                                          ORDER BY subid"""), {'init_date': init_date}).all()
+        return np.array([row[0] for row in rows]), level_matrix([row[1] for row in rows])
+
+    rows = db.session.execute(text(RUN_LEVELS[product]), {'init_date': init_date}).all()
+    return np.array([row[0] for row in rows], dtype=object), np.array([row[1] for row in rows], dtype=np.int16)
+
+
+def record_run_changes(product: str, init_date: datetime) -> int:
+    """
+    Store the warning level changes of the run of ``init_date`` since the previous run, without committing.
+
+    Riverine subbasins are compared on their maximum level over the days forecast by both runs.
+    """
+    previous_run = get_previous_forecast_run(product, init_date)
+    if previous_run is None:
+        return 0
+
+    keys, levels = load_run_levels(product, init_date)
+    previous_keys, previous_levels = load_run_levels(product, previous_run.init_date)
+    if product == RIVERINE_FLOOD:
+        offset = (init_date - previous_run.init_date).days
+        levels, previous_levels = common_window_max(levels, previous_levels, offset)
+
+    changes = diff_levels(keys, levels, previous_keys, previous_levels)
+
+    db.session.execute(delete(RunChange).where(RunChange.product == product, RunChange.init_date == init_date))
+    if changes:
+        db.session.execute(insert(RunChange), [{
+            "product": product,
+            "init_date": init_date,
+            "previous_init_date": previous_run.init_date,
+            "item_id": str(key),
+            "previous_level": previous_level,
+            "level": level,
+            "change": change,
+        } for key, previous_level, level, change in changes])
+
+    logging.info(f"[RUN CHANGES][{product.upper()}]: {len(changes)} changes between {previous_run.init_date} "
+                 f"and {init_date}")
+    return len(changes)
+
+
+def select_run_changes():
+    """Select run changes with the columns of ``RunChange.serialize``, computed in SQL."""
+    return select(
+        RunChange.product,
+        func.to_char(RunChange.init_date, ISO_DATE_FORMAT).label("init_date"),
+        func.to_char(RunChange.previous_init_date, ISO_DATE_FORMAT).label("previous_init_date"),
+        RunChange.item_id,
+        RunChange.previous_level,
+        RunChange.level,
+        RunChange.change,
+    )
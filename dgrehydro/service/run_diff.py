@@ -0,0 +1,69 @@
+import numpy as np
+
+UPGRADED = "upgraded"
+DOWNGRADED = "downgraded"
+NEW_ALERT = "new_alert"
+CHANGES = [UPGRADED, DOWNGRADED, NEW_ALERT]
+
+# Levels from which an item is on alert
+ALERT_LEVEL = 2
+
+# Padding of the daily level matrices, below every level
+MISSING = -1
+
+
+def level_matrix(rows: list) -> np.ndarray:
+    """Stack daily level arrays of possibly different lengths, padding with ``MISSING``."""
+    width = max((len(row) for row in rows), default=0)
+    matrix = np.full((len(rows), width), MISSING, dtype=np.int16)
+    for i, row in enumerate(rows):
+        matrix[i, :len(row)] = [MISSING if level is None else level for level in row]
+    return matrix
+
+
+def common_window_max(levels: np.ndarray, previous_levels: np.ndarray, offset: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Maximum level of each row over the days forecast by both runs.
+
+    Day ``i`` of the previous run is day ``i - offset`` of the current run. Rows without any common day get
+    ``MISSING``.
+    """
+    width = min(levels.shape[1], previous_levels.shape[1] - offset)
+    if width <= 0:
+        return (np.full(len(levels), MISSING, dtype=np.int16),
+                np.full(len(previous_levels), MISSING, dtype=np.int16))
+    return levels[:, :width].max(axis=1), previous_levels[:, offset:offset + width].max(axis=1)
+
+
+def diff_levels(keys: np.ndarray, levels: np.ndarray, previous_keys: np.ndarray, previous_levels: np.ndarray,
+                alert_level: int = ALERT_LEVEL) -> list[tuple]:
+    """
+    Compare the levels of a run with the previous one, item by item.
+
+    Return ``(key, previous_level, level, change)`` for each item whose level changed, ``previous_level`` being
+    None for items missing from the previous run. Items reaching ``alert_level`` are reported as ``new_alert``
+    rather than ``upgraded``. Items missing from the current run are ignored.
+    """
+    order = np.argsort(previous_keys, kind="stable")
+    sorted_keys = previous_keys[order]
+    positions = np.clip(np.searchsorted(sorted_keys, keys), 0, max(len(sorted_keys) - 1, 0))
+
+    matched = np.zeros(len(keys), dtype=bool)
+    previous = np.full(len(keys), MISSING, dtype=np.int16)
+    if len(sorted_keys):
+        matched = sorted_keys[positions] == keys
+        previous[matched] = previous_levels[order][positions[matched]]
+    # Days without a forecast in either run are not compared
+    matched &= (previous != MISSING) & (levels != MISSING)
+
+    new_alert = (levels >= alert_level) & (~matched | (previous < alert_level))
+    upgraded = matched & (levels > previous) & ~new_alert
+    downgraded = matched & (levels < previous)
+
+    key_list = keys.tolist()
+    changes = []
+    for change, mask in ((NEW_ALERT, new_alert), (UPGRADED, upgraded), (DOWNGRADED, downgraded)):
+        for i in np.flatnonzero(mask):
+            previous_level = int(previous[i]) if matched[i] else None
+            changes.append((key_list[i], previous_level, int(levels[i]), change))
+    return changes
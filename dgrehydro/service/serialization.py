@@ -0,0 +1,45 @@
+from flask import Response
+from sqlalchemy import Select, Text, func, literal_column, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+
+from dgrehydro import db
+
+# to_char formats matching the serialization of datetimes by Flask (RFC 822) and by datetime.isoformat()
+HTTP_DATE_FORMAT = 'Dy, DD Mon YYYY HH24:MI:SS "GMT"'
+ISO_DATE_FORMAT = 'YYYY-MM-DD"T"HH24:MI:SS'
+
+ROWS = "rows"
+COLUMNAR = "columnar"
+FORMATS = [ROWS, COLUMNAR]
+
+# Position of the rows in the order of the serialized statement, not part of the output
+ROW_NUMBER = "__row_number"
+
+
+def select_to_json(statement: Select, output_format: str = ROWS, order_by: tuple = ()) -> str:
+    """
+    Serialize the result of ``statement`` to JSON in PostgreSQL, without hydrating any ORM object.
+
+    Rows are returned as an array of objects, or with ``columnar`` as one object of parallel arrays keyed by
+    column label, in the order of the ``order_by`` expressions.
+    """
+    # The order of a subquery is not guaranteed to survive the aggregation, rows are numbered in that order instead
+    row_number = func.row_number().over(order_by=order_by or None).label(ROW_NUMBER)
+    rows = statement.add_columns(row_number).subquery("t")
+    columns = [column for column in rows.c if column.name != ROW_NUMBER]
+    empty = literal_column("'[]'::json")
+
+    if output_format == COLUMNAR:
+        arrays = []
+        for column in columns:
+            arrays += [literal_column(f"'{column.name}'"),
+                       func.coalesce(func.json_agg(aggregate_order_by(column, rows.c[ROW_NUMBER])), empty)]
+        json_statement = select(func.json_build_object(*arrays).cast(Text))
+    else:
+        row = func.json_build_object(*[item for column in columns for item in (literal_column(f"'{column.name}'"), column)])
+        json_statement = select(func.coalesce(func.json_agg(aggregate_order_by(row, rows.c[ROW_NUMBER])), empty).cast(Text))
+    return db.session.execute(json_statement.select_from(rows)).scalar()
+
+
+def json_response(body: str, status: int = 200) -> Response:
+    return Response(body, status=status, mimetype="application/json")
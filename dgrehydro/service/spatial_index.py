@@ -0,0 +1,120 @@
+import logging
+import math
+import threading
+import time
+from dataclasses import dataclass
+
+import numpy as np
+import shapely
+from shapely import STRtree
+from sqlalchemy import text
+
+from dgrehydro import SETTINGS, db
+from dgrehydro.service.geometry_db import table_fingerprint
+
+# Indexed layers mapped to their table and key column
+INDEXED_LAYERS = {
+    "river_segment": ("dgre_river_segment", "subid"),
+    "municipality": ("dgre_municipality", "subid"),
+    "poi_station": ("dgre_poi_station", "station_name"),
+}
+
+# Layers of lines and points, which a location can only match within a tolerance
+TOLERANT_LAYERS = {"river_segment", "poi_station"}
+
+# Seconds during which an index is used without checking the fingerprint of its table
+FINGERPRINT_CHECK_INTERVAL = 60
+
+METERS_PER_DEGREE = 111320.0
+
+
+def projection_scale(latitude: float) -> np.ndarray:
+    """Scale of an equirectangular projection in meters, accurate around ``latitude``."""
+    return np.array([METERS_PER_DEGREE * math.cos(math.radians(latitude)), METERS_PER_DEGREE])
+
+
+def project(geometries, scale: np.ndarray):
+    return shapely.transform(geometries, lambda coordinates: coordinates * scale)
+
+
+class SpatialIndex:
+    """
+    STRtree of the geometries of a layer, in an equirectangular projection centered on the layer.
+
+    Distances are in meters, the error stays under 1% over a country the size of Burkina Faso. ``tolerance`` is
+    the minimum search radius, lines and points are never exactly at a location.
+    """
+
+    def __init__(self, keys: list, geometries, tolerance: float = 0):
+        self.tolerance = tolerance
+        self.keys = np.array(keys, dtype=object)
+        if len(self.keys):
+            _, min_y, _, max_y = shapely.total_bounds(geometries)
+            self.scale = projection_scale((min_y + max_y) / 2)
+        else:
+            self.scale = projection_scale(0)
+        self.tree = STRtree(project(geometries, self.scale))
+
+    def query(self, lon: float, lat: float, radius: float = 0) -> list:
+        """
+        Keys of the geometries within ``radius`` meters of the point, at least the tolerance of the index.
+
+        Without radius nor tolerance, keys of the geometries containing the point.
+        """
+        point = project(shapely.points(lon, lat), self.scale)
+        radius = max(radius, self.tolerance)
+        if radius > 0:
+            indices = self.tree.query(point, predicate="dwithin", distance=radius)
+        else:
+            indices = self.tree.query(point, predicate="intersects")
+        return self.keys[np.sort(indices)].tolist()
+
+
+@dataclass
+class CachedIndex:
+    fingerprint: str
+    index: SpatialIndex
+    checked_at: float
+
+
+# Indexes of this worker by layer
+_indexes = {}
+_lock = threading.Lock()
+
+
+def build_spatial_index(layer: str) -> SpatialIndex:
+    table, key = INDEXED_LAYERS[layer]
+    rows = db.session.execute(text(f"SELECT {key}, ST_AsBinary(geom) FROM {table} WHERE geom IS NOT NULL")).all()
+    geometries = shapely.from_wkb([bytes(row[1]) for row in rows])
+    tolerance = SETTINGS.get('WARNING_TOLERANCE') if layer in TOLERANT_LAYERS else 0
+    return SpatialIndex([row[0] for row in rows], geometries, tolerance)
+
+
+def get_spatial_index(layer: str) -> SpatialIndex:
+    """
+    Index of ``layer`` for this worker, built on first use.
+
+    The table fingerprint is checked at most every ``FINGERPRINT_CHECK_INTERVAL`` seconds, the index is
+    rebuilt when it changed, after ``load_geometries`` for instance.
+    """
+    cached = _indexes.get(layer)
+    if cached is not None and time.monotonic() - cached.checked_at < FINGERPRINT_CHECK_INTERVAL:
+        return cached.index
+
+    with _lock:
+        cached = _indexes.get(layer)
+        now = time.monotonic()
+        if cached is not None and now - cached.checked_at < FINGERPRINT_CHECK_INTERVAL:
+            return cached.index
+
+        table, _ = INDEXED_LAYERS[layer]
+        fingerprint = table_fingerprint(table)
+        if cached is None or cached.fingerprint != fingerprint:
+            started_at = time.monotonic()
+            index = build_spatial_index(layer)
+            logging.info(f"[SPATIAL INDEX]: Built {layer} index of {len(index.keys)} geometries "
+                         f"in {time.monotonic() - started_at:.2f}s")
+        else:
+            index = cached.index
+        _indexes[layer] = CachedIndex(fingerprint, index, now)
+        return index
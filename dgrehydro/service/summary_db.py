@@ -0,0 +1,72 @@
+from sqlalchemy import text
+
+from dgrehydro import db
+from dgrehydro.config.products import RIVERINE_FLOOD, FLASH_FLOOD, CRITICAL_POINT
+from dgrehydro.service.flash_db import MUNICIPALITY, PROVINCE, REGION
+
+# Municipalities of each admin unit, with the share of the municipality belonging to the unit
+SUMMARY_UNITS = {
+    MUNICIPALITY: """SELECT subid AS municipality_subid, subid::text AS unit_id, adm3_fr AS name, 1.0 AS weight
+                     FROM dgre_municipality""",
+    PROVINCE: """SELECT subid AS municipality_subid, adm2_fr AS unit_id, adm2_fr AS name, 1.0 AS weight
+                 FROM dgre_municipality""",
+    REGION: """SELECT mr.municipality_subid, r.gid AS unit_id, r.name, mr.weight
+               FROM dgre_municipality_region mr
+                        JOIN dgre_geo_region r ON r.gid = mr.region_gid""",
+}
+
+# Warning levels of each product as (item_id, municipality_subid, weight, value), the weight being the share
+# of the item inside the municipality
+SUMMARY_ITEMS = {
+    RIVERINE_FLOOD: """SELECT f.subid::text AS item_id, sm.municipality_subid, sm.weight, f.value
+                       FROM dgre_riverine_flood f
+                                JOIN dgre_segment_municipality sm ON sm.segment_subid = f.subid
+                       WHERE f.init_date = :init_date
+                         AND f.forecast_date = :forecast_date""",
+    FLASH_FLOOD: """SELECT f.subid::text AS item_id, f.subid AS municipality_subid, 1.0 AS weight, f.value
+                    FROM dgre_flash_flood f
+                    WHERE f.forecast_date = :forecast_date""",
+    CRITICAL_POINT: """SELECT DISTINCT ON (c.station_name) c.station_name AS item_id, sm.municipality_subid,
+                                                           1.0 AS weight, c.water_level_alert AS value
+                       FROM dgre_critical_point c
+                                JOIN dgre_station_municipality sm ON sm.station_name = c.station_name
+                       WHERE c.forecast_date = :forecast_date
+                         AND c.water_level_alert IS NOT NULL
+                       ORDER BY c.station_name, c.measurement_date DESC""",
+}
+
+# Maximum level of each segment over all the forecast days of a run
+RIVERINE_RUN_MAX_ITEMS = """SELECT r.subid::text AS item_id, sm.municipality_subid, sm.weight, r.max_level AS value
+                            FROM dgre_riverine_flood_run r
+                                     JOIN dgre_segment_municipality sm ON sm.segment_subid = r.subid
+                            WHERE r.init_date = :init_date"""
+
+
+def summarize_levels(product: str, level: str, min_level: int, forecast_date=None, init_date=None) -> str:
+    """
+    Aggregate the warning levels of ``product`` per admin unit, as a JSON array sorted by unit.
+
+    For each unit: the number of items (segments, municipalities or stations), the number of items at
+    ``min_level`` or above, the weighted equivalent of the latter and the maximum level. Riverine floods are
+    read from the run of ``init_date``, at ``forecast_date`` or at the maximum over the run when it is None.
+    """
+    items = SUMMARY_ITEMS[product]
+    if product == RIVERINE_FLOOD and forecast_date is None:
+        items = RIVERINE_RUN_MAX_ITEMS
+
+    statement = text(f"""WITH units AS ({SUMMARY_UNITS[level]}),
+                             items AS ({items}),
+                             summary AS (SELECT u.unit_id,
+                                                u.name,
+                                                COUNT(DISTINCT i.item_id)                                    AS count,
+                                                COUNT(DISTINCT i.item_id) FILTER (WHERE i.value >= :min_level) AS count_at_level,
+                                                COALESCE(SUM(i.weight * u.weight) FILTER (WHERE i.value >= :min_level), 0)
+                                                                                                             AS weight_at_level,
+                                                MAX(i.value)                                                 AS max_level
+                                         FROM items i
+                                                  JOIN units u ON u.municipality_subid = i.municipality_subid
+                                         GROUP BY u.unit_id, u.name)
+                        SELECT COALESCE(json_agg(t ORDER BY t.unit_id), '[]'::json)::text
+                        FROM summary t""")
+    parameters = {'min_level': min_level, 'forecast_date': forecast_date, 'init_date': init_date}
+    return db.session.execute(statement, parameters).scalar()
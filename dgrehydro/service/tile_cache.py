@@ -0,0 +1,156 @@
+import logging
+import math
+import os
+import shutil
+from datetime import datetime
+
+from sqlalchemy import text
+
+from dgrehydro import SETTINGS, db
+from dgrehydro.config.products import RIVERINE_FLOOD, FLASH_FLOOD, CRITICAL_POINT
+from dgrehydro.service.forecast_run_db import get_latest_forecast_run, has_forecast_date, has_init_date
+
+# Burkina Faso extent (min lon, min lat, max lon, max lat), from the river segments and regions layers
+BURKINA_BBOX = (-5.52, 9.31, 2.47, 15.20)
+
+# Maximum warning level over the forecast days of a riverine run, keyed by init date instead of forecast date
+RIVERINE_FLOOD_MAX = "riverine_flood_max"
+
+# Tile layers mapped to the pg_tileserv functions defined in dgrehydro/db/
+TILE_LAYERS = {
+    RIVERINE_FLOOD: "dgre_riverine_flood",
+    RIVERINE_FLOOD_MAX: "dgre_riverine_flood_max",
+    FLASH_FLOOD: "dgre_flash_flood",
+    CRITICAL_POINT: "dgre_critical_point",
+}
+
+TILE_MIMETYPE = "application/vnd.mapbox-vector-tile"
+
+
+def get_tile_cache_dir() -> str:
+    return SETTINGS.get('TILE_CACHE_DIR') or os.path.join(SETTINGS.get('DATA_DIR'), 'tiles')
+
+
+def get_forecast_date_dir(layer: str, forecast_date: datetime) -> str:
+    return os.path.join(get_tile_cache_dir(), layer, forecast_date.strftime("%Y%m%dT%H%M%S"))
+
+
+def get_tile_path(layer: str, forecast_date: datetime, z: int, x: int, y: int) -> str:
+    return os.path.join(get_forecast_date_dir(layer, forecast_date), str(z), str(x), f"{y}.pbf")
+
+
+def lonlat_to_tile(lon: float, lat: float, z: int) -> tuple[int, int]:
+    """Return the XYZ (web mercator) tile containing the given point at zoom ``z``."""
+    n = 2 ** z
+    lat = max(min(lat, 85.0511), -85.0511)
+    x = int((lon + 180.0) / 360.0 * n)
+    y = int((1.0 - math.asinh(math.tan(math.radians(lat))) / math.pi) / 2.0 * n)
+    return min(max(x, 0), n - 1), min(max(y, 0), n - 1)
+
+
+def tile_range(bbox: tuple, z: int) -> tuple[int, int, int, int]:
+    """Return the (min_x, min_y, max_x, max_y) tiles covering ``bbox`` at zoom ``z``."""
+    min_lon, min_lat, max_lon, max_lat = bbox
+    min_x, min_y = lonlat_to_tile(min_lon, max_lat, z)
+    max_x, max_y = lonlat_to_tile(max_lon, min_lat, z)
+    return min_x, min_y, max_x, max_y
+
+
+def is_tile_in_bbox(bbox: tuple, z: int, x: int, y: int) -> bool:
+    """Whether the tile ``z/x/y`` intersects ``bbox``."""
+    min_x, min_y, max_x, max_y = tile_range(bbox, z)
+    return min_x <= x <= max_x and min_y <= y <= max_y
+
+
+def has_tile_date(layer: str, forecast_date: datetime) -> bool:
+    """Whether ``forecast_date`` belongs to an ingested run, or is the init date of a run for ``riverine_flood_max``."""
+    if layer == RIVERINE_FLOOD_MAX:
+        return has_init_date(RIVERINE_FLOOD, forecast_date)
+    return has_forecast_date(layer, forecast_date)
+
+
+def render_tile(layer: str, forecast_date: datetime, z: int, x: int, y: int) -> bytes:
+    statement = text(f"SELECT public.{TILE_LAYERS[layer]}(:z, :x, :y, :forecast_date)")
+    parameters = {'z': z, 'x': x, 'y': y, 'forecast_date': forecast_date}
+    tile = db.session.execute(statement, parameters).scalar()
+    return bytes(tile) if tile else b""
+
+
+def write_tile(path: str, tile: bytes):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Write then rename so that concurrent readers never see a partial tile
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(tile)
+    os.replace(tmp_path, path)
+
+
+def get_tile(layer: str, forecast_date: datetime, z: int, x: int, y: int) -> bytes:
+    """
+    Return a tile from the cache, rendering and storing it on a miss.
+
+    Callers check the tile with ``is_tile_in_bbox`` and ``has_tile_date`` first so that only the tiles of
+    ingested dates covering Burkina Faso are stored.
+    """
+    path = get_tile_path(layer, forecast_date, z, x, y)
+    if os.path.exists(path):
+        with open(path, "rb") as f:
+            return f.read()
+
+    tile = render_tile(layer, forecast_date, z, x, y)
+    write_tile(path, tile)
+    return tile
+
+
+def invalidate_tiles(layer: str, forecast_date: datetime = None):
+    """Drop the cached tiles of one forecast date, or of the whole layer if no date is given."""
+    if forecast_date is None:
+        path = os.path.join(get_tile_cache_dir(), layer)
+    else:
+        path = get_forecast_date_dir(layer, forecast_date)
+
+    if os.path.isdir(path):
+        logging.info(f"[TILES][INVALIDATE]: Removing {path}")
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def seed_tiles(layer: str, forecast_dates, max_zoom: int = None):
+    """
+    Pre-render the tiles of ``layer`` covering Burkina Faso for each forecast date.
+
+    Tiling starts at zoom 0 and only descends into the children of non-empty tiles, so areas
+    without any feature are not rendered at every zoom level. Tiles that are not seeded are
+    rendered on demand by ``get_tile``.
+    """
+    max_zoom = SETTINGS.get('TILE_CACHE_MAX_ZOOM') if max_zoom is None else max_zoom
+
+    for forecast_date in sorted(set(forecast_dates)):
+        logging.info(f"[TILES][SEED]: Seeding {layer} for {forecast_date} up to zoom {max_zoom}")
+        invalidate_tiles(layer, forecast_date)
+
+        min_x, min_y, max_x, max_y = tile_range(BURKINA_BBOX, 0)
+        pending = [(0, x, y) for x in range(min_x, max_x + 1) for y in range(min_y, max_y + 1)]
+        rendered = 0
+
+        while pending:
+            z, x, y = pending.pop()
+            tile = render_tile(layer, forecast_date, z, x, y)
+            write_tile(get_tile_path(layer, forecast_date, z, x, y), tile)
+            rendered += 1
+
+            if not tile or z >= max_zoom:
+                continue
+
+            min_x, min_y, max_x, max_y = tile_range(BURKINA_BBOX, z + 1)
+            for child_x in (2 * x, 2 * x + 1):
+                for child_y in (2 * y, 2 * y + 1):
+                    if min_x <= child_x <= max_x and min_y <= child_y <= max_y:
+                        pending.append((z + 1, child_x, child_y))
+
+        logging.info(f"[TILES][SEED]: Rendered {rendered} tiles for {layer} {forecast_date}")
+
+
+def get_latest_forecast_dates(product: str) -> list[datetime]:
+    """Return the forecast dates of the latest run of ``product``."""
+    forecast_run = get_latest_forecast_run(product)
+    return forecast_run.forecast_dates if forecast_run else []
@@ -0,0 +1,68 @@
+from datetime import datetime
+
+from sqlalchemy import text
+
+from dgrehydro import db
+from dgrehydro.config.products import RIVERINE_FLOOD, FLASH_FLOOD
+from dgrehydro.service.serialization import ISO_DATE_FORMAT
+
+
+def get_current_warnings(segment_subids: list[int], municipality_subids: list[int], station_names: list[str],
+                         today: datetime = None) -> dict:
+    """
+    Current values of the given segments, municipalities and stations, read in a single round trip.
+
+    Segments hold the level of today in the latest riverine run and the maximum of the run, municipalities
+    the latest flash flood forecast and stations their latest real-time measurement.
+    """
+    today = (today or datetime.utcnow()).replace(hour=0, minute=0, second=0, microsecond=0)
+    statement = text(f"""
+        WITH riverine_run AS (SELECT init_date
+                              FROM dgre_forecast_run
+                              WHERE product = '{RIVERINE_FLOOD}'
+                              ORDER BY init_date DESC, ingested_at DESC
+                              LIMIT 1),
+             flash_run AS (SELECT init_date AS forecast_date
+                           FROM dgre_forecast_run
+                           WHERE product = '{FLASH_FLOOD}'
+                           ORDER BY init_date DESC, ingested_at DESC
+                           LIMIT 1),
+             segments AS (SELECT r.subid,
+                                 r.levels[extract(day FROM CAST(:today AS timestamp) - date_trunc('day', r.init_date))::integer + 1] AS value,
+                                 r.max_level
+                          FROM dgre_riverine_flood_run r
+                                   JOIN riverine_run USING (init_date)
+                          WHERE r.subid = ANY(CAST(:segment_subids AS integer[]))),
+             municipalities AS (SELECT f.subid, f.adm3_fr, f.value, f.weighted_ffft
+                                FROM dgre_flash_flood f
+                                         JOIN flash_run USING (forecast_date)
+                                WHERE f.subid = ANY(CAST(:municipality_subids AS integer[]))),
+             stations AS (SELECT s.station_name,
+                                 to_char(c.measurement_date, '{ISO_DATE_FORMAT}') AS measurement_date,
+                                 c.water_level,
+                                 c.flow,
+                                 c.water_level_alert
+                          FROM unnest(CAST(:station_names AS text[])) AS s(station_name)
+                                   JOIN LATERAL (SELECT measurement_date, water_level, flow, water_level_alert
+                                                 FROM dgre_critical_point
+                                                 WHERE station_name = s.station_name
+                                                   AND forecast_date = measurement_date
+                                                 ORDER BY measurement_date DESC
+                                                 LIMIT 1) c ON true)
+        SELECT jsonb_build_object(
+                       'riverine_flood', jsonb_build_object(
+                        'init_date', (SELECT to_char(init_date, '{ISO_DATE_FORMAT}') FROM riverine_run),
+                        'segments', (SELECT coalesce(jsonb_agg(t ORDER BY t.subid), '[]'::jsonb) FROM segments t)),
+                       'flash_flood', jsonb_build_object(
+                        'forecast_date', (SELECT to_char(forecast_date, '{ISO_DATE_FORMAT}') FROM flash_run),
+                        'municipalities', (SELECT coalesce(jsonb_agg(t ORDER BY t.subid), '[]'::jsonb) FROM municipalities t)),
+                       'critical_point', jsonb_build_object(
+                        'stations', (SELECT coalesce(jsonb_agg(t ORDER BY t.station_name), '[]'::jsonb) FROM stations t))
+               )""")
+    parameters = {
+        'today': today,
+        'segment_subids': segment_subids,
+        'municipality_subids': municipality_subids,
+        'station_names': station_names,
+    }
+    return db.session.execute(statement, parameters).scalar()
@@ -0,0 +1,96 @@
+"""
+EXPLAIN based regression tests for the route queries.
+
+They run against the local PostGIS started with docker-compose.dev.yml, migrated with `flask db upgrade`,
+and are skipped when it is not reachable. Sequential scans are disabled so that the planner only falls
+back to one when no index can serve the query, whatever the size of the seeded tables.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from dgrehydro import app, db
+from dgrehydro.models.criticalpoint import CriticalPoint
+from dgrehydro.models.flashflood import FlashFlood
+from dgrehydro.models.riverineflood import RiverineFlood
+from dgrehydro.models.riverinefloodrun import RiverineFloodRun
+from dgrehydro.routes.routes_criticalpoint import filter_on_day
+
+
+@pytest.fixture
+def session():
+    with app.app_context():
+        try:
+            db.session.execute(text("SELECT 1"))
+        except OperationalError:
+            pytest.skip("Local PostGIS is not available")
+
+        measurement_date = datetime(2025, 10, 8)
+        for station_name in ["Dan", "Gampela", "Nobere"]:
+            for offset in range(12):
+                db.session.add(CriticalPoint(station_name=station_name,
+                                             measurement_date=measurement_date,
+                                             forecast_date=measurement_date + timedelta(days=offset),
+                                             flow=1.0, water_level=1.0, water_level_alert=0))
+        db.session.flush()
+        db.session.execute(text("ANALYZE dgre_critical_point"))
+        db.session.execute(text("SET LOCAL enable_seqscan = off"))
+
+        yield db.session
+
+        db.session.rollback()
+
+
+def explain(session, query) -> str:
+    compiled = query.statement.compile(dialect=session.bind.dialect)
+    plan = session.connection().exec_driver_sql(f"EXPLAIN {compiled}", compiled.params).scalars().all()
+    return "\n".join(plan)
+
+
+def assert_index_scan(plan: str):
+    assert "Index" in plan, plan
+    assert "Seq Scan" not in plan, plan
+
+
+def test_critical_point_measurement_day(session):
+    query = filter_on_day(CriticalPoint.query, CriticalPoint.measurement_date, "2025-10-08")
+    assert_index_scan(explain(session, query))
+
+
+def test_critical_point_forecast_day(session):
+    query = filter_on_day(CriticalPoint.query, CriticalPoint.forecast_date, "2025-10-10")
+    assert_index_scan(explain(session, query))
+
+
+def test_critical_point_station_forecast(session):
+    query = filter_on_day(CriticalPoint.query.filter(CriticalPoint.station_name == "Dan"),
+                          CriticalPoint.measurement_date, "2025-10-08").order_by(CriticalPoint.forecast_date)
+    assert_index_scan(explain(session, query))
+
+
+def test_critical_point_latest_measurement(session):
+    query = db.session.query(db.func.max(CriticalPoint.measurement_date))
+    assert_index_scan(explain(session, query))
+
+
+def test_riverine_flood_dates(session):
+    query = RiverineFlood.query.filter((RiverineFlood.init_date == "2025-10-08") &
+                                       (RiverineFlood.forecast_date == "2025-10-10"))
+    assert_index_scan(explain(session, query))
+
+
+def test_riverine_flood_latest_init_date(session):
+    query = db.session.query(db.func.max(RiverineFloodRun.init_date))
+    assert_index_scan(explain(session, query))
+
+
+def test_flash_flood_forecast_date(session):
+    query = FlashFlood.query.filter(FlashFlood.forecast_date == "2025-10-08 12:00:00")
+    assert_index_scan(explain(session, query))
+
+
+def test_flash_flood_latest_forecast_date(session):
+    query = db.session.query(db.func.max(FlashFlood.forecast_date))
+    assert_index_scan(explain(session, query))
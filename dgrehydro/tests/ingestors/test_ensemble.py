@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+
+from dgrehydro.ingestors.hype.ensemble import member_files, stack_members, exceedance_probabilities
+
+
+def test_member_files():
+    files = ["r1_forecast_timeCOUT.txt", "r1_forecast_timeCOUT_member10.txt", "r1_hindcast_timeCOUT.txt",
+             "r1_forecast_timeCOUT_member02.txt"]
+    assert member_files(files) == ["r1_forecast_timeCOUT_member02.txt", "r1_forecast_timeCOUT_member10.txt"]
+
+
+def test_stack_members():
+    dates = pd.to_datetime(["2025-05-25", "2025-05-26"])
+    first = pd.DataFrame({"DATE": dates, "1": [1.0, 2.0], "2": [3.0, 4.0]})
+    second = pd.DataFrame({"DATE": dates[:1], "2": [5.0]})
+
+    ensemble = stack_members([first, second], dates, ["1", "2"])
+
+    assert ensemble.dtype == np.float32
+    assert ensemble.shape == (2, 2, 2)
+    np.testing.assert_array_equal(ensemble[1], [[np.nan, 5.0], [np.nan, np.nan]])
+
+
+def test_exceedance_probabilities():
+    # 4 members, 1 day, 3 subbasins
+    ensemble = np.array([[[1, 10, 1]], [[3, 20, np.nan]], [[5, 30, np.nan]], [[np.nan, 40, np.nan]]], dtype=np.float32)
+    # Return levels of 2 return periods per subbasin, none for the last one
+    thresholds = np.array([[2, 15, np.nan], [4, 35, np.nan]], dtype=np.float32)
+
+    probabilities = exceedance_probabilities(ensemble, thresholds)
+
+    assert probabilities.shape == (1, 3, 2)
+    np.testing.assert_allclose(probabilities[0, 0], [2 / 3, 1 / 3])
+    np.testing.assert_allclose(probabilities[0, 1], [0.75, 0.25])
+    assert np.isnan(probabilities[0, 2]).all()
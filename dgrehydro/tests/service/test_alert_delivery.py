@@ -0,0 +1,30 @@
+import json
+from datetime import datetime, timedelta
+
+from dgrehydro.models.alertoutbox import AlertOutbox
+from dgrehydro.service.alert_delivery import FileBackend, format_alert, retry_delay
+
+
+def make_alert():
+    payload = {"message": "dan_red: 1 critical_point item(s) at level 3 or above", "items": [{"id": "Dan", "level": 3}]}
+    return AlertOutbox("dan_red", "critical_point", datetime(2025, 7, 1), payload, ["ops@example.org"])
+
+
+def test_retry_delay():
+    assert retry_delay(1) == timedelta(minutes=1)
+    assert retry_delay(3) == timedelta(minutes=4)
+    assert retry_delay(20) == timedelta(hours=1)
+
+
+def test_format_alert():
+    assert format_alert(make_alert()).splitlines()[-1] == "- Dan: level 3"
+
+
+def test_file_backend(tmp_path):
+    backend = FileBackend(str(tmp_path / "alerts"))
+    backend.send(make_alert())
+    backend.send(make_alert())
+
+    lines = (tmp_path / "alerts" / "alerts.jsonl").read_text().splitlines()
+    assert len(lines) == 2
+    assert json.loads(lines[0])["rule"] == "dan_red"
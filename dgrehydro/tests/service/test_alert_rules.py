@@ -0,0 +1,61 @@
+import json
+
+import pytest
+
+from dgrehydro.service.alert_rules import AlertRule, daily_levels, evaluate_rule, load_alert_rules
+from dgrehydro.service.run_diff import MISSING
+
+
+def test_daily_levels():
+    keys, matrix = daily_levels([2, 1, 2, 1, 2], [0, 0, 1, 1, 1], [1, 0, 3, 2, 2])
+
+    assert keys.tolist() == [1, 2]
+    assert matrix.tolist() == [[0, 2], [1, 3]]
+
+
+def test_daily_levels_missing_days():
+    keys, matrix = daily_levels(["Dan", "Pa"], [0, 2], [1, 3])
+
+    assert matrix.tolist() == [[1, MISSING, MISSING], [MISSING, MISSING, 3]]
+
+
+def test_evaluate_rule_within_days():
+    keys, matrix = daily_levels([1, 1, 2, 2], [0, 4, 0, 2], [0, 3, 1, 3])
+    rule = AlertRule(name="level_3", product="riverine_flood", min_level=3, within_days=3)
+
+    payload = evaluate_rule(rule, keys, matrix)
+
+    assert payload["count"] == 1
+    assert payload["items"] == [{"id": 2, "level": 3}]
+
+
+def test_evaluate_rule_items():
+    keys, matrix = daily_levels(["Dan", "Pa"], [0, 0], [3, 3])
+    rule = AlertRule(name="dan_red", product="critical_point", min_level=3, items=["Dan"])
+
+    assert evaluate_rule(rule, keys, matrix)["items"] == [{"id": "Dan", "level": 3}]
+
+
+def test_evaluate_rule_min_count():
+    keys, matrix = daily_levels(range(6), [0] * 6, [2, 2, 2, 2, 1, 3])
+    rule = AlertRule(name="five", product="flash_flood", min_level=2, min_count=5)
+
+    assert evaluate_rule(rule, keys, matrix)["count"] == 5
+    rule.min_count = 6
+    assert evaluate_rule(rule, keys, matrix) is None
+
+
+def test_load_alert_rules(tmp_path):
+    path = tmp_path / "rules.json"
+    path.write_text(json.dumps([{"name": "dan_red", "product": "critical_point", "min_level": 3, "items": ["Dan"]}]))
+
+    assert load_alert_rules(str(path)) == [AlertRule(name="dan_red", product="critical_point", min_level=3,
+                                                     items=["Dan"])]
+
+
+def test_load_alert_rules_unknown_product(tmp_path):
+    path = tmp_path / "rules.json"
+    path.write_text(json.dumps([{"name": "dust", "product": "dust", "min_level": 1}]))
+
+    with pytest.raises(ValueError):
+        load_alert_rules(str(path))
@@ -0,0 +1,51 @@
+from datetime import datetime
+
+import pytest
+from werkzeug.test import EnvironBuilder
+
+from dgrehydro.service.batch_override import BatchField, parse_batch_row, values_clause, read_batch_rows, \
+    apply_batch_update
+from dgrehydro.utils import parse_datetime
+
+FIELDS = [
+    BatchField("subid", "integer", int),
+    BatchField("forecast_date", "timestamp", parse_datetime),
+    BatchField("value", "integer", int, required=False),
+]
+
+
+def test_parse_batch_row():
+    row = {"subid": "12", "forecast_date": "2025-10-08T06:00:00", "value": ""}
+    assert parse_batch_row(row, FIELDS) == {"subid": 12, "forecast_date": datetime(2025, 10, 8, 6), "value": None}
+
+
+def test_parse_batch_row_missing_required():
+    with pytest.raises(ValueError):
+        parse_batch_row({"forecast_date": "2025-10-08"}, FIELDS)
+
+
+def test_values_clause():
+    rows = [{"subid": 1, "forecast_date": datetime(2025, 10, 8), "value": 2}]
+    clause, parameters = values_clause(rows, FIELDS)
+    assert clause == ("(VALUES (CAST(:subid_0 AS integer), CAST(:forecast_date_0 AS timestamp), "
+                      "CAST(:value_0 AS integer))) AS v(subid, forecast_date, value)")
+    assert parameters == {"subid_0": 1, "forecast_date_0": datetime(2025, 10, 8), "value_0": 2}
+
+
+def test_read_batch_rows_strips_csv_byte_order_mark():
+    body = "\ufeffsubid,forecast_date,value\n200384,2025-05-25,3\n".encode("utf-8")
+    request = EnvironBuilder(method="POST", data=body, content_type="text/csv").get_request()
+    assert read_batch_rows(request) == [{"subid": "200384", "forecast_date": "2025-05-25", "value": "3"}]
+
+
+def test_apply_batch_update_with_update():
+    def update(values, parameters):
+        assert values.startswith("(VALUES ")
+        return {(1, datetime(2025, 10, 8))}
+
+    rows = [{"subid": 1, "forecast_date": "2025-10-08", "value": 2},
+            {"subid": 2, "forecast_date": "2025-10-08", "value": 3},
+            {"subid": 1, "forecast_date": "2025-10-08", "value": 4}]
+    statuses, updated = apply_batch_update("unused", FIELDS[:2], FIELDS[2:], "", rows, update=update)
+    assert [status["status"] for status in statuses] == ["updated", "not_found", "invalid"]
+    assert updated == [{"subid": 1, "forecast_date": datetime(2025, 10, 8), "value": 2}]
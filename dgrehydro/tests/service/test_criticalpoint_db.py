@@ -0,0 +1,18 @@
+from collections import namedtuple
+from datetime import datetime
+
+import pytest
+
+from dgrehydro.service.criticalpoint_db import decode_cursor, encode_cursor
+
+Row = namedtuple("Row", ["measurement_date", "station_name", "forecast_date"])
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor(Row("2025-10-31T06:00:00", "Dan", "2025-11-01T06:00:00"))
+    assert decode_cursor(cursor) == (datetime(2025, 10, 31, 6), "Dan", datetime(2025, 11, 1, 6))
+
+
+def test_decode_invalid_cursor():
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
@@ -0,0 +1,27 @@
+import numpy as np
+
+from dgrehydro.service.downsampling import lttb, minmax
+
+
+def test_lttb_keeps_ends_and_peak():
+    x = np.arange(100)
+    y = np.zeros(100)
+    y[42] = 10
+    indices = lttb(x, y, 10)
+    assert len(indices) == 10
+    assert indices[0] == 0 and indices[-1] == 99
+    assert 42 in indices
+    assert np.all(np.diff(indices) > 0)
+
+
+def test_lttb_below_threshold():
+    assert list(lttb(np.arange(5), np.arange(5), 10)) == [0, 1, 2, 3, 4]
+
+
+def test_minmax():
+    x = np.arange(6)
+    values = np.array([1.0, 5.0, 2.0, 0.0, 3.0, 4.0])
+    starts, mins, maxs = minmax(x, values, values, 2)
+    assert list(starts) == [0, 3]
+    assert list(mins) == [1.0, 0.0]
+    assert list(maxs) == [5.0, 4.0]
@@ -0,0 +1,31 @@
+import gzip
+
+from werkzeug.datastructures import Accept
+
+from dgrehydro.models.geojsoncache import GeoJsonCache
+from dgrehydro.service.geojson_cache import encode_cached_geojson
+
+BODY = b'{"features":[],"type":"FeatureCollection"}'
+
+
+def get_entry(with_brotli):
+    return GeoJsonCache("flash_flood", None, None, gzip.compress(BODY), b"br-body" if with_brotli else None)
+
+
+def test_encode_cached_geojson_prefers_brotli():
+    assert encode_cached_geojson(get_entry(True), Accept([("gzip", 1), ("br", 1)])) == (b"br-body", "br")
+
+
+def test_encode_cached_geojson_gzip():
+    body, content_encoding = encode_cached_geojson(get_entry(False), Accept([("gzip", 1), ("br", 1)]))
+    assert content_encoding == "gzip"
+    assert gzip.decompress(body) == BODY
+
+
+def test_encode_cached_geojson_identity():
+    assert encode_cached_geojson(get_entry(True), Accept()) == (BODY, None)
+
+
+def test_encode_cached_geojson_ignores_refused_encodings():
+    body, content_encoding = encode_cached_geojson(get_entry(True), Accept([("gzip", 1), ("br", 0)]))
+    assert content_encoding == "gzip"
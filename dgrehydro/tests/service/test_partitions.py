@@ -0,0 +1,17 @@
+from datetime import datetime
+
+from dgrehydro.service.partitions import add_months, get_partition_name, month_start
+
+
+def test_month_start():
+    assert month_start(datetime(2025, 10, 8, 12)) == datetime(2025, 10, 1)
+
+
+def test_add_months():
+    assert add_months(datetime(2025, 11, 1), 1) == datetime(2025, 12, 1)
+    assert add_months(datetime(2025, 12, 1), 1) == datetime(2026, 1, 1)
+    assert add_months(datetime(2026, 2, 1), -13) == datetime(2025, 1, 1)
+
+
+def test_get_partition_name():
+    assert get_partition_name("dgre_flash_flood", datetime(2025, 10, 1)) == "dgre_flash_flood_p202510"
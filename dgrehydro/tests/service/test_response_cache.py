@@ -0,0 +1,63 @@
+import os
+import time
+from datetime import date, datetime, timezone
+
+from werkzeug.datastructures import MultiDict
+
+from dgrehydro.models.dataversion import DataVersion
+from dgrehydro.service.response_cache import CachedResponse, MemoryCache, FileCache, make_cache_key, get_last_modified
+
+
+def get_entry(size):
+    return CachedResponse(b"x" * size, 200, "application/json")
+
+
+def test_memory_cache_evicts_least_recently_used():
+    cache = MemoryCache(max_entries=2, max_bytes=1024)
+    cache.set("a", get_entry(1))
+    cache.set("b", get_entry(1))
+    cache.get("a")
+    cache.set("c", get_entry(1))
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+
+
+def test_memory_cache_is_bounded_in_size():
+    cache = MemoryCache(max_entries=10, max_bytes=10)
+    cache.set("a", get_entry(6))
+    cache.set("b", get_entry(6))
+    assert cache.get("a") is None
+    assert cache.size == 6
+    cache.set("c", get_entry(11))
+    assert cache.get("c") is None
+
+
+def test_file_cache_expires_old_entries(tmp_path):
+    cache = FileCache(str(tmp_path), max_age=60)
+    cache.set("ab12", CachedResponse(b'{"a": 1}\n', 200, "application/json"))
+    assert cache.get("ab12") == CachedResponse(b'{"a": 1}\n', 200, "application/json")
+
+    old = time.time() - 120
+    os.utime(cache.get_path("ab12"), (old, old))
+    assert cache.get("ab12") is None
+    assert cache.prune() == 1
+    assert not os.path.exists(cache.get_path("ab12"))
+
+
+def test_make_cache_key_ignores_parameter_order():
+    versions = {"flash_flood": 3}
+    key = make_cache_key("/api/v1/flashfloods", MultiDict([("a", "1"), ("b", "2")]), versions)
+    assert key == make_cache_key("/api/v1/flashfloods", MultiDict([("b", "2"), ("a", "1")]), versions)
+    assert key != make_cache_key("/api/v1/flashfloods", MultiDict([("a", "1"), ("b", "2")]), {"flash_flood": 4})
+
+
+def test_get_last_modified():
+    first, second = DataVersion("flash_flood", 1), DataVersion("riverine_flood", 2)
+    first.updated_at = datetime(2025, 10, 8, 6, 0, 0, 250000)
+    second.updated_at = datetime(2025, 10, 8, 12, 30, 0, 750000)
+    today = date(2025, 10, 8)
+    assert get_last_modified([first, second], today) == datetime(2025, 10, 8, 12, 30, tzinfo=timezone.utc)
+    # Responses defaulting to today are modified at midnight
+    assert get_last_modified([first, second], date(2025, 10, 9)) == datetime(2025, 10, 9, tzinfo=timezone.utc)
+    assert get_last_modified([], today) == datetime(2025, 10, 8, tzinfo=timezone.utc)
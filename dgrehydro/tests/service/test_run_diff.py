@@ -0,0 +1,44 @@
+import numpy as np
+
+from dgrehydro.service.run_diff import MISSING, NEW_ALERT, UPGRADED, DOWNGRADED, common_window_max, diff_levels, \
+    level_matrix
+
+
+def test_diff_levels():
+    keys = np.array([1, 2, 3, 4, 5])
+    levels = np.array([1, 0, 3, 2, 1], dtype=np.int16)
+    previous_keys = np.array([5, 4, 3, 2, 1])
+    previous_levels = np.array([1, 0, 2, 1, 0], dtype=np.int16)
+
+    assert diff_levels(keys, levels, previous_keys, previous_levels) == [
+        (4, 0, 2, NEW_ALERT),
+        (1, 0, 1, UPGRADED),
+        (3, 2, 3, UPGRADED),
+        (2, 1, 0, DOWNGRADED),
+    ]
+
+
+def test_diff_levels_new_items():
+    keys = np.array(["Dan", "Pa"], dtype=object)
+    levels = np.array([3, 1], dtype=np.int16)
+
+    assert diff_levels(keys, levels, np.array([], dtype=object), np.array([], dtype=np.int16)) == [
+        ("Dan", None, 3, NEW_ALERT),
+    ]
+
+
+def test_common_window_max():
+    levels = level_matrix([[0, 2, 1], [1, 0]])
+    previous_levels = level_matrix([[3, 0, 1, 0], [2, 2, 0, 0]])
+
+    current, previous = common_window_max(levels, previous_levels, offset=1)
+
+    assert current.tolist() == [2, 1]
+    assert previous.tolist() == [1, 2]
+
+
+def test_common_window_max_without_overlap():
+    current, previous = common_window_max(level_matrix([[1]]), level_matrix([[2]]), offset=3)
+
+    assert current.tolist() == [MISSING]
+    assert previous.tolist() == [MISSING]
@@ -0,0 +1,41 @@
+import shapely
+
+from dgrehydro.service.spatial_index import SpatialIndex
+
+
+def make_index(tolerance=0):
+    geometries = [
+        shapely.box(-1.0, 12.0, -0.5, 12.5),
+        shapely.box(-0.5, 12.0, 0.0, 12.5),
+        shapely.linestrings([(-2.0, 11.0), (-2.0, 11.5)]),
+    ]
+    return SpatialIndex([10, 20, 30], geometries, tolerance)
+
+
+def test_query_point_inside():
+    assert make_index().query(-0.75, 12.25) == [10]
+
+
+def test_query_point_outside():
+    assert make_index().query(1.0, 12.25) == []
+
+
+def test_query_radius_in_meters():
+    index = make_index()
+    # About 1.09 km east of the line at this latitude
+    assert index.query(-1.99, 11.25, radius=500) == []
+    assert index.query(-1.99, 11.25, radius=1500) == [30]
+
+
+def test_query_radius_across_boundary():
+    assert make_index().query(-0.51, 12.25, radius=2000) == [10, 20]
+
+
+def test_query_line_without_radius():
+    # About 55 m east of the line, a click never lands exactly on it
+    assert make_index().query(-1.9995, 11.25) == []
+    assert make_index(tolerance=100).query(-1.9995, 11.25) == [30]
+
+
+def test_query_tolerance_keeps_polygons():
+    assert make_index(tolerance=100).query(-0.75, 12.25) == [10]
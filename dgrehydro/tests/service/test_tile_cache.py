@@ -0,0 +1,19 @@
+from dgrehydro.service.tile_cache import BURKINA_BBOX, lonlat_to_tile, tile_range, is_tile_in_bbox
+
+
+def test_lonlat_to_tile():
+    assert lonlat_to_tile(0.0, 0.0, 0) == (0, 0)
+    assert lonlat_to_tile(0.0, 0.0, 1) == (1, 1)
+    assert lonlat_to_tile(-1.52, 12.37, 12) == (2030, 1906)
+
+
+def test_tile_range_covers_burkina():
+    min_x, min_y, max_x, max_y = tile_range(BURKINA_BBOX, 12)
+    assert min_x < max_x
+    assert min_y < max_y
+    assert tile_range(BURKINA_BBOX, 0) == (0, 0, 0, 0)
+
+
+def test_is_tile_in_bbox():
+    assert is_tile_in_bbox(BURKINA_BBOX, 12, 2030, 1906)
+    assert not is_tile_in_bbox(BURKINA_BBOX, 12, 0, 0)
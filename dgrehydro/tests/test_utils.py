@@ -0,0 +1,21 @@
+from datetime import datetime
+
+import pytest
+
+from dgrehydro.utils import parse_bbox, parse_datetime
+
+
+def test_parse_bbox():
+    assert parse_bbox("-1.5,12.1,-1.2,12.5") == (-1.5, 12.1, -1.2, 12.5)
+
+
+@pytest.mark.parametrize("value", ["-1.5,12.1,-1.2", "a,b,c,d", "-1.2,12.1,-1.5,12.5"])
+def test_parse_bbox_invalid(value):
+    with pytest.raises(ValueError):
+        parse_bbox(value)
+
+
+def test_parse_datetime():
+    assert parse_datetime("2025-10-08") == datetime(2025, 10, 8)
+    assert parse_datetime("2025-10-08T12:00:00.000Z") == datetime(2025, 10, 8, 12)
+    assert parse_datetime("2025-10-08T13:00:00+01:00") == datetime(2025, 10, 8, 12)
@@ -1,4 +1,6 @@
+import hashlib
 import re
+from datetime import datetime, timedelta
 
 import pandas as pd
 import requests
@@ -7,6 +9,9 @@ from dgrehydro.errors import WarningsNotFound, WarningsRequestError
 
 date_pattern = re.compile(r"\d{4}-\d{2}-\d{2}")
 
+# Default range in days of the series endpoints
+SERIES_DAYS = 30
+
 
 def get_dates_from_dataframe(data_frame: pd.DataFrame):
     date_cols = [col for col in data_frame.columns if date_pattern.match(col)]
@@ -24,3 +29,38 @@ def get_json_warnings(url):
             raise WarningsRequestError(f"Error fetching warnings for {url}")
 
 
+def parse_datetime(value: str) -> datetime:
+    """Parse an ISO 8601 date or timestamp into a naive UTC datetime, as stored in the database."""
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is not None:
+        parsed = parsed.replace(tzinfo=None) - parsed.utcoffset()
+    return parsed
+
+
+def parse_bbox(value: str) -> tuple[float, float, float, float]:
+    """Parse a ``minx,miny,maxx,maxy`` bounding box expressed in EPSG:4326."""
+    parts = value.split(",")
+    if len(parts) != 4:
+        raise ValueError(f"Invalid bbox {value}, expected minx,miny,maxx,maxy")
+
+    min_x, min_y, max_x, max_y = (float(part) for part in parts)
+    if min_x > max_x or min_y > max_y:
+        raise ValueError(f"Invalid bbox {value}, min values must be lower than max values")
+
+    return min_x, min_y, max_x, max_y
+
+
+def day_range(value: str) -> tuple[datetime, datetime]:
+    """Return the half-open [start, end) timestamp range covering the day of ``value``."""
+    start = parse_datetime(value).replace(hour=0, minute=0, second=0, microsecond=0)
+    return start, start + timedelta(days=1)
+
+
+def files_sha256(paths) -> str:
+    """Return the SHA-256 hex digest of the content of ``paths``, in the given order."""
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+    return digest.hexdigest()
@@ -0,0 +1,43 @@
+"""Add alert outbox
+
+Revision ID: add_alert_outbox
+Revises: add_run_change
+Create Date: 2026-10-19 21:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = 'add_alert_outbox'
+down_revision = 'add_run_change'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'dgre_alert_outbox',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('rule', sa.String(length=256), nullable=False),
+        sa.Column('product', sa.String(length=64), nullable=False),
+        sa.Column('init_date', sa.DateTime(), nullable=False),
+        sa.Column('payload', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('recipients', postgresql.ARRAY(sa.String()), nullable=False),
+        sa.Column('status', sa.String(length=16), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('next_attempt_at', sa.DateTime(), nullable=False),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.text("timezone('utc', now())"), nullable=False),
+        sa.Column('sent_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_alert_outbox_status_next_attempt', 'dgre_alert_outbox', ['status', 'next_attempt_at'])
+    op.create_index('idx_alert_outbox_product_init_date', 'dgre_alert_outbox', ['product', 'init_date'])
+
+
+def downgrade():
+    op.drop_index('idx_alert_outbox_product_init_date', table_name='dgre_alert_outbox')
+    op.drop_index('idx_alert_outbox_status_next_attempt', table_name='dgre_alert_outbox')
+    op.drop_table('dgre_alert_outbox')
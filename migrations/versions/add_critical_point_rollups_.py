@@ -0,0 +1,54 @@
+"""Add hourly and daily critical point rollups
+
+Revision ID: add_critical_point_rollups
+Revises: add_data_version
+Create Date: 2026-10-19 17:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_critical_point_rollups'
+down_revision = 'add_data_version'
+branch_labels = None
+depends_on = None
+
+ROLLUPS = {
+    'dgre_critical_point_hourly': 'hour',
+    'dgre_critical_point_daily': 'day',
+}
+
+
+def upgrade():
+    for table, unit in ROLLUPS.items():
+        op.create_table(
+            table,
+            sa.Column('station_name', sa.String(), nullable=False),
+            sa.Column('bucket', sa.DateTime(), nullable=False),
+            sa.Column('count', sa.Integer(), nullable=False),
+            sa.Column('water_level_min', sa.Float(), nullable=True),
+            sa.Column('water_level_max', sa.Float(), nullable=True),
+            sa.Column('water_level_avg', sa.Float(), nullable=True),
+            sa.Column('flow_min', sa.Float(), nullable=True),
+            sa.Column('flow_max', sa.Float(), nullable=True),
+            sa.Column('flow_avg', sa.Float(), nullable=True),
+            sa.PrimaryKeyConstraint('station_name', 'bucket'),
+        )
+
+        # Roll up the measurements ingested so far
+        op.execute(f"""
+            INSERT INTO {table} (station_name, bucket, count, water_level_min, water_level_max, water_level_avg,
+                                 flow_min, flow_max, flow_avg)
+            SELECT station_name, date_trunc('{unit}', measurement_date), COUNT(*),
+                   MIN(water_level), MAX(water_level), AVG(water_level),
+                   MIN(flow), MAX(flow), AVG(flow)
+            FROM dgre_critical_point
+            WHERE measurement_date = forecast_date
+            GROUP BY 1, 2
+        """)
+
+
+def downgrade():
+    for table in ROLLUPS:
+        op.drop_table(table)
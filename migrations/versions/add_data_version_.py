@@ -0,0 +1,29 @@
+"""Add per product data versions
+
+Revision ID: add_data_version
+Revises: add_geojson_cache
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_data_version'
+down_revision = 'add_geojson_cache'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'dgre_data_version',
+        sa.Column('product', sa.String(length=64), nullable=False),
+        sa.Column('version', sa.BigInteger(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('product'),
+    )
+
+
+def downgrade():
+    op.drop_table('dgre_data_version')
@@ -0,0 +1,30 @@
+"""Add ensemble exceedance probabilities to riverine flood runs
+
+Revision ID: add_ensemble_exceedance
+Revises: add_alert_outbox
+Create Date: 2026-10-19 22:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = 'add_ensemble_exceedance'
+down_revision = 'add_alert_outbox'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('dgre_riverine_flood_run', sa.Column('ensemble_members', sa.SmallInteger(), nullable=True))
+    op.add_column('dgre_riverine_flood_run',
+                  sa.Column('return_periods', postgresql.ARRAY(sa.SmallInteger()), nullable=True))
+    op.add_column('dgre_riverine_flood_run',
+                  sa.Column('exceedance', postgresql.ARRAY(sa.REAL(), dimensions=2), nullable=True))
+
+
+def downgrade():
+    op.drop_column('dgre_riverine_flood_run', 'exceedance')
+    op.drop_column('dgre_riverine_flood_run', 'return_periods')
+    op.drop_column('dgre_riverine_flood_run', 'ensemble_members')
@@ -0,0 +1,63 @@
+"""Add daily flash flood rollups by municipality, province and region
+
+Revision ID: add_flash_flood_daily
+Revises: add_critical_point_rollups
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_flash_flood_daily'
+down_revision = 'add_critical_point_rollups'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'dgre_flash_flood_daily',
+        sa.Column('level', sa.String(), nullable=False),
+        sa.Column('area_id', sa.String(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('max_value', sa.Integer(), nullable=False),
+        sa.Column('mean_weighted_ffft', sa.Float(), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('level', 'area_id', 'day'),
+    )
+    op.create_index('idx_flash_flood_daily_level_day', 'dgre_flash_flood_daily', ['level', 'day'])
+
+    # Roll up the forecasts ingested so far
+    op.execute("""
+        WITH areas AS (SELECT m.subid, m.adm3_fr, m.adm2_fr, r.gid AS region_gid, r.name AS region_name
+                       FROM dgre_municipality m
+                                LEFT JOIN LATERAL (SELECT gid, name
+                                                   FROM dgre_geo_region
+                                                   WHERE ST_Intersects(geom, ST_PointOnSurface(m.geom))
+                                                   LIMIT 1) r ON true),
+             rollups AS (SELECT CASE
+                                    WHEN GROUPING(a.subid) = 0 THEN 'municipality'
+                                    WHEN GROUPING(a.adm2_fr) = 0 THEN 'province'
+                                    ELSE 'region' END                          AS level,
+                                COALESCE(a.subid::text, a.adm2_fr, a.region_gid)    AS area_id,
+                                f.forecast_date::date                             AS day,
+                                COALESCE(a.adm3_fr, a.adm2_fr, a.region_name)      AS name,
+                                MAX(f.value)                                      AS max_value,
+                                AVG(f.weighted_ffft)                              AS mean_weighted_ffft,
+                                COUNT(*)                                          AS count
+                         FROM dgre_flash_flood f
+                                  JOIN areas a ON a.subid = f.subid
+                         GROUP BY f.forecast_date::date,
+                                  GROUPING SETS ((a.subid, a.adm3_fr), (a.adm2_fr), (a.region_gid, a.region_name)))
+        INSERT INTO dgre_flash_flood_daily (level, area_id, day, name, max_value, mean_weighted_ffft, count)
+        SELECT level, area_id, day, name, max_value, mean_weighted_ffft, count
+        FROM rollups
+        WHERE area_id IS NOT NULL
+    """)
+
+
+def downgrade():
+    op.drop_index('idx_flash_flood_daily_level_day', table_name='dgre_flash_flood_daily')
+    op.drop_table('dgre_flash_flood_daily')
@@ -0,0 +1,44 @@
+"""Add composite indexes matching the forecast routes access patterns
+
+Revision ID: add_forecast_indexes
+Revises: add_spatial_indexes
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_forecast_indexes'
+down_revision = 'add_spatial_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # The unique constraints lead with subid, they cannot serve the per-date lookups of the routes,
+    # the latest init date lookups nor the pg_tileserv functions
+    with op.batch_alter_table('dgre_riverine_flood', schema=None) as batch_op:
+        batch_op.create_index('idx_riverine_flood_init_forecast_date', ['init_date', 'forecast_date'], unique=False)
+
+    with op.batch_alter_table('dgre_flash_flood', schema=None) as batch_op:
+        batch_op.create_index('idx_flash_flood_forecast_date', ['forecast_date'], unique=False)
+
+    # Matches the ordering of /criticalpoint and the lookups on the latest measurement date,
+    # supersedes the single column index on measurement_date
+    with op.batch_alter_table('dgre_critical_point', schema=None) as batch_op:
+        batch_op.drop_index('idx_critical_point_measurement_date')
+        batch_op.create_index('idx_critical_point_measurement_station_forecast',
+                              [sa.text('measurement_date DESC'), 'station_name', 'forecast_date'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('dgre_critical_point', schema=None) as batch_op:
+        batch_op.drop_index('idx_critical_point_measurement_station_forecast')
+        batch_op.create_index('idx_critical_point_measurement_date', ['measurement_date'], unique=False)
+
+    with op.batch_alter_table('dgre_flash_flood', schema=None) as batch_op:
+        batch_op.drop_index('idx_flash_flood_forecast_date')
+
+    with op.batch_alter_table('dgre_riverine_flood', schema=None) as batch_op:
+        batch_op.drop_index('idx_riverine_flood_init_forecast_date')
@@ -0,0 +1,62 @@
+"""Add forecast run registry
+
+Revision ID: add_forecast_run
+Revises: add_forecast_indexes
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = 'add_forecast_run'
+down_revision = 'add_forecast_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'dgre_forecast_run',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('product', sa.String(length=64), nullable=False),
+        sa.Column('init_date', sa.DateTime(), nullable=False),
+        sa.Column('forecast_dates', postgresql.ARRAY(sa.DateTime()), nullable=False),
+        sa.Column('row_count', sa.Integer(), nullable=False),
+        sa.Column('duration', sa.Float(), nullable=True),
+        sa.Column('source_hash', sa.String(length=64), nullable=True),
+        sa.Column('ingested_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+
+    with op.batch_alter_table('dgre_forecast_run', schema=None) as batch_op:
+        batch_op.create_index('idx_forecast_run_product_init_date',
+                              ['product', sa.text('init_date DESC'), sa.text('ingested_at DESC')], unique=False)
+
+    # Register the runs ingested before the registry existed
+    op.execute("""
+        INSERT INTO dgre_forecast_run (product, init_date, forecast_dates, row_count)
+        SELECT 'riverine_flood', init_date, array_agg(DISTINCT forecast_date ORDER BY forecast_date), count(*)
+        FROM dgre_riverine_flood
+        GROUP BY init_date
+    """)
+    op.execute("""
+        INSERT INTO dgre_forecast_run (product, init_date, forecast_dates, row_count)
+        SELECT 'flash_flood', forecast_date, ARRAY[forecast_date], count(*)
+        FROM dgre_flash_flood
+        GROUP BY forecast_date
+    """)
+    op.execute("""
+        INSERT INTO dgre_forecast_run (product, init_date, forecast_dates, row_count)
+        SELECT 'critical_point', measurement_date, array_agg(DISTINCT forecast_date ORDER BY forecast_date), count(*)
+        FROM dgre_critical_point
+        GROUP BY measurement_date
+    """)
+
+
+def downgrade():
+    with op.batch_alter_table('dgre_forecast_run', schema=None) as batch_op:
+        batch_op.drop_index('idx_forecast_run_product_init_date')
+
+    op.drop_table('dgre_forecast_run')
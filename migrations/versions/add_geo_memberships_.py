@@ -0,0 +1,106 @@
+"""Add segment, municipality, region and station membership lookup tables
+
+Revision ID: add_geo_memberships
+Revises: add_flash_flood_daily
+Create Date: 2026-10-19 19:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_geo_memberships'
+down_revision = 'add_flash_flood_daily'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'dgre_segment_municipality',
+        sa.Column('segment_subid', sa.Integer(), nullable=False),
+        sa.Column('municipality_subid', sa.Integer(), nullable=False),
+        sa.Column('weight', sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(['segment_subid'], ['dgre_river_segment.subid'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['municipality_subid'], ['dgre_municipality.subid'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('segment_subid', 'municipality_subid'),
+    )
+    op.create_index('idx_segment_municipality_municipality', 'dgre_segment_municipality', ['municipality_subid'])
+
+    op.create_table(
+        'dgre_municipality_region',
+        sa.Column('municipality_subid', sa.Integer(), nullable=False),
+        sa.Column('region_gid', sa.String(length=256), nullable=False),
+        sa.Column('weight', sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(['municipality_subid'], ['dgre_municipality.subid'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['region_gid'], ['dgre_geo_region.gid'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('municipality_subid', 'region_gid'),
+    )
+    op.create_index('idx_municipality_region_region', 'dgre_municipality_region', ['region_gid'])
+
+    op.create_table(
+        'dgre_station_municipality',
+        sa.Column('station_name', sa.String(length=256), nullable=False),
+        sa.Column('municipality_subid', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['station_name'], ['dgre_poi_station.station_name'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['municipality_subid'], ['dgre_municipality.subid'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('station_name'),
+    )
+    op.create_index(op.f('ix_dgre_station_municipality_municipality_subid'), 'dgre_station_municipality',
+                    ['municipality_subid'])
+
+    # Memberships of the geometries loaded so far, load_geometries recomputes them afterwards
+    op.execute("""
+        INSERT INTO dgre_segment_municipality (segment_subid, municipality_subid, weight)
+        SELECT segment_subid, municipality_subid, weight
+        FROM (SELECT s.subid AS segment_subid,
+                     m.subid AS municipality_subid,
+                     ST_Length(ST_CollectionExtract(ST_Intersection(s.geom, m.geom), 2)::geography)
+                         / NULLIF(ST_Length(s.geom::geography), 0) AS weight
+              FROM dgre_river_segment s
+                       JOIN dgre_municipality m ON ST_Intersects(s.geom, m.geom)) t
+        WHERE weight > 0
+    """)
+    op.execute("""
+        INSERT INTO dgre_municipality_region (municipality_subid, region_gid, weight)
+        SELECT municipality_subid, region_gid, weight
+        FROM (SELECT m.subid AS municipality_subid,
+                     r.gid AS region_gid,
+                     ST_Area(ST_CollectionExtract(ST_Intersection(ST_MakeValid(m.geom), ST_MakeValid(r.geom)), 3)::geography)
+                         / NULLIF(ST_Area(m.geom::geography), 0) AS weight
+              FROM dgre_municipality m
+                       JOIN dgre_geo_region r ON ST_Intersects(m.geom, r.geom)) t
+        WHERE weight > 0
+    """)
+    op.execute("""
+        INSERT INTO dgre_station_municipality (station_name, municipality_subid)
+        SELECT DISTINCT ON (p.station_name) p.station_name, m.subid
+        FROM dgre_poi_station p
+                 JOIN dgre_municipality m ON ST_Intersects(m.geom, p.geom)
+        ORDER BY p.station_name, m.subid
+    """)
+
+    # Regional rollups were computed with the region of the point on surface of each municipality, recompute them
+    # with the region covering most of its area like refresh_flash_flood_daily
+    op.execute("DELETE FROM dgre_flash_flood_daily WHERE level = 'region'")
+    op.execute("""
+        INSERT INTO dgre_flash_flood_daily (level, area_id, day, name, max_value, mean_weighted_ffft, count)
+        SELECT 'region', r.gid, f.forecast_date::date, r.name, MAX(f.value), AVG(f.weighted_ffft), COUNT(*)
+        FROM dgre_flash_flood f
+                 JOIN LATERAL (SELECT region_gid
+                               FROM dgre_municipality_region
+                               WHERE municipality_subid = f.subid
+                               ORDER BY weight DESC
+                               LIMIT 1) mr ON true
+                 JOIN dgre_geo_region r ON r.gid = mr.region_gid
+        GROUP BY r.gid, r.name, f.forecast_date::date
+    """)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_dgre_station_municipality_municipality_subid'), table_name='dgre_station_municipality')
+    op.drop_table('dgre_station_municipality')
+    op.drop_index('idx_municipality_region_region', table_name='dgre_municipality_region')
+    op.drop_table('dgre_municipality_region')
+    op.drop_index('idx_segment_municipality_municipality', table_name='dgre_segment_municipality')
+    op.drop_table('dgre_segment_municipality')
@@ -0,0 +1,33 @@
+"""Add the precompressed GeoJSON cache
+
+Revision ID: add_geojson_cache
+Revises: add_hindcast_discharge
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_geojson_cache'
+down_revision = 'add_hindcast_discharge'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'dgre_geojson_cache',
+        sa.Column('product', sa.String(length=64), nullable=False),
+        sa.Column('init_date', sa.DateTime(), nullable=False),
+        sa.Column('forecast_date', sa.DateTime(), nullable=False),
+        sa.Column('etag', sa.String(length=64), nullable=False),
+        sa.Column('gzip', sa.LargeBinary(), nullable=False),
+        sa.Column('brotli', sa.LargeBinary(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('product', 'init_date', 'forecast_date'),
+    )
+
+
+def downgrade():
+    op.drop_table('dgre_geojson_cache')
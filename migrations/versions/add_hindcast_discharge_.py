@@ -0,0 +1,28 @@
+"""Store hindcast discharge in riverine flood runs
+
+Revision ID: add_hindcast_discharge
+Revises: add_riverine_flood_run
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = 'add_hindcast_discharge'
+down_revision = 'add_riverine_flood_run'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('dgre_riverine_flood_run', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('hindcast_start', sa.DateTime(), nullable=True))
+        batch_op.add_column(sa.Column('hindcast_discharge', postgresql.ARRAY(postgresql.REAL()), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('dgre_riverine_flood_run', schema=None) as batch_op:
+        batch_op.drop_column('hindcast_discharge')
+        batch_op.drop_column('hindcast_start')
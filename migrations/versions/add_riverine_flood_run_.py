@@ -0,0 +1,83 @@
+"""Add array-packed riverine flood runs and use integer subids for river segments
+
+Revision ID: add_riverine_flood_run
+Revises: partition_forecast_tables
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = 'add_riverine_flood_run'
+down_revision = 'partition_forecast_tables'
+branch_labels = None
+depends_on = None
+
+
+def alter_subid_type(type_name):
+    op.execute("ALTER TABLE dgre_riverine_flood DROP CONSTRAINT dgre_riverine_flood_subid_fkey")
+    op.execute(f"ALTER TABLE dgre_river_segment ALTER COLUMN subid TYPE {type_name} USING subid::{type_name}")
+    op.execute(f"ALTER TABLE dgre_riverine_flood ALTER COLUMN subid TYPE {type_name} USING subid::{type_name}")
+    op.execute("""ALTER TABLE dgre_riverine_flood ADD CONSTRAINT dgre_riverine_flood_subid_fkey
+                  FOREIGN KEY (subid) REFERENCES dgre_river_segment (subid) ON DELETE CASCADE""")
+
+
+def upgrade():
+    # HYPE subids are integers, as declared by the RiverSegment model
+    alter_subid_type('integer')
+
+    op.create_table(
+        'dgre_riverine_flood_run',
+        sa.Column('subid', sa.Integer(), nullable=False),
+        sa.Column('init_date', sa.DateTime(), nullable=False),
+        sa.Column('fid', sa.Integer(), nullable=False),
+        sa.Column('init_levels', postgresql.ARRAY(sa.SmallInteger()), nullable=False),
+        sa.Column('levels', postgresql.ARRAY(sa.SmallInteger()), nullable=False),
+        sa.Column('discharge', postgresql.ARRAY(postgresql.REAL()), nullable=True),
+        sa.Column('max_level', sa.SmallInteger(), nullable=False),
+        sa.PrimaryKeyConstraint('subid', 'init_date'),
+        sa.ForeignKeyConstraint(['subid'], ['dgre_river_segment.subid'], ondelete='CASCADE'),
+    )
+
+    with op.batch_alter_table('dgre_riverine_flood_run', schema=None) as batch_op:
+        batch_op.create_index('idx_riverine_flood_run_init_date', ['init_date'], unique=False)
+
+    # Pack the runs ingested so far, their discharge was not stored
+    op.execute("""
+        INSERT INTO dgre_riverine_flood_run (subid, init_date, fid, init_levels, levels, max_level)
+        SELECT subid,
+               init_date,
+               MIN(fid),
+               array_agg(init_value ORDER BY forecast_date)::smallint[],
+               array_agg(value ORDER BY forecast_date)::smallint[],
+               MAX(value)
+        FROM dgre_riverine_flood
+        GROUP BY subid, init_date
+    """)
+
+    # One row per subbasin and forecast day, same shape as dgre_riverine_flood
+    op.execute("""
+        CREATE VIEW dgre_riverine_flood_run_day AS
+        SELECT r.fid,
+               r.subid,
+               r.init_date,
+               r.init_date + (d.day - 1) * interval '1 day' AS forecast_date,
+               r.init_levels[d.day]::integer                AS init_value,
+               r.levels[d.day]::integer                     AS value,
+               r.discharge[d.day]                           AS discharge
+        FROM dgre_riverine_flood_run r
+                 CROSS JOIN LATERAL generate_subscripts(r.levels, 1) AS d(day)
+    """)
+
+
+def downgrade():
+    op.execute("DROP VIEW dgre_riverine_flood_run_day")
+
+    with op.batch_alter_table('dgre_riverine_flood_run', schema=None) as batch_op:
+        batch_op.drop_index('idx_riverine_flood_run_init_date')
+
+    op.drop_table('dgre_riverine_flood_run')
+
+    alter_subid_type('varchar')
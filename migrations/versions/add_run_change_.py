@@ -0,0 +1,36 @@
+"""Add warning level changes between consecutive runs
+
+Revision ID: add_run_change
+Revises: add_geo_memberships
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_run_change'
+down_revision = 'add_geo_memberships'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'dgre_run_change',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('product', sa.String(length=64), nullable=False),
+        sa.Column('init_date', sa.DateTime(), nullable=False),
+        sa.Column('previous_init_date', sa.DateTime(), nullable=False),
+        sa.Column('item_id', sa.String(), nullable=False),
+        sa.Column('previous_level', sa.SmallInteger(), nullable=True),
+        sa.Column('level', sa.SmallInteger(), nullable=False),
+        sa.Column('change', sa.String(length=16), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_run_change_product_init_date', 'dgre_run_change', ['product', 'init_date'])
+
+
+def downgrade():
+    op.drop_index('idx_run_change_product_init_date', table_name='dgre_run_change')
+    op.drop_table('dgre_run_change')
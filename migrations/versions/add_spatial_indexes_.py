@@ -0,0 +1,25 @@
+"""Add spatial index on river segments
+
+Revision ID: add_spatial_indexes
+Revises: add_poi_station
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'add_spatial_indexes'
+down_revision = 'add_poi_station'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # dgre_municipality and dgre_poi_station already got theirs when created
+    with op.batch_alter_table('dgre_river_segment', schema=None) as batch_op:
+        batch_op.create_index('idx_dgre_river_segment_geom', ['geom'], unique=False, postgresql_using='gist', postgresql_ops={})
+
+
+def downgrade():
+    with op.batch_alter_table('dgre_river_segment', schema=None) as batch_op:
+        batch_op.drop_index('idx_dgre_river_segment_geom', postgresql_using='gist')
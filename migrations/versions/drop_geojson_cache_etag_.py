@@ -0,0 +1,25 @@
+"""Drop the unused etag of the cached GeoJSON
+
+Revision ID: drop_geojson_cache_etag
+Revises: add_ensemble_exceedance
+Create Date: 2026-10-19 23:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'drop_geojson_cache_etag'
+down_revision = 'add_ensemble_exceedance'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Cached responses are validated with the data version ETag of the response cache
+    op.drop_column('dgre_geojson_cache', 'etag')
+
+
+def downgrade():
+    op.add_column('dgre_geojson_cache', sa.Column('etag', sa.String(length=64), nullable=False, server_default=''))
+    op.alter_column('dgre_geojson_cache', 'etag', server_default=None)
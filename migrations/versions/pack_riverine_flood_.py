@@ -0,0 +1,186 @@
+"""Serve riverine floods from the packed runs only
+
+Revision ID: pack_riverine_flood
+Revises: drop_geojson_cache_etag
+Create Date: 2026-10-20 09:00:00.000000
+
+"""
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'pack_riverine_flood'
+down_revision = 'drop_geojson_cache_etag'
+branch_labels = None
+depends_on = None
+
+# One row per subbasin and forecast day, same shape as the former dgre_riverine_flood table. The id is derived
+# from the subbasin, the day of the run and the forecast day.
+RIVERINE_FLOOD_VIEW = """
+    CREATE VIEW dgre_riverine_flood AS
+    SELECT (r.subid::bigint * 100000 + (r.init_date::date - DATE '2000-01-01')) * 100 + d.day AS id,
+           r.fid,
+           r.subid,
+           r.init_date,
+           r.init_date + (d.day - 1) * interval '1 day'                                  AS forecast_date,
+           r.init_levels[d.day]::integer                                                 AS init_value,
+           r.levels[d.day]::integer                                                      AS value
+    FROM dgre_riverine_flood_run r
+             CROSS JOIN LATERAL generate_subscripts(r.levels, 1) AS d(day)
+"""
+
+# Single overrides of the view are reported into the arrays of the run, batches update the runs directly
+RIVERINE_FLOOD_UPDATE_FUNCTION = """
+    CREATE FUNCTION dgre_riverine_flood_update() RETURNS trigger
+        LANGUAGE plpgsql AS
+    $$
+    DECLARE
+        i integer := OLD.forecast_date::date - OLD.init_date::date + 1;
+    BEGIN
+        IF NEW.subid <> OLD.subid OR NEW.init_date <> OLD.init_date OR NEW.forecast_date <> OLD.forecast_date THEN
+            RAISE EXCEPTION 'Only the values of dgre_riverine_flood can be updated';
+        END IF;
+
+        UPDATE dgre_riverine_flood_run
+        SET init_levels[i] = NEW.init_value,
+            levels[i]      = NEW.value
+        WHERE subid = OLD.subid
+          AND init_date = OLD.init_date;
+        UPDATE dgre_riverine_flood_run
+        SET max_level = (SELECT MAX(level) FROM unnest(levels) AS level)
+        WHERE subid = OLD.subid
+          AND init_date = OLD.init_date;
+        RETURN NEW;
+    END;
+    $$
+"""
+
+
+def add_months(month, months):
+    year, month_index = divmod(month.year * 12 + month.month - 1 + months, 12)
+    return datetime(year, month_index + 1, 1)
+
+
+def get_months(table, key):
+    """Months from the oldest row of ``table`` up to the current month."""
+    current_month = datetime.utcnow().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    first_month, last_month = op.get_bind().execute(sa.text(f"""SELECT date_trunc('month', MIN({key})),
+                                                                       date_trunc('month', MAX({key}))
+                                                                FROM {table}""")).one()
+    month = min(first_month or current_month, current_month)
+    last_month = max(last_month or current_month, current_month)
+    months = []
+    while month <= last_month:
+        months.append(month)
+        month = add_months(month, 1)
+    return months
+
+
+def rebuild_riverine_flood_run(partitioned):
+    """Recreate dgre_riverine_flood_run, partitioned by month on init_date or not, keeping its rows."""
+    op.execute("ALTER TABLE dgre_riverine_flood_run RENAME TO dgre_riverine_flood_run_old")
+    op.execute("ALTER TABLE dgre_riverine_flood_run_old RENAME CONSTRAINT dgre_riverine_flood_run_pkey "
+               "TO dgre_riverine_flood_run_old_pkey")
+    op.execute("ALTER TABLE dgre_riverine_flood_run_old RENAME CONSTRAINT dgre_riverine_flood_run_subid_fkey "
+               "TO dgre_riverine_flood_run_old_subid_fkey")
+    op.execute("ALTER INDEX idx_riverine_flood_run_init_date RENAME TO idx_riverine_flood_run_init_date_old")
+
+    partition_by = "PARTITION BY RANGE (init_date)" if partitioned else ""
+    op.execute(f"""CREATE TABLE dgre_riverine_flood_run (
+                       LIKE dgre_riverine_flood_run_old INCLUDING DEFAULTS,
+                       CONSTRAINT dgre_riverine_flood_run_pkey PRIMARY KEY (subid, init_date),
+                       CONSTRAINT dgre_riverine_flood_run_subid_fkey FOREIGN KEY (subid)
+                           REFERENCES dgre_river_segment (subid) ON DELETE CASCADE
+                   ) {partition_by}""")
+    op.execute("CREATE INDEX idx_riverine_flood_run_init_date ON dgre_riverine_flood_run (init_date)")
+
+    if partitioned:
+        for month in get_months('dgre_riverine_flood_run_old', 'init_date'):
+            op.execute(f"""CREATE TABLE dgre_riverine_flood_run_p{month:%Y%m} PARTITION OF dgre_riverine_flood_run
+                           FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{add_months(month, 1):%Y-%m-%d}')""")
+
+    op.execute("INSERT INTO dgre_riverine_flood_run SELECT * FROM dgre_riverine_flood_run_old")
+    op.execute("DROP TABLE dgre_riverine_flood_run_old")
+
+
+def upgrade():
+    op.execute("DROP VIEW dgre_riverine_flood_run_day")
+
+    # Runs are written to both layouts since add_riverine_flood_run, pack whatever would be missing
+    op.execute("""
+        INSERT INTO dgre_riverine_flood_run (subid, init_date, fid, init_levels, levels, max_level)
+        SELECT subid,
+               init_date,
+               MIN(fid),
+               array_agg(init_value ORDER BY forecast_date)::smallint[],
+               array_agg(value ORDER BY forecast_date)::smallint[],
+               MAX(value)
+        FROM dgre_riverine_flood
+        GROUP BY subid, init_date
+        ON CONFLICT (subid, init_date) DO NOTHING
+    """)
+
+    # The packed runs take over the monthly partitions and their archiving
+    rebuild_riverine_flood_run(partitioned=True)
+
+    op.execute("DROP TABLE dgre_riverine_flood")
+    op.execute(RIVERINE_FLOOD_VIEW)
+    op.execute(RIVERINE_FLOOD_UPDATE_FUNCTION)
+    op.execute("""CREATE TRIGGER dgre_riverine_flood_update
+                  INSTEAD OF UPDATE ON dgre_riverine_flood
+                  FOR EACH ROW EXECUTE FUNCTION dgre_riverine_flood_update()""")
+
+
+def downgrade():
+    op.execute("DROP TRIGGER dgre_riverine_flood_update ON dgre_riverine_flood")
+    op.execute("DROP FUNCTION dgre_riverine_flood_update()")
+    op.execute("DROP VIEW dgre_riverine_flood")
+
+    op.execute("CREATE SEQUENCE dgre_riverine_flood_id_seq")
+    op.execute("""CREATE TABLE dgre_riverine_flood (
+                      id integer NOT NULL DEFAULT nextval('dgre_riverine_flood_id_seq'),
+                      fid integer NOT NULL,
+                      subid integer NOT NULL,
+                      init_date timestamp without time zone NOT NULL,
+                      forecast_date timestamp without time zone NOT NULL,
+                      init_value integer NOT NULL,
+                      value integer NOT NULL,
+                      CONSTRAINT dgre_riverine_flood_pkey PRIMARY KEY (id, init_date),
+                      CONSTRAINT unique_riverine_flood_date UNIQUE (subid, init_date, forecast_date),
+                      CONSTRAINT dgre_riverine_flood_subid_fkey FOREIGN KEY (subid)
+                          REFERENCES dgre_river_segment (subid) ON DELETE CASCADE
+                  ) PARTITION BY RANGE (init_date)""")
+    op.execute("CREATE INDEX idx_riverine_flood_init_forecast_date ON dgre_riverine_flood (init_date, forecast_date)")
+    for month in get_months('dgre_riverine_flood_run', 'init_date'):
+        op.execute(f"""CREATE TABLE dgre_riverine_flood_p{month:%Y%m} PARTITION OF dgre_riverine_flood
+                       FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{add_months(month, 1):%Y-%m-%d}')""")
+    op.execute("""
+        INSERT INTO dgre_riverine_flood (fid, subid, init_date, forecast_date, init_value, value)
+        SELECT r.fid,
+               r.subid,
+               r.init_date,
+               r.init_date + (d.day - 1) * interval '1 day',
+               r.init_levels[d.day],
+               r.levels[d.day]
+        FROM dgre_riverine_flood_run r
+                 CROSS JOIN LATERAL generate_subscripts(r.levels, 1) AS d(day)
+        ORDER BY r.init_date, r.subid, d.day
+    """)
+    op.execute("ALTER SEQUENCE dgre_riverine_flood_id_seq OWNED BY dgre_riverine_flood.id")
+
+    rebuild_riverine_flood_run(partitioned=False)
+
+    op.execute("""
+        CREATE VIEW dgre_riverine_flood_run_day AS
+        SELECT r.fid,
+               r.subid,
+               r.init_date,
+               r.init_date + (d.day - 1) * interval '1 day' AS forecast_date,
+               r.init_levels[d.day]::integer                AS init_value,
+               r.levels[d.day]::integer                     AS value,
+               r.discharge[d.day]                           AS discharge
+        FROM dgre_riverine_flood_run r
+                 CROSS JOIN LATERAL generate_subscripts(r.levels, 1) AS d(day)
+    """)
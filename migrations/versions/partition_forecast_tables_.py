@@ -0,0 +1,132 @@
+"""Partition forecast tables by month
+
+Revision ID: partition_forecast_tables
+Revises: add_forecast_run
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'partition_forecast_tables'
+down_revision = 'add_forecast_run'
+branch_labels = None
+depends_on = None
+
+# table: (partition key, columns, constraints, indexes)
+PARTITIONED_TABLES = {
+    'dgre_riverine_flood': (
+        'init_date',
+        """id integer NOT NULL DEFAULT nextval('dgre_riverine_flood_id_seq'),
+           fid integer NOT NULL,
+           subid varchar NOT NULL REFERENCES dgre_river_segment (subid) ON DELETE CASCADE,
+           init_date timestamp without time zone NOT NULL,
+           forecast_date timestamp without time zone NOT NULL,
+           init_value integer NOT NULL,
+           value integer NOT NULL""",
+        ['unique_riverine_flood_date UNIQUE (subid, init_date, forecast_date)'],
+        ['idx_riverine_flood_init_forecast_date ON {table} (init_date, forecast_date)'],
+    ),
+    'dgre_flash_flood': (
+        'forecast_date',
+        """id integer NOT NULL DEFAULT nextval('dgre_flash_flood_id_seq'),
+           fid integer NOT NULL,
+           subid integer NOT NULL REFERENCES dgre_municipality (subid) ON DELETE CASCADE,
+           adm3_fr varchar(256) NOT NULL,
+           forecast_date timestamp without time zone NOT NULL,
+           init_value integer NOT NULL,
+           value integer NOT NULL,
+           weighted_ffft double precision NOT NULL""",
+        ['unique_flash_flood_date UNIQUE (subid, forecast_date)'],
+        ['idx_flash_flood_forecast_date ON {table} (forecast_date)'],
+    ),
+    'dgre_critical_point': (
+        'measurement_date',
+        """id integer NOT NULL DEFAULT nextval('dgre_critical_point_id_seq'),
+           station_name varchar NOT NULL,
+           measurement_date timestamp without time zone NOT NULL,
+           forecast_date timestamp without time zone NOT NULL,
+           flow double precision,
+           water_level double precision,
+           water_level_alert integer""",
+        ['unique_critical_point_measurement UNIQUE (station_name, measurement_date, forecast_date)'],
+        ['idx_critical_point_station ON {table} (station_name)',
+         'idx_critical_point_forecast_date ON {table} (forecast_date)',
+         'idx_critical_point_measurement_station_forecast ON {table} (measurement_date DESC, station_name, forecast_date)'],
+    ),
+}
+
+
+def add_months(month, months):
+    year, month_index = divmod(month.year * 12 + month.month - 1 + months, 12)
+    return datetime(year, month_index + 1, 1)
+
+
+def rename_existing(table):
+    """Move the existing table and the names of its indexes out of the way of the partitioned one."""
+    bind = op.get_bind()
+    indexes = bind.execute(sa.text("SELECT indexname FROM pg_indexes WHERE tablename = :table"),
+                           {'table': table}).scalars().all()
+    for index in indexes:
+        op.execute(f'ALTER INDEX "{index}" RENAME TO "{index}_old"')
+    op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY NONE")
+    op.execute(f"ALTER TABLE {table} RENAME TO {table}_old")
+
+
+def drop_existing(table):
+    op.execute(f"DROP TABLE {table}_old")
+    op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id")
+
+
+def upgrade():
+    bind = op.get_bind()
+    current_month = datetime.utcnow().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+    for table, (key, columns, constraints, indexes) in PARTITIONED_TABLES.items():
+        rename_existing(table)
+
+        constraints_ddl = "".join(f",\n CONSTRAINT {constraint}" for constraint in constraints)
+        op.execute(f"""CREATE TABLE {table} (
+                           {columns},
+                           CONSTRAINT {table}_pkey PRIMARY KEY (id, {key}){constraints_ddl}
+                       ) PARTITION BY RANGE ({key})""")
+        for index in indexes:
+            op.execute(f"CREATE INDEX {index.format(table=table)}")
+
+        # One partition per month, from the oldest row up to the current month
+        first_month, last_month = bind.execute(sa.text(f"""SELECT date_trunc('month', MIN({key})),
+                                                                  date_trunc('month', MAX({key}))
+                                                           FROM {table}_old""")).one()
+        month = min(first_month or current_month, current_month)
+        last_month = max(last_month or current_month, current_month)
+        while month <= last_month:
+            next_month = add_months(month, 1)
+            op.execute(f"""CREATE TABLE {table}_p{month:%Y%m} PARTITION OF {table}
+                           FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{next_month:%Y-%m-%d}')""")
+            month = next_month
+
+        op.execute(f"INSERT INTO {table} SELECT * FROM {table}_old")
+        drop_existing(table)
+
+
+def downgrade():
+    bind = op.get_bind()
+
+    for table, (key, columns, constraints, indexes) in PARTITIONED_TABLES.items():
+        rename_existing(table)
+
+        constraints_ddl = "".join(f",\n CONSTRAINT {constraint}" for constraint in constraints)
+        op.execute(f"""CREATE TABLE {table} (
+                           {columns},
+                           CONSTRAINT {table}_pkey PRIMARY KEY (id){constraints_ddl}
+                       )""")
+        for index in indexes:
+            op.execute(f"CREATE INDEX {index.format(table=table)}")
+
+        op.execute(f"INSERT INTO {table} SELECT * FROM {table}_old")
+
+        # Dropping the partitioned table drops its partitions
+        drop_existing(table)